@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+상대 위치 attention 벤치마크 (전체 행렬 attention() vs 블록 단위 attention_blockwise)
+
+config.json 구조의 attentions.Encoder 를 두 가지 길이로 실행합니다.
+    - enc_p: TextEncoder (n_layers 층) 에 음소 수 길이
+    - flow : TransformerCouplingBlock 의 coupling 층 하나 (n_layers_trans_flow 층) 에
+             음소 수 * frames_per_phone 프레임 길이
+길이마다 별도 프로세스에서 실행해 최대 RSS 증가량(peak memory)과 실행 시간을 측정하고,
+두 경로의 최대 오차를 출력합니다. 가중치는 랜덤 초기화 (속도/메모리 비교용) 입니다.
+
+사용법:
+    python bench_attention.py
+    python bench_attention.py --lengths 100 500 2000 --threads 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+import torch
+
+from melo import attentions, utils
+from melo.scheduler import DEFAULT_FRAMES_PER_PHONE
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "melo", "configs", "config.json")
+LENGTHS = [100, 250, 500, 1000, 2000]
+REPEAT = 2
+
+
+def make_encoder(target):
+    hps = utils.get_hparams_from_file(CONFIG_PATH).model
+    n_layers = hps.n_layers if target == 'enc_p' else hps.n_layers_trans_flow
+    torch.manual_seed(0)
+    return attentions.Encoder(
+        hps.hidden_channels, hps.filter_channels, hps.n_heads, n_layers, hps.kernel_size,
+        hps.p_dropout, gin_channels=hps.gin_channels,
+    ).eval()
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(target, length, mode):
+    """자식 프로세스: 한 설정의 peak memory / 시간 측정 결과와 출력을 돌려줌"""
+    encoder = make_encoder(target)
+    generator = torch.Generator().manual_seed(length)
+    x = torch.randn(1, encoder.hidden_channels, length, generator=generator)
+    x_mask = torch.ones(1, 1, length)
+    g = torch.randn(1, encoder.gin_channels, 1, generator=generator)
+    if mode == 'full':
+        attentions._use_blockwise_attention = lambda module: False
+    with torch.inference_mode():
+        encoder(x[:, :, :16], x_mask[:, :, :16], g=g)
+        base = max_rss_mb()
+        times = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            y = encoder(x, x_mask, g=g)
+            times.append(time.perf_counter() - start)
+    return {'peak_mb': max_rss_mb() - base, 'ms': min(times) * 1000}, y
+
+
+def run_child(target, length, mode, threads):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', target, str(length), mode,
+         '--threads', str(threads)],
+        capture_output=True, text=True,
+    )
+    if output.returncode != 0:
+        return None
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lengths', type=int, nargs='+', default=LENGTHS)
+    parser.add_argument('--frames_per_phone', type=float, default=DEFAULT_FRAMES_PER_PHONE)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--child', nargs=3, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    torch.set_num_threads(args.threads)
+
+    if args.child:
+        target, length, mode = args.child
+        result, y = measure(target, int(length), mode)
+        result['y'] = y.flatten()[::97].tolist()
+        print(json.dumps(result))
+        return 0
+
+    print("=" * 84)
+    print("attentions.Encoder: attention() vs attention_blockwise")
+    print("=" * 84)
+    print(f"{'':<7}{'음소':>6}{'길이':>7}{'full MB':>10}{'block MB':>10}{'full ms':>10}{'block ms':>10}"
+          f"{'배속':>7}{'최대 오차':>12}")
+    for length in args.lengths:
+        for target in ['enc_p', 'flow']:
+            t = length if target == 'enc_p' else int(length * args.frames_per_phone)
+            full = run_child(target, t, 'full', args.threads)
+            block = run_child(target, t, 'block', args.threads)
+            if block is None:
+                print(f"{target:<7}{length:>6}{t:>7}  실패")
+                continue
+            if full is None:
+                # 전체 행렬 경로가 메모리 부족 등으로 실패
+                print(f"{target:<7}{length:>6}{t:>7}{'OOM':>10}{block['peak_mb']:>10.0f}{'-':>10}"
+                      f"{block['ms']:>10.0f}")
+                continue
+            error = max(abs(a - b) for a, b in zip(full['y'], block['y']))
+            print(f"{target:<7}{length:>6}{t:>7}{full['peak_mb']:>10.0f}{block['peak_mb']:>10.0f}"
+                  f"{full['ms']:>10.0f}{block['ms']:>10.0f}{full['ms'] / block['ms']:>7.2f}{error:>12.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TTS.audio_numpy_concat 벤치마크 (기존 리스트 방식 vs 사전 할당 버퍼)
+
+각 방식을 별도 프로세스에서 실행해서 피크 RSS 와 시간을 비교합니다.
+
+사용법:
+    python bench_audio_concat.py            # 기본 10분 분량 (44.1kHz)
+    python bench_audio_concat.py 60         # 60분 분량
+"""
+import os
+import sys
+import time
+import resource
+import subprocess
+
+import numpy as np
+import psutil
+
+SR = 44100
+SENTENCE_SEC = 3.0
+
+
+def old_audio_numpy_concat(segment_data_list, sr, speed=1.):
+    # 변경 전 구현 (비교용)
+    audio_segments = []
+    for segment_data in segment_data_list:
+        audio_segments += segment_data.reshape(-1).tolist()
+        audio_segments += [0] * int((sr * 0.05) / speed)
+    audio_segments = np.array(audio_segments).astype(np.float32)
+    return audio_segments
+
+
+def make_segments(minutes):
+    n = int(minutes * 60 / SENTENCE_SEC)
+    rng = np.random.default_rng(0)
+    return [rng.uniform(-1, 1, int(SR * SENTENCE_SEC)).astype(np.float32) for _ in range(n)]
+
+
+def run_one(mode, minutes):
+    if mode == 'new':
+        from melo.api import TTS
+        concat = TTS.audio_numpy_concat
+    elif mode == 'new_int16':
+        from melo.api import TTS
+        concat = lambda segs, sr: TTS.audio_numpy_concat(segs, sr, dtype=np.int16)
+    else:
+        concat = old_audio_numpy_concat
+    segments = make_segments(minutes)
+    base_mb = psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
+    t = time.time()
+    audio = concat(segments, SR)
+    elapsed = time.time() - t
+    # ru_maxrss 는 리눅스에서 KB 단위
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode}\t{len(audio)}\t{elapsed:.3f}\t{peak_mb - base_mb:.1f}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--run':
+        run_one(sys.argv[2], float(sys.argv[3]))
+        return 0
+
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print("=" * 60)
+    print(f"audio_numpy_concat 벤치마크: {minutes:.0f}분 분량, {SR}Hz")
+    print("=" * 60)
+    print(f"{'방식':<12}{'샘플 수':>14}{'시간(s)':>10}{'피크 증가(MB)':>16}")
+    for mode in ['old', 'new', 'new_int16']:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run', mode, str(minutes)],
+            capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            print(f"{mode:<12} 실패: {out.stderr.strip().splitlines()[-1] if out.stderr else out.returncode}")
+            continue
+        name, n, elapsed, peak = out.stdout.strip().splitlines()[-1].split('\t')
+        print(f"{name:<12}{n:>14}{elapsed:>10}{peak:>16}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
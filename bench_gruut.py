@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프랑스어 / 스페인어 G2P (gruut) 벤치마크
+
+10,000 단어 코퍼스에 대해 세 가지 방식을 비교합니다.
+    old       : 호출마다 Gruut 객체 생성 + 단어 그룹마다 gruut 호출 (변경 전)
+    cached    : 공유 Gruut 객체 + 단어 그룹마다 gruut 호출
+    sentence  : 공유 Gruut 객체 + 문장당 gruut 한 번 (phonemize_words)
+sentence 방식의 결과가 단어별 결과와 얼마나 일치하는지도 출력합니다.
+
+단어 그룹은 BERT basic tokenizer 와 같은 규칙(단어 / 구두점 분리)으로 만듭니다.
+
+사용법:
+    python bench_gruut.py                    # fr, es 내장 예문 (10,000 단어)
+    python bench_gruut.py fr corpus.txt      # 텍스트 파일 사용
+    python bench_gruut.py es corpus.txt 20000
+"""
+import re
+import sys
+import time
+
+from melo.text.fr_phonemizer import fr_to_ipa
+from melo.text.fr_phonemizer.gruut_wrapper import Gruut as FrGruut
+from melo.text.es_phonemizer import es_to_ipa
+from melo.text.es_phonemizer.gruut_wrapper import Gruut as EsGruut
+
+N_WORDS = 10000
+
+SAMPLES = {
+    'fr': [
+        "Ils essayaient vainement de faire comprendre à ma mère qu'avec les cent mille francs que m'avait laissé mon père, elle aurait pu vivre tranquille.",
+        "En 1815, M. Charles-François-Bienvenu Myriel était évêque de Digne.",
+        "C'était un vieillard d'environ soixante-quinze ans; il occupait le siège de Digne depuis 1806.",
+        "Quoique ce détail ne touche en aucune manière au fond même de ce que nous avons à raconter, il n'est peut-être pas inutile, ne fût-ce que pour être exact en tout, d'indiquer ici les bruits et les propos qui avaient couru sur son compte.",
+        "Le service est gratuit et disponible en chinois simplifié et en d'autres langues.",
+        "Aujourd'hui, les enfants sont arrivés à l'école à huit heures et demie.",
+    ],
+    'es': [
+        "En un lugar de la Mancha, de cuyo nombre no quiero acordarme, no ha mucho tiempo que vivía un hidalgo de los de lanza en astillero.",
+        "¿Y a quién echaría de menos, en el mundo si no fuese a vos?",
+        "En nuestros tiempos estos dos pueblos ilustres empiezan a curarse, gracias sólo a la sana y vigorosa higiene de 1789.",
+        "Una olla de algo más vaca que carnero, salpicón las más noches, duelos y quebrantos los sábados.",
+        "El resto della concluían sayo de velarte, calzas de velludo para las fiestas con sus pantuflos de lo mismo.",
+    ],
+}
+
+
+def word_groups(sentence):
+    return re.findall(r"\w+|[^\w\s]", sentence)
+
+
+def make_corpus(lang, path=None, n_words=N_WORDS):
+    if path:
+        with open(path, encoding='utf-8') as f:
+            sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", f.read()) if s.strip()]
+    else:
+        sentences = SAMPLES[lang]
+    corpus, count, i = [], 0, 0
+    while count < n_words:
+        groups = word_groups(sentences[i % len(sentences)])
+        corpus.append(groups)
+        count += len(groups)
+        i += 1
+    return corpus, count
+
+
+def bench(lang, path=None, n_words=N_WORDS):
+    if lang == 'fr':
+        gruut_cls, lang_code, post = FrGruut, "fr-fr", fr_to_ipa.remove_consecutive_t
+        per_word, per_sentence = fr_to_ipa.fr2ipa, fr_to_ipa.fr2ipa_words
+    else:
+        gruut_cls, lang_code, post = EsGruut, "es-es", (lambda p: p)
+        per_word, per_sentence = es_to_ipa.es2ipa, es_to_ipa.es2ipa_words
+
+    corpus, count = make_corpus(lang, path, n_words)
+    # 첫 호출의 사전 로딩 비용은 측정에서 제외
+    per_sentence(corpus[0])
+
+    def old(words):
+        out = []
+        for w in words:
+            e = gruut_cls(language=lang_code, keep_puncs=True, keep_stress=True, use_espeak_phonemes=True)
+            out.append(post(e.phonemize(w, separator="")))
+        return out
+
+    results = {}
+    times = {}
+    for name, fn in [('old', old), ('cached', lambda ws: [per_word(w) for w in ws]), ('sentence', per_sentence)]:
+        start = time.perf_counter()
+        results[name] = [fn(words) for words in corpus]
+        times[name] = time.perf_counter() - start
+
+    total = sum(len(words) for words in corpus)
+    same = sum(a == b for x, y in zip(results['cached'], results['sentence']) for a, b in zip(x, y))
+    print(f"[{lang}] {len(corpus)}문장, {count}단어 그룹")
+    for name in ['old', 'cached', 'sentence']:
+        print(f"  {name:<10}{times[name]:>8.2f}s{times['old'] / times[name]:>8.1f}x")
+    print(f"  sentence 방식 단어별 일치율: {same / total * 100:.2f}%")
+
+
+def main():
+    if len(sys.argv) > 1:
+        lang = sys.argv[1]
+        path = sys.argv[2] if len(sys.argv) > 2 else None
+        n_words = int(sys.argv[3]) if len(sys.argv) > 3 else N_WORDS
+        bench(lang, path, n_words)
+    else:
+        for lang in ['fr', 'es']:
+            bench(lang)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SynthesizerTrn.infer vs infer_fast 벤치마크
+
+sdp_ratio 0 / 0.2 / 0.5 / 1 에서 문장 길이별 추론 시간을 비교합니다.
+infer_fast 는 가중치가 0 인 duration predictor 를 건너뛰고, 화자 조건(emb_g 와 cond 투영)을
+화자당 한 번만 계산하며, torch.inference_mode 에서 실행됩니다.
+noise_scale = 0 으로 두 결과의 최대 오차도 함께 출력합니다.
+
+체크포인트 없이 config.json 구조의 랜덤 초기화 모델을 사용합니다 (속도 비교용).
+
+사용법:
+    python bench_infer_fast.py
+    python bench_infer_fast.py --ckpt_path melo-kr.safetensors   # melo.export 결과물
+"""
+import sys
+import time
+import argparse
+
+import torch
+
+from testing_utils import make_model
+
+SDP_RATIOS = [0.0, 0.2, 0.5, 1.0]
+LENGTHS = [20, 60, 150]
+REPEAT = 5
+
+
+def make_inputs(model, length):
+    g = torch.Generator().manual_seed(length)
+    x = torch.randint(1, model.n_vocab, (1, length), generator=g)
+    return (
+        x,
+        torch.LongTensor([length]),
+        torch.LongTensor([0]),
+        torch.zeros_like(x),
+        torch.zeros_like(x),
+        torch.randn(1, 1024, length, generator=g),
+        torch.randn(1, 768, length, generator=g),
+    )
+
+
+def timeit(fn):
+    fn()
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ckpt_path', default=None)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+    torch.set_num_threads(args.threads)
+
+    _, model = make_model(args.ckpt_path)
+
+    def infer(inputs, sdp_ratio, noise_scale=0.667, noise_scale_w=0.8):
+        with torch.no_grad():
+            return model.infer(*inputs, sdp_ratio=sdp_ratio, noise_scale=noise_scale, noise_scale_w=noise_scale_w)
+
+    def infer_fast(inputs, sdp_ratio, noise_scale=0.667, noise_scale_w=0.8):
+        return model.infer_fast(*inputs, sdp_ratio=sdp_ratio, noise_scale=noise_scale, noise_scale_w=noise_scale_w)
+
+    print("=" * 72)
+    print(f"infer vs infer_fast (threads={args.threads}, 최솟값 / {REPEAT}회)")
+    print("=" * 72)
+    print(f"{'phones':>8}{'sdp_ratio':>11}{'infer(ms)':>12}{'fast(ms)':>12}{'속도비':>8}{'최대오차':>12}")
+    for length in LENGTHS:
+        inputs = make_inputs(model, length)
+        for sdp_ratio in SDP_RATIOS:
+            error = (
+                infer(inputs, sdp_ratio, 0., 0.)[0] - infer_fast(inputs, sdp_ratio, 0., 0.)[0]
+            ).abs().max().item()
+            t_old = timeit(lambda: infer(inputs, sdp_ratio))
+            t_new = timeit(lambda: infer_fast(inputs, sdp_ratio))
+            print(f"{length:>8}{sdp_ratio:>11.1f}{t_old:>12.1f}{t_new:>12.1f}{t_old / t_new:>7.2f}x{error:>12.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
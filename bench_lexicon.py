@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+영어 CMU 발음 사전 로딩 벤치마크 (pickle dict vs mmap CompactLexicon)
+
+각 방식을 별도 프로세스에서 실행해서 로딩 시간, RSS / USS 증가량, 조회 속도를 비교합니다.
+USS 는 프로세스 고유 메모리로, mmap 된 사전 페이지는 page cache 를 통해 공유되므로 포함되지 않습니다.
+
+사용법:
+    python bench_lexicon.py
+"""
+import os
+import sys
+import time
+import pickle
+import random
+import importlib.util
+import subprocess
+
+import psutil
+
+TEXT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "melo", "text")
+CMU_DICT_PATH = os.path.join(TEXT_DIR, "cmudict.rep")
+CACHE_PATH = os.path.join(TEXT_DIR, "cmudict_cache.pickle")
+LEXICON_PATH = os.path.join(TEXT_DIR, "cmudict.lex")
+N_LOOKUPS = 100000
+
+# melo.text.english 는 g2p_en 등을 import 하므로 compact_lexicon 만 직접 로드
+_spec = importlib.util.spec_from_file_location(
+    "compact_lexicon", os.path.join(TEXT_DIR, "english_utils", "compact_lexicon.py")
+)
+compact_lexicon = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(compact_lexicon)
+
+
+def memory_mb():
+    info = psutil.Process(os.getpid()).memory_full_info()
+    return info.rss / 1024 / 1024, info.uss / 1024 / 1024
+
+
+def prepare():
+    g2p_dict = None
+    if not os.path.exists(CACHE_PATH):
+        g2p_dict = compact_lexicon.read_cmudict(CMU_DICT_PATH)
+        with open(CACHE_PATH, "wb") as f:
+            pickle.dump(g2p_dict, f)
+    if not os.path.exists(LEXICON_PATH):
+        compact_lexicon.build_lexicon(g2p_dict or compact_lexicon.read_cmudict(CMU_DICT_PATH), LEXICON_PATH)
+
+
+def run_one(mode):
+    base_rss, base_uss = memory_mb()
+    start = time.perf_counter()
+    if mode == 'pickle':
+        with open(CACHE_PATH, "rb") as f:
+            eng_dict = pickle.load(f)
+    else:
+        eng_dict = compact_lexicon.CompactLexicon(LEXICON_PATH)
+    load_time = time.perf_counter() - start
+
+    rng = random.Random(0)
+    words = [line.split("  ")[0] for i, line in enumerate(open(CMU_DICT_PATH), start=1) if i >= 49]
+    queries = [rng.choice(words) if rng.random() < 0.9 else "NOTAWORD%d" % i for i in range(N_LOOKUPS)]
+    start = time.perf_counter()
+    found = 0
+    for w in queries:
+        if w in eng_dict:
+            found += len(eng_dict[w])
+    lookup_us = (time.perf_counter() - start) / N_LOOKUPS * 1e6
+    del words, queries
+
+    rss, uss = memory_mb()
+    print(f"{mode}\t{load_time * 1000:.1f}\t{rss - base_rss:.1f}\t{uss - base_uss:.1f}\t{lookup_us:.2f}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--run':
+        run_one(sys.argv[2])
+        return 0
+
+    prepare()
+    print("=" * 72)
+    print(f"CMU 사전 로딩 벤치마크: pickle {os.path.getsize(CACHE_PATH) / 1e6:.1f}MB, "
+          f"lexicon {os.path.getsize(LEXICON_PATH) / 1e6:.1f}MB, 조회 {N_LOOKUPS}회")
+    print("=" * 72)
+    print(f"{'방식':<10}{'로딩(ms)':>10}{'RSS 증가(MB)':>14}{'USS 증가(MB)':>14}{'조회(us)':>10}")
+    for mode in ['pickle', 'compact']:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run', mode],
+            capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            print(f"{mode:<10} 실패: {out.stderr.strip().splitlines()[-1] if out.stderr else out.returncode}")
+            continue
+        name, load_ms, rss, uss, lookup_us = out.stdout.strip().splitlines()[-1].split('\t')
+        print(f"{name:<10}{load_ms:>10}{rss:>14}{uss:>14}{lookup_us:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PyTorch (infer_fast) vs ONNX Runtime (OnnxSynthesizer) 추론 시간 벤치마크
+
+모델을 임시 디렉터리에 encoder.onnx / decoder.onnx 로 export 한 뒤 문장 길이별 추론 시간을 비교합니다.
+결과가 같은지는 test_onnx_parity.py 에서 확인합니다. onnx extra 가 필요합니다 (pip install melotts[onnx]).
+
+체크포인트를 주지 않으면 config.json 구조의 랜덤 초기화 모델을 사용합니다.
+
+사용법:
+    python bench_onnx.py
+    python bench_onnx.py --ckpt_path melo-kr.safetensors
+"""
+import sys
+import time
+import argparse
+import tempfile
+import warnings
+
+from melo.export import export_onnx
+from melo.onnx_backend import OnnxSynthesizer
+from testing_utils import make_model
+from test_onnx_parity import PARAMS, make_inputs, torch_infer
+
+warnings.filterwarnings('ignore')
+
+LENGTHS = [20, 60, 150]
+REPEAT = 3
+
+
+def timeit(fn):
+    fn()
+    elapsed = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ckpt_path', default=None)
+    args = parser.parse_args()
+
+    hps, model = make_model(args.ckpt_path)
+    with tempfile.TemporaryDirectory() as onnx_dir:
+        start = time.perf_counter()
+        export_onnx(hps, model, onnx_dir)
+        print(f"export: {time.perf_counter() - start:.1f}s")
+        onnx_model = OnnxSynthesizer(onnx_dir)
+
+        print(f"추론 시간 (최솟값 / {REPEAT}회)")
+        for length in LENGTHS:
+            inputs = make_inputs(model, [length], seed=length)
+            t_torch = timeit(lambda: torch_infer(model, inputs, **PARAMS))
+            t_onnx = timeit(lambda: onnx_model.infer(*inputs, **PARAMS))
+            print(f"  phones {length:>4}: torch {t_torch:.1f}ms, onnxruntime {t_onnx:.1f}ms "
+                  f"({t_torch / t_onnx:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프론트엔드(g2p + BERT) / 음향 모델 파이프라인 벤치마크
+
+tts_to_file(pipeline=0) 과 pipeline=k (다음 문장 묶음의 g2p / BERT 를 백그라운드 스레드에서 미리 계산)
+의 초당 문장 수를 비교하고, 같은 시드에서 두 출력이 같은지 확인합니다.
+frontend_threads 는 프론트엔드 스레드에 줄 torch 스레드 수이며 나머지는 음향 모델이 사용합니다.
+
+사용법:
+    python bench_pipeline.py --language KR --text_file sample.txt
+    python bench_pipeline.py --language EN --pipeline 2 --frontend_threads 2
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+import torch
+
+from melo.api import TTS
+
+DEFAULT_TEXTS = {
+    'KR': '최근 텍스트 음성 변환 분야가 급속도로 발전하고 있습니다. ' * 40,
+    'EN': 'The field of text-to-speech has seen rapid development recently. ' * 40,
+    'JP': 'テキスト読み上げの分野は最近急速な発展を遂げています。' * 40,
+}
+
+
+def run(tts, text, **kwargs):
+    torch.manual_seed(0)
+    start = time.perf_counter()
+    audio = tts.tts_to_file(text, 0, quiet=True, **kwargs)
+    return audio, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--language', default='KR')
+    parser.add_argument('--text_file', default=None)
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--pipeline', type=int, default=2)
+    parser.add_argument('--frontend_threads', type=int, default=None)
+    parser.add_argument('--bert_batch_size', type=int, default=8)
+    args = parser.parse_args()
+
+    text = open(args.text_file, encoding='utf-8').read() if args.text_file else DEFAULT_TEXTS[args.language]
+    tts = TTS(language=args.language, device=args.device)
+    n_sentences = len(tts.split_sentences_into_pieces(text, tts.language, quiet=True))
+    # 첫 실행은 BERT 로딩 / 워밍업
+    tts.tts_to_file(text[:200], 0, quiet=True)
+
+    print("=" * 64)
+    print(f"파이프라인 벤치마크: {args.language}, {n_sentences}문장, torch 스레드 {torch.get_num_threads()}")
+    print("=" * 64)
+    base, base_time = run(tts, text, bert_batch_size=args.bert_batch_size)
+    print(f"{'순차':<12}{base_time:>8.2f}s{n_sentences / base_time:>10.2f} 문장/s")
+    audio, pipe_time = run(tts, text, bert_batch_size=args.bert_batch_size, pipeline=args.pipeline,
+                           frontend_threads=args.frontend_threads)
+    print(f"{'파이프라인':<12}{pipe_time:>8.2f}s{n_sentences / pipe_time:>10.2f} 문장/s"
+          f"  (x{base_time / pipe_time:.2f})")
+    error = float(np.abs(base - audio).max()) if base.shape == audio.shape else float('inf')
+    print(f"최대 오차: {error:.2e}")
+    return 0 if error == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
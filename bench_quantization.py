@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동적 int8 양자화 (TTS(quantize='int8')) 벤치마크
+
+언어별 체크포인트마다 float32 모델과 int8 모델로 같은 문장을 합성해서
+    - RTF (합성 시간 / 오디오 길이, 작을수록 빠름)
+    - MCD (mel cepstral distortion, dB, DTW 정렬): float32 대비 음질 차이
+    - 오디오 길이 비율 (duration 변화)
+를 출력합니다. 같은 결과를 비교하기 위해 noise_scale = noise_scale_w = 0 으로 합성합니다.
+텍스트 전처리 (g2p / BERT) 는 한 번만 하고 두 모델이 공유합니다.
+
+사용법:
+    python bench_quantization.py                  # EN ES FR ZH JP KR (체크포인트 다운로드)
+    python bench_quantization.py KR JP            # 일부 언어만
+    python bench_quantization.py --random         # 체크포인트 없이 랜덤 모델 + 랜덤 phone (속도만 의미 있음)
+"""
+import os
+import sys
+import copy
+import time
+import argparse
+import warnings
+
+import numpy as np
+import torch
+import librosa
+
+from melo.quantization import quantize_int8
+
+warnings.filterwarnings('ignore')
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEXT_FILES = {
+    'EN': 'en_egs_text.txt',
+    'ES': 'es_egs_text.txt',
+    'FR': 'fr_egs_text.txt',
+    'ZH': 'zh_mix_en_egs_text.txt',
+    'JP': 'jp_egs_text.txt',
+    'KR': 'kr_egs_text.txt',
+}
+N_SENTENCES = 5
+N_MFCC = 13
+
+
+def load_items(language, n_sentences):
+    """-> (sampling rate, float32 model, prepared sentences) for one language checkpoint."""
+    from melo.api import TTS
+
+    tts = TTS(language=language, device='cpu')
+    path = os.path.join(ROOT, "test", "basetts_test_resources", TEXT_FILES[language])
+    with open(path, encoding='utf-8') as f:
+        texts = [line.strip() for line in f if line.strip()][:n_sentences]
+    return tts.hps.data.sampling_rate, tts.model, tts._prepare_texts(texts)
+
+
+def load_random_items(n_sentences):
+    from testing_utils import make_model
+
+    hps, model = make_model()
+    g = torch.Generator().manual_seed(0)
+    items = []
+    for length in np.linspace(20, 150, n_sentences).astype(int):
+        phones = torch.randint(1, 112, (length,), generator=g)
+        items.append((torch.randn(1024, length, generator=g), torch.randn(768, length, generator=g),
+                      phones, torch.zeros_like(phones), torch.zeros_like(phones)))
+    return hps.data.sampling_rate, model, items
+
+
+def synthesize(model, items, speaker_id=0):
+    audios = []
+    start = time.perf_counter()
+    for bert, ja_bert, phones, tones, lang_ids in items:
+        o = model.infer_fast(
+            phones[None], torch.LongTensor([phones.size(0)]), torch.LongTensor([speaker_id]), tones[None],
+            lang_ids[None], bert[None], ja_bert[None], sdp_ratio=0.2, noise_scale=0., noise_scale_w=0.,
+        )[0]
+        audios.append(o[0, 0].numpy())
+    return audios, time.perf_counter() - start
+
+
+def mcd(ref, test, sr):
+    """Mel cepstral distortion (dB) between two waveforms, aligned with DTW, c0 excluded."""
+    ref_mfcc = librosa.feature.mfcc(y=ref, sr=sr, n_mfcc=N_MFCC)[1:]
+    test_mfcc = librosa.feature.mfcc(y=test, sr=sr, n_mfcc=N_MFCC)[1:]
+    _, path = librosa.sequence.dtw(X=ref_mfcc, Y=test_mfcc, metric='euclidean')
+    diff = ref_mfcc[:, path[:, 0]] - test_mfcc[:, path[:, 1]]
+    return float(10 / np.log(10) * np.sqrt(2) * np.mean(np.sqrt((diff ** 2).sum(0))))
+
+
+def bench(name, sr, model, items):
+    quantized = quantize_int8(copy.deepcopy(model))
+    # 첫 호출 (메모리 할당, 캐시) 은 측정에서 제외
+    synthesize(model, items[:1])
+    synthesize(quantized, items[:1])
+    ref, ref_time = synthesize(model, items)
+    test, test_time = synthesize(quantized, items)
+
+    duration = sum(a.size for a in ref) / sr
+    scores = [mcd(a, b, sr) for a, b in zip(ref, test)]
+    length_ratio = sum(b.size for b in test) / sum(a.size for a in ref)
+    print(f"{name:<8}{ref_time / duration:>10.3f}{test_time / (sum(b.size for b in test) / sr):>10.3f}"
+          f"{ref_time / test_time:>9.2f}x{np.mean(scores):>10.2f}{length_ratio:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('languages', nargs='*', default=list(TEXT_FILES))
+    parser.add_argument('--random', action='store_true', help="random model and phones, no checkpoint download")
+    parser.add_argument('--sentences', type=int, default=N_SENTENCES)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    print("=" * 72)
+    print(f"float32 vs 동적 int8 (threads={torch.get_num_threads()}, 문장 {args.sentences}개)")
+    print("=" * 72)
+    print(f"{'언어':<8}{'RTF fp32':>10}{'RTF int8':>10}{'속도비':>10}{'MCD(dB)':>10}{'길이비':>10}")
+    if args.random:
+        bench('random', *load_random_items(args.sentences))
+        return 0
+    for language in args.languages:
+        try:
+            sr, model, items = load_items(language, args.sentences)
+        except Exception as e:
+            print(f"{language:<8}로딩 실패: {type(e).__name__}: {e}")
+            continue
+        bench(language, sr, model, items)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
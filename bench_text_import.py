@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+언어별 텍스트 프론트엔드 import 시간 / RSS 벤치마크
+
+각 언어를 새 프로세스에서 로드해서 (language_module_map + lang_bert_module_map)
+import 시간, RSS 증가량, 같이 로드된 다른 언어 모듈을 출력합니다.
+'ALL' 은 예전처럼 모든 언어를 한 번에 import 했을 때의 값입니다.
+
+사용법:
+    python bench_text_import.py             # 전체 언어
+    python bench_text_import.py KR JP       # 지정한 언어만
+"""
+import os
+import sys
+import time
+import subprocess
+
+LANGUAGES = ['KR', 'EN', 'JP', 'ZH_MIX_EN', 'FR', 'ES']
+
+
+def rss_mb():
+    import psutil
+    return psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
+
+
+def run_one(language):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # torch / transformers 는 모든 언어가 공통으로 쓰므로 기준값에 포함
+    import torch  # noqa: F401
+    import transformers  # noqa: F401
+    from melo.text import language_module_map, lang_bert_module_map
+
+    base_mb = rss_mb()
+    start = time.perf_counter()
+    languages = list(language_module_map) if language == 'ALL' else [language]
+    for lang in languages:
+        language_module_map[lang]
+        lang_bert_module_map[lang]
+    elapsed = time.perf_counter() - start
+    loaded = ','.join(language_module_map.loaded())
+    print(f"{language}\t{elapsed:.2f}\t{rss_mb() - base_mb:.1f}\t{loaded}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--run':
+        run_one(sys.argv[2])
+        return 0
+
+    languages = sys.argv[1:] or LANGUAGES + ['ALL']
+    print("=" * 72)
+    print("언어별 프론트엔드 import 벤치마크 (torch/transformers import 이후 기준)")
+    print("=" * 72)
+    print(f"{'언어':<12}{'시간(s)':>10}{'RSS 증가(MB)':>16}  로드된 언어 모듈")
+    for language in languages:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run', language],
+            capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            print(f"{language:<12} 실패: {out.stderr.strip().splitlines()[-1] if out.stderr else out.returncode}")
+            continue
+        name, elapsed, rss, loaded = out.stdout.strip().splitlines()[-1].split('\t')
+        print(f"{name:<12}{elapsed:>10}{rss:>16}  {loaded}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
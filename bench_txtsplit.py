@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+split_utils.txtsplit 벤치마크 (이전 구현 vs 인덱스 기반 구현)
+
+split_sentences_latin 과 같은 txtsplit(text, 256, 512) 설정으로 수 MB 텍스트를 분할하는 시간을
+비교합니다. 이전 구현은 test_txtsplit.legacy_txtsplit 을 사용합니다.
+
+사용법:
+    python bench_txtsplit.py
+    python bench_txtsplit.py --text_file book.txt
+"""
+import sys
+import time
+import random
+import argparse
+
+from melo.split_utils import txtsplit
+from test_txtsplit import SAMPLES, legacy_txtsplit, random_text
+
+SIZES_MB = [1, 4]
+
+
+def make_text(size_mb, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size_mb * 1024 * 1024:
+        part = rng.choice(SAMPLES[1:]) if rng.random() < 0.5 else random_text(rng, 50)
+        parts.append(part)
+        total += len(part) + 1
+    return '\n'.join(parts)
+
+
+def timeit(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--text_file', default=None)
+    args = parser.parse_args()
+
+    if args.text_file:
+        texts = [(args.text_file, open(args.text_file, encoding='utf-8').read())]
+    else:
+        texts = [(f"{size}MB", make_text(size)) for size in SIZES_MB]
+
+    print("=" * 72)
+    print("txtsplit(text, 256, 512) 벤치마크")
+    print("=" * 72)
+    print(f"{'입력':<12}{'청크 수':>10}{'이전(s)':>10}{'신규(s)':>10}{'offsets(s)':>12}{'배속':>8}  일치")
+    ok = True
+    for name, text in texts:
+        expected, legacy_time = timeit(lambda: legacy_txtsplit(text, 256, 512))
+        chunks, new_time = timeit(lambda: txtsplit(text, 256, 512))
+        _, offsets_time = timeit(lambda: txtsplit(text, 256, 512, return_offsets=True))
+        same = chunks == expected
+        ok = ok and same
+        print(f"{name:<12}{len(chunks):>10}{legacy_time:>10.2f}{new_time:>10.2f}{offsets_time:>12.2f}"
+              f"{legacy_time / new_time:>8.1f}  {'OK' if same else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
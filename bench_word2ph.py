@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BERT word2ph 확장 벤치마크 (기존 repeat + cat 루프 vs repeat_interleave)
+
+토큰 수 50~500 인 문장에 대해 단일 문장 / 배치 확장 시간을 비교합니다.
+
+사용법:
+    python bench_word2ph.py                 # hidden 768 (bert-base)
+    python bench_word2ph.py 1024            # hidden 1024 (chinese-roberta-wwm-ext-large)
+"""
+import sys
+import time
+import importlib.util
+import os
+
+import torch
+
+# melo.text 패키지를 거치지 않고 bert_utils 만 로드 (언어별 의존성 불필요)
+_spec = importlib.util.spec_from_file_location(
+    "bert_utils", os.path.join(os.path.dirname(os.path.abspath(__file__)), "melo", "text", "bert_utils.py")
+)
+bert_utils = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bert_utils)
+
+REPEAT = 200
+BATCH = 16
+
+
+def old_word2ph_to_phone_level(res, word2ph):
+    # 변경 전 구현 (비교용)
+    phone_level_feature = []
+    for i in range(len(word2ph)):
+        repeat_feature = res[i].repeat(word2ph[i], 1)
+        phone_level_feature.append(repeat_feature)
+    phone_level_feature = torch.cat(phone_level_feature, dim=0)
+    return phone_level_feature.T
+
+
+def make_word2ph(n_tokens, generator):
+    # add_blank 적용 후와 같은 분포: 토큰당 2~8 phone, 첫 토큰 +1
+    word2ph = (torch.randint(1, 5, (n_tokens,), generator=generator) * 2).tolist()
+    word2ph[0] += 1
+    return word2ph
+
+
+def timeit(fn, repeat=REPEAT):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    hidden = int(sys.argv[1]) if len(sys.argv) > 1 else 768
+    torch.set_num_threads(1)
+    g = torch.Generator().manual_seed(0)
+
+    print("=" * 72)
+    print(f"word2ph 확장 벤치마크: hidden={hidden}, 배치={BATCH}, 반복={REPEAT}")
+    print("=" * 72)
+    print(f"{'토큰 수':>8}{'loop(ms)':>12}{'interleave(ms)':>16}{'배속':>8}"
+          f"{'batch loop(ms)':>16}{'batch(ms)':>12}{'배속':>8}")
+    for n_tokens in [50, 100, 200, 300, 500]:
+        res = torch.randn(n_tokens, hidden, generator=g)
+        word2ph = make_word2ph(n_tokens, g)
+        assert torch.equal(old_word2ph_to_phone_level(res, word2ph), bert_utils.word2ph_to_phone_level(res, word2ph))
+
+        t_old = timeit(lambda: old_word2ph_to_phone_level(res, word2ph))
+        t_new = timeit(lambda: bert_utils.word2ph_to_phone_level(res, word2ph))
+
+        batch = torch.randn(BATCH, n_tokens, hidden, generator=g)
+        word2phs = [make_word2ph(int(n_tokens * (0.5 + 0.5 * i / BATCH)), g) for i in range(BATCH)]
+        t_old_b = timeit(lambda: [old_word2ph_to_phone_level(batch[i], w) for i, w in enumerate(word2phs)], REPEAT // 10)
+        t_new_b = timeit(lambda: bert_utils.word2ph_to_phone_level_batch(batch, word2phs), REPEAT // 10)
+
+        print(f"{n_tokens:>8}{t_old:>12.3f}{t_new:>16.3f}{t_old / t_new:>7.1f}x"
+              f"{t_old_b:>16.3f}{t_new_b:>12.3f}{t_old_b / t_new_b:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""pytest 공용 옵션 / fixture (모델 준비는 testing_utils)"""
+import pytest
+
+from testing_utils import make_model
+
+
+def pytest_addoption(parser):
+    parser.addoption('--ckpt_path', default=None,
+                     help="melo.export 로 만든 .safetensors (없으면 랜덤 초기화 모델)")
+
+
+@pytest.fixture(scope='session')
+def model(request):
+    """(hps, model): --ckpt_path 체크포인트 또는 랜덤 초기화 모델"""
+    return make_model(request.config.getoption('--ckpt_path'))
+
+
+@pytest.fixture(scope='session')
+def random_model():
+    """(hps, model): 항상 랜덤 초기화 모델 (체크포인트와 무관한 구조 테스트용)"""
+    return make_model()
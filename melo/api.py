@@ -3,7 +3,6 @@ import re
 import json
 import torch
 import librosa
-import soundfile
 import torchaudio
 import numpy as np
 import torch.nn as nn
@@ -11,13 +10,20 @@ from tqdm import tqdm
 import torch
 import logging
 import psutil
+import itertools
 
 from . import utils
 from . import commons
-from .models import SynthesizerTrn
+from .export import build_model, is_inference_model, load_inference_model
 from .split_utils import split_sentence
+from .scheduler import SentenceBucketScheduler, DEFAULT_FRAMES_PER_PHONE
+from .pipeline import Prefetcher
+from .audio_writer import AudioFileWriter
+from .frontend_cache import FrontendCache
+from .quantization import quantize_int8
 from .mel_processing import spectrogram_torch, spectrogram_torch_conv
 from .download_utils import load_or_download_config, load_or_download_model
+from .text.symbols import punctuation
 
 # 로거 가져오기
 logger = logging.getLogger('pdf2mp3')
@@ -28,7 +34,14 @@ class TTS(nn.Module):
                 device='auto',
                 use_hf=True,
                 config_path=None,
-                ckpt_path=None):
+                ckpt_path=None,
+                frontend_cache=None,
+                backend='torch',
+                quantize=None,
+                max_phones=None,
+                max_frames=None,
+                dec_chunk_size=None,
+                verify_folding=False):
         super().__init__()
         if device == 'auto':
             device = 'cpu'
@@ -37,62 +50,407 @@ class TTS(nn.Module):
         if 'cuda' in device:
             assert torch.cuda.is_available()
 
-        # config_path = 
-        hps = load_or_download_config(language, use_hf=use_hf, config_path=config_path)
+        if backend not in ('torch', 'onnxruntime'):
+            raise ValueError(f"unknown backend: {backend}")
+        if quantize not in (None, 'int8'):
+            raise ValueError(f"unknown quantize mode: {quantize}")
+        if quantize is not None and (backend != 'torch' or device != 'cpu'):
+            raise ValueError("quantize='int8' is only supported with backend='torch' and device='cpu'")
+        if dec_chunk_size and backend != 'torch':
+            # ONNX decoder 그래프는 문장 전체를 한 번에 디코딩
+            raise ValueError("dec_chunk_size is only supported with backend='torch'")
+        self.backend = backend
+        if backend == 'onnxruntime':
+            # melo.export --onnx 로 만든 디렉터리 (encoder.onnx, decoder.onnx, config.json)
+            if ckpt_path is None or not os.path.isdir(ckpt_path):
+                raise ValueError("backend='onnxruntime' needs ckpt_path set to a `melo.export --onnx` directory")
+            try:
+                from .onnx_backend import OnnxSynthesizer
+            except ImportError as e:
+                raise ImportError("backend='onnxruntime' needs onnxruntime: pip install melotts[onnx]") from e
+            hps = load_or_download_config(language, config_path=config_path or os.path.join(ckpt_path, 'config.json'))
+            model = OnnxSynthesizer(ckpt_path, device=device)
+        elif ckpt_path is not None and is_inference_model(ckpt_path):
+            # melo.export 로 만든 추론 전용 모델: config 는 파일 메타데이터에 포함됨
+            # 입력 / 노이즈가 float32 라서 --fp16 파일만 float32 로 변환 (float32 파일은 mmap 그대로)
+            hps, model = load_inference_model(ckpt_path, device, dtype=torch.float32)
+        else:
+            hps = load_or_download_config(language, use_hf=use_hf, config_path=config_path)
+            model = build_model(hps).to(device)
+            # load state_dict
+            checkpoint_dict = load_or_download_model(language, device, use_hf=use_hf, ckpt_path=ckpt_path)
+            model.load_state_dict(checkpoint_dict['model'], strict=True)
 
-        num_languages = hps.num_languages
-        num_tones = hps.num_tones
         symbols = hps.symbols
 
-        model = SynthesizerTrn(
-            len(symbols),
-            hps.data.filter_length // 2 + 1,
-            hps.train.segment_size // hps.data.hop_length,
-            n_speakers=hps.data.n_speakers,
-            num_tones=num_tones,
-            num_languages=num_languages,
-            **hps.model,
-        ).to(device)
-
-        model.eval()
+        if backend == 'torch':
+            model.eval()
         self.model = model
         self.symbol_to_id = {s: i for i, s in enumerate(symbols)}
         self.hps = hps
         self.device = device
-    
-        # load state_dict
-        checkpoint_dict = load_or_download_model(language, device, use_hf=use_hf, ckpt_path=ckpt_path)
-        self.model.load_state_dict(checkpoint_dict['model'], strict=True)
+        # FrontendCache: 반복되는 문장(UI 문구, 머리말, 고지문 등)의 g2p/BERT 결과 재사용
+        if frontend_cache is True:
+            frontend_cache = FrontendCache()
+        self.frontend_cache = frontend_cache
+        # G2P 후 문장당 음소 / 예측 프레임 상한: 넘는 문장은 구두점이나 단어 경계에서 다시 나눠 합성 (_split_item)
+        self.max_phones = max_phones
+        self.max_frames = max_frames
+        # Generator 를 dec_chunk_size 프레임씩 디코딩 (SynthesizerTrn.iter_decode, 결과는 전체 디코딩과 같음)
+        self.dec_chunk_size = dec_chunk_size
+        self._punctuation_ids = {self.symbol_to_id[p] for p in punctuation if p in self.symbol_to_id}
         
         language = language.split('_')[0]
         self.language = 'ZH_MIX_EN' if language == 'ZH' else language # we support a ZH_MIX_EN model
+        self.prepare_for_inference(verify=verify_folding)
+        if quantize == 'int8':
+            # TextEncoder / flow / duration predictor 의 Linear, 1x1 Conv1d 를 동적 int8 양자화
+            quantize_int8(self.model)
+
+    def prepare_for_inference(self, verify=False, atol=1e-4):
+        """Fold weight norm / spectral norm into plain weights (SynthesizerTrn.remove_weight_norm).
+
+        With verify=True (TTS(verify_folding=True)) a short fixed input is synthesized before and
+        after folding, and a RuntimeError is raised if the two waveforms differ by more than atol.
+        Models without weight norm (melo.export files) skip the probe.
+        """
+        if self.backend != 'torch':
+            # ONNX 그래프는 export 시점에 이미 weight norm 이 제거됨
+            return 0
+        if not commons.count_weight_norm(self.model):
+            return 0
+        probe = self._probe_item() if verify else None
+        before = self._infer_batch([probe], 0, sdp_ratio=0.5, noise_scale=0., noise_scale_w=0.)[0] if verify else None
+        n_folded = self.model.remove_weight_norm()
+        if n_folded and verify:
+            after = self._infer_batch([probe], 0, sdp_ratio=0.5, noise_scale=0., noise_scale_w=0.)[0]
+            error = float(np.abs(before - after).max()) if before.shape == after.shape else float('inf')
+            if error > atol:
+                raise RuntimeError(f"weight norm folding changed the model output (max error {error:.2e})")
+            logger.debug(f"weight norm 제거: {n_folded}개 레이어, 최대 오차 {error:.2e}")
+        return n_folded
+
+    def _probe_item(self, length=16):
+        # 난수 상태를 건드리지 않도록 별도 Generator 사용
+        generator = torch.Generator().manual_seed(0)
+        phones = torch.randint(1, len(self.symbol_to_id), (length,), generator=generator)
+        tones = torch.zeros(length, dtype=torch.long)
+        lang_ids = torch.zeros(length, dtype=torch.long)
+        bert = torch.randn(self.model.enc_p.bert_proj.in_channels, length, generator=generator)
+        ja_bert = torch.randn(self.model.enc_p.ja_bert_proj.in_channels, length, generator=generator)
+        return bert, ja_bert, phones, tones, lang_ids
 
     @staticmethod
-    def audio_numpy_concat(segment_data_list, sr, speed=1.):
-        audio_segments = []
+    def audio_numpy_concat(segment_data_list, sr, speed=1., dtype=np.float32):
+        """Concatenate sentence waveforms with a short silence after each one.
+
+        The output buffer is allocated once and every segment is copied into its slot,
+        so no intermediate Python list is built. With dtype=np.int16 the segments are
+        scaled to PCM16 while being copied.
+        """
+        n_silence = int((sr * 0.05) / speed)
+        total = sum(segment_data.size + n_silence for segment_data in segment_data_list)
+        audio_segments = np.zeros(total, dtype=dtype)
+        offset = 0
         for segment_data in segment_data_list:
-            audio_segments += segment_data.reshape(-1).tolist()
-            audio_segments += [0] * int((sr * 0.05) / speed)
-        audio_segments = np.array(audio_segments).astype(np.float32)
+            segment_data = segment_data.reshape(-1)
+            out = audio_segments[offset:offset + segment_data.size]
+            if dtype == np.int16:
+                np.multiply(np.clip(segment_data, -1., 1.), 32767, out=out, casting='unsafe')
+            else:
+                out[:] = segment_data
+            offset += segment_data.size + n_silence
         return audio_segments
 
     @staticmethod
-    def split_sentences_into_pieces(text, language, quiet=False):
-        texts = split_sentence(text, language_str=language)
+    def audio_crossfade_concat(segment_data_list, sr, fade=0.01):
+        """Join the pieces of one re-split sentence with a `fade` second linear crossfade."""
+        if len(segment_data_list) == 1:
+            return segment_data_list[0]
+        n_fade = int(sr * fade)
+        out = segment_data_list[0].reshape(-1)
+        for segment_data in segment_data_list[1:]:
+            segment_data = segment_data.reshape(-1)
+            n = min(n_fade, out.size, segment_data.size)
+            ramp = np.linspace(0., 1., n, dtype=np.float32)
+            overlap = out[out.size - n:] * (1. - ramp) + segment_data[:n] * ramp
+            out = np.concatenate([out[:out.size - n], overlap, segment_data[n:]])
+        return out
+
+    @staticmethod
+    def split_sentences_into_pieces(text, language, quiet=False, max_phones=None):
+        texts = split_sentence(text, language_str=language, max_phones=max_phones)
         if not quiet:
             print(" > Text split to sentences.")
             print('\n'.join(texts))
             print(" > ===========================")
         return texts
 
-    def tts_to_file(self, text, speaker_id, output_path=None, sdp_ratio=0.2, noise_scale=0.6, noise_scale_w=0.8, speed=1.0, pbar=None, format=None, position=None, quiet=False,):
+    def _split_camel_case(self, t):
+        if self.language in ['EN', 'ZH_MIX_EN']:
+            t = re.sub(r'([a-z])([A-Z])', r'\1 \2', t)
+        return t
+
+    def _prepare_text(self, t):
+        return utils.get_text_for_tts_infer(self._split_camel_case(t), self.language, self.hps, self.device,
+                                            self.symbol_to_id, cache=self.frontend_cache, return_word2ph=True)
+
+    def _prepare_texts(self, texts):
+        """_prepare_text for several sentences, with one batched BERT pass."""
+        if len(texts) == 1:
+            return [self._prepare_text(texts[0])]
+        return utils.get_texts_for_tts_infer([self._split_camel_case(t) for t in texts], self.language, self.hps,
+                                             self.device, self.symbol_to_id, cache=self.frontend_cache,
+                                             return_word2ph=True)
+
+    def _phone_budget(self, speed=1.0, scheduler=None):
+        """Phones allowed per piece from max_phones and max_frames (predicted frames), or None."""
+        budget = self.max_phones
+        if self.max_frames:
+            frames_per_phone = scheduler.frames_per_phone if scheduler is not None else DEFAULT_FRAMES_PER_PHONE
+            frame_budget = max(1, int(self.max_frames * speed / frames_per_phone))
+            budget = frame_budget if budget is None else min(budget, frame_budget)
+        return budget
+
+    def _split_item(self, item, max_phones):
+        """Split a prepared sentence with more than max_phones phones into pieces that fit.
+
+        Like split_utils.split_sentences_budget, the piece count is the fewest that fit
+        (ceil(phones / max_phones), counting the blank shared at each cut) and a DP places the cuts
+        so the pieces are close to phones / count. Cuts after punctuation are free, word (BERT
+        token) boundaries from word2ph cost a little and cuts inside a word a lot. With add_blank
+        the blank at the cut is kept by both pieces. BERT features are sliced, so the frontend
+        does not run again.
+        """
+        phones = item[2]
+        n = phones.size(0)
+        if max_phones is None or n <= max_phones:
+            return [item]
+        max_phones = max(max_phones, 2)
+        ids = phones.tolist()
+        word2ph = item[5] if len(item) > 5 else None
+
+        # 경계 blank 를 공유하므로 조각 k 개가 덮는 음소는 1 + k * (max_phones - 1) 개
+        size = n / -(-(n - 1) // (max_phones - 1))
+        penalty = [size ** 2] * (n + 1)
+        penalty[n] = 0.
+        if word2ph is not None:
+            for w in itertools.accumulate(word2ph):
+                if 0 < w < n:
+                    penalty[w - 1 if ids[w - 1] == 0 else w] = (size / 4) ** 2
+        for i, p in enumerate(ids[:-1]):
+            if p in self._punctuation_ids:
+                penalty[i + 1] = 0.
+
+        def piece_end(c):
+            return c + 1 if c < n and ids[c] == 0 else c
+
+        # best[c]: c 에서 시작하는 조각 앞까지의 (조각 수 + 단어 중간 자름 수, 제곱 오차 + 자르는 위치 비용)
+        # 최솟값. 단어 중간을 자르느니 조각을 하나 더 만듦
+        best = [(0, 0.)] + [(n + 1, 0.)] * n
+        prev = [0] * (n + 1)
+        for c in range(1, n + 1):
+            for a in range(c - 1, -1, -1):
+                length = piece_end(c) - a
+                if length > max_phones:
+                    break
+                cost = (best[a][0] + 1 + (penalty[c] == size ** 2), best[a][1] + (length - size) ** 2 + penalty[c])
+                if cost < best[c]:
+                    best[c] = cost
+                    prev[c] = a
+        cuts = [n]
+        while cuts[-1] > 0:
+            cuts.append(prev[cuts[-1]])
+        cuts.reverse()
+        ranges = [(a, piece_end(c)) for a, c in zip(cuts, cuts[1:])]
+        logger.debug(f"긴 문장 분할: 음소 {n}개 -> {[b - a for a, b in ranges]}")
+        return [tuple(t[..., a:b] for t in item[:5]) for a, b in ranges]
+
+    def _infer_batch(self, batch, speaker_id, sdp_ratio=0.2, noise_scale=0.6, noise_scale_w=0.8, speed=1.0, scheduler=None):
+        """Run SynthesizerTrn.infer_fast once for several sentences.
+
+        batch: list of (bert, ja_bert, phones, tones, lang_ids[, word2ph]) from _prepare_text.
+        Returns one float32 numpy waveform per item, trimmed by its y_mask length.
+        """
+        device = self.device
+        hop_length = self.hps.data.hop_length
+        lengths = [item[2].size(0) for item in batch]
+        max_len = max(lengths)
+        n = len(batch)
+
+        # 짧은 문장은 0으로 패딩하고 x_lengths 로 마스킹
+        x_tst = torch.zeros(n, max_len, dtype=torch.long)
+        tones = torch.zeros(n, max_len, dtype=torch.long)
+        lang_ids = torch.zeros(n, max_len, dtype=torch.long)
+        bert = torch.zeros(n, batch[0][0].size(0), max_len)
+        ja_bert = torch.zeros(n, batch[0][1].size(0), max_len)
+        for i, item in enumerate(batch):
+            b, jb, p, t, l = item[:5]
+            x_tst[i, :p.size(0)] = p
+            tones[i, :t.size(0)] = t
+            lang_ids[i, :l.size(0)] = l
+            bert[i, :, :b.size(1)] = b
+            ja_bert[i, :, :jb.size(1)] = jb
+
+        if self.backend == 'onnxruntime':
+            o, _, y_mask, _ = self.model.infer(
+                    x_tst.numpy(),
+                    np.array(lengths),
+                    np.full(n, speaker_id),
+                    tones.numpy(),
+                    lang_ids.numpy(),
+                    bert.numpy(),
+                    ja_bert.numpy(),
+                    sdp_ratio=sdp_ratio,
+                    noise_scale=noise_scale,
+                    noise_scale_w=noise_scale_w,
+                    length_scale=1. / speed,
+                )
+            y_lengths = y_mask.sum((1, 2)).astype(int).tolist()
+            if scheduler is not None:
+                scheduler.record(lengths, y_lengths, speed=speed)
+            return [o[i, 0, :y_lengths[i] * hop_length] for i in range(n)]
+
+        with torch.no_grad():
+            x_tst = x_tst.to(device)
+            tones = tones.to(device)
+            lang_ids = lang_ids.to(device)
+            bert = bert.to(device)
+            ja_bert = ja_bert.to(device)
+            x_tst_lengths = torch.LongTensor(lengths).to(device)
+            speakers = torch.LongTensor([speaker_id] * n).to(device)
+            o, _, y_mask, _ = self.model.infer_fast(
+                    x_tst,
+                    x_tst_lengths,
+                    speakers,
+                    tones,
+                    lang_ids,
+                    bert,
+                    ja_bert,
+                    sdp_ratio=sdp_ratio,
+                    noise_scale=noise_scale,
+                    noise_scale_w=noise_scale_w,
+                    length_scale=1. / speed,
+                    dec_chunk_size=self.dec_chunk_size,
+                )
+            y_lengths = y_mask.sum([1, 2]).long().tolist()
+            audios = [o[i, 0, :y_lengths[i] * hop_length].data.cpu().float().numpy() for i in range(n)]
+            if scheduler is not None:
+                scheduler.record(lengths, y_lengths, speed=speed)
+            del x_tst, tones, lang_ids, bert, ja_bert, x_tst_lengths, speakers, o, y_mask
+            # 메모리 정리 강화
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        return audios
+
+    def _iter_item_audio(self, item, speaker_id, chunk_size, sdp_ratio=0.2, noise_scale=0.6, noise_scale_w=0.8, speed=1.0):
+        """Synthesize one prepared sentence and yield its audio chunk_size frames at a time.
+
+        The text encoder, durations and flow run once; the Generator runs per chunk
+        (SynthesizerTrn.iter_decode), so the first audio is available before the whole sentence is decoded.
+        """
+        device = self.device
+        bert, ja_bert, phones, tones, lang_ids = (t.unsqueeze(0).to(device) for t in item[:5])
+        speakers = torch.LongTensor([speaker_id]).to(device)
+        with torch.no_grad():
+            _, _, y_mask, (z, _, _, _) = self.model.infer_fast(
+                    phones,
+                    torch.LongTensor([phones.size(1)]).to(device),
+                    speakers,
+                    tones,
+                    lang_ids,
+                    bert,
+                    ja_bert,
+                    sdp_ratio=sdp_ratio,
+                    noise_scale=noise_scale,
+                    noise_scale_w=noise_scale_w,
+                    length_scale=1. / speed,
+                    decode=False,
+                )
+            z = (z * y_mask)[:, :, :int(y_mask.sum())]
+            g = self.model.emb_g(speakers).unsqueeze(-1)
+        for o in self.model.iter_decode(z, g=g, chunk_size=chunk_size):
+            yield o[0, 0].data.cpu().float().numpy()
+
+    def _iter_pieces_audio(self, pieces, speaker_id, chunk_size, fade=0.01, **kwargs):
+        """Stream the pieces of one sentence (_split_item), crossfaded into each other like audio_crossfade_concat."""
+        sr = self.hps.data.sampling_rate
+        n_fade = int(sr * fade)
+        tail = None
+        for k, piece in enumerate(pieces):
+            pending = None
+            for chunk in self._iter_item_audio(piece, speaker_id, chunk_size, **kwargs):
+                if tail is not None:
+                    chunk = self.audio_crossfade_concat([tail, chunk], sr, fade)
+                    tail = None
+                if pending is not None:
+                    yield pending
+                pending = chunk
+            if pending is None:
+                continue
+            if k == len(pieces) - 1:
+                yield pending
+            else:
+                # 조각 끝 n_fade 샘플은 다음 조각 시작과 crossfade 하도록 보류
+                tail = pending[pending.size - min(n_fade, pending.size):]
+                if pending.size > tail.size:
+                    yield pending[:pending.size - tail.size]
+
+    def _infer_window(self, items, speaker_id, scheduler=None, **kwargs):
+        """Synthesize a window of prepared sentences and return the audio in the original order."""
+        if scheduler is None:
+            return [self._infer_batch([item], speaker_id, **kwargs)[0] for item in items]
+        lengths = [item[2].size(0) for item in items]
+        audios = [None] * len(items)
+        for batch in scheduler.schedule(lengths, speed=kwargs.get('speed', 1.0)):
+            batch_audios = self._infer_batch([items[i] for i in batch], speaker_id, scheduler=scheduler, **kwargs)
+            for i, audio in zip(batch, batch_audios):
+                audios[i] = audio
+        return audios
+
+    def _iter_frontend(self, texts, frontend_window, ramp=False):
+        """Yield (first, last, items) for every frontend_window sentences, items from _prepare_texts.
+
+        With ramp the groups grow 1, 2, 4, ... up to frontend_window, so the first sentence
+        is not held behind the frontend of the others (tts_iter first-chunk latency).
+        """
+        group_size = 1 if ramp else frontend_window
+        sentence_count = 0
+        pending = []
+        for t in texts:
+            sentence_count += 1
+            if sentence_count % 5 == 1:  # 5문장마다 메모리 로그
+                try:
+                    process = psutil.Process(os.getpid())
+                    mem_mb = process.memory_info().rss / 1024 / 1024
+                    logger.debug(f"문장 {sentence_count}/{len(texts)} 처리 전 메모리: {mem_mb:.1f}MB")
+                except:
+                    pass
+            
+            pending.append(t)
+            if len(pending) < group_size and sentence_count < len(texts):
+                continue
+
+            first = sentence_count - len(pending) + 1
+            logger.debug(f"문장 {first}-{sentence_count} BERT 로드 중...")
+            items = self._prepare_texts(pending)
+            pending = []
+            group_size = min(group_size * 2, frontend_window)
+            yield first, sentence_count, items
+
+    def _iter_sentence_audio(self, text, speaker_id, sdp_ratio=0.2, noise_scale=0.6, noise_scale_w=0.8, speed=1.0, pbar=None, position=None, quiet=False, batch_size=1, scheduler=None, bert_batch_size=16, pipeline=0, frontend_threads=None, stream_chunk_size=None, ramp=False):
+        """Yield the audio of every sentence, or with stream_chunk_size a generator of its chunks.
+
+        ramp is passed to _iter_frontend (tts_iter sets it, tts_to_file keeps full BERT batches).
+        """
         language = self.language
-        logger.debug(f"tts_to_file 시작: 텍스트 길이 {len(text)} 문자")
-        
-        texts = self.split_sentences_into_pieces(text, language, quiet)
+        # KR / JP 문장 묶음도 max_phones / max_frames 예산에 맞춤 (estimate_phones 는 blank 를 세지 않음)
+        budget = self._phone_budget(speed, scheduler)
+        if budget is not None and self.hps.data.add_blank:
+            budget = max(1, (budget - 1) // 2)
+        texts = self.split_sentences_into_pieces(text, language, quiet, max_phones=budget)
         logger.debug(f"문장 분할 완료: {len(texts)}개 문장")
         
-        audio_list = []
         if pbar:
             tx = pbar(texts)
         else:
@@ -102,58 +460,135 @@ class TTS(nn.Module):
                 tx = texts
             else:
                 tx = tqdm(texts)
+        # 진행 표시는 문장 오디오가 나올 때마다 한 칸씩 진행
+        tx = iter(tx)
         
-        sentence_count = 0
-        for t in tx:
-            sentence_count += 1
-            if sentence_count % 5 == 1:  # 5문장마다 메모리 로그
-                try:
-                    process = psutil.Process(os.getpid())
-                    mem_mb = process.memory_info().rss / 1024 / 1024
-                    logger.debug(f"문장 {sentence_count}/{len(texts)} 처리 전 메모리: {mem_mb:.1f}MB")
-                except:
-                    pass
-            
-            if language in ['EN', 'ZH_MIX_EN']:
-                t = re.sub(r'([a-z])([A-Z])', r'\1 \2', t)
-            device = self.device
-            
-            logger.debug(f"문장 {sentence_count} BERT 로드 중...")
-            bert, ja_bert, phones, tones, lang_ids = utils.get_text_for_tts_infer(t, language, self.hps, device, self.symbol_to_id)
-            logger.debug(f"문장 {sentence_count} 추론 시작")
-            
-            with torch.no_grad():
-                x_tst = phones.to(device).unsqueeze(0)
-                tones = tones.to(device).unsqueeze(0)
-                lang_ids = lang_ids.to(device).unsqueeze(0)
-                bert = bert.to(device).unsqueeze(0)
-                ja_bert = ja_bert.to(device).unsqueeze(0)
-                x_tst_lengths = torch.LongTensor([phones.size(0)]).to(device)
-                del phones
-                speakers = torch.LongTensor([speaker_id]).to(device)
-                audio = self.model.infer(
-                        x_tst,
-                        x_tst_lengths,
-                        speakers,
-                        tones,
-                        lang_ids,
-                        bert,
-                        ja_bert,
-                        sdp_ratio=sdp_ratio,
-                        noise_scale=noise_scale,
-                        noise_scale_w=noise_scale_w,
-                        length_scale=1. / speed,
-                    )[0][0, 0].data.cpu().float().numpy()
-                del x_tst, tones, lang_ids, bert, ja_bert, x_tst_lengths, speakers
-                # 메모리 정리 강화
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-            
-            logger.debug(f"문장 {sentence_count} 추론 완료")
-            audio_list.append(audio)
-            del audio  # 명시적 삭제
+        if stream_chunk_size:
+            # 문장 안 스트리밍은 문장을 하나씩 합성
+            batch_size, scheduler = 1, None
+        # batch_size > 1 이면 길이가 비슷한 문장끼리 묶어서 infer 한 번으로 처리
+        if batch_size > 1 and scheduler is None:
+            scheduler = SentenceBucketScheduler(batch_size=batch_size)
+        window = scheduler.batch_size * 4 if scheduler is not None else 1
+        # BERT 는 bert_batch_size 문장씩 묶어서 한 번에 forward
+        frontend_window = max(window, bert_batch_size)
+
+        chunks = self._iter_frontend(texts, frontend_window, ramp=ramp)
+        main_threads = None
+        if pipeline > 0:
+            # 다음 pipeline 개 묶음의 g2p / BERT 를 별도 스레드에서 미리 계산 (현재 묶음 추론과 겹침)
+            if frontend_threads:
+                main_threads = torch.get_num_threads()
+                torch.set_num_threads(max(1, main_threads - frontend_threads))
+            chunks = Prefetcher(chunks, depth=pipeline, num_threads=frontend_threads)
+        try:
+            for first, last, items in chunks:
+                # 예산을 넘는 문장은 여러 조각으로 합성한 뒤 crossfade 로 다시 이어 붙임
+                budget = self._phone_budget(speed, scheduler)
+                pieces = []
+                n_pieces = []
+                for item in items:
+                    split = self._split_item(item, budget)
+                    pieces.extend(split)
+                    n_pieces.append(len(split))
+                del items
+                if stream_chunk_size:
+                    for n in n_pieces:
+                        next(tx, None)
+                        yield self._iter_pieces_audio(pieces[:n], speaker_id, stream_chunk_size, sdp_ratio=sdp_ratio,
+                                                      noise_scale=noise_scale, noise_scale_w=noise_scale_w, speed=speed)
+                        pieces = pieces[n:]
+                    continue
+                sentence_pieces = []
+                for start in range(0, len(pieces), window):
+                    logger.debug(f"문장 {first}-{last} 조각 {start + 1}-{min(start + window, len(pieces))} 추론 시작")
+                    audios = self._infer_window(pieces[start:start + window], speaker_id, scheduler=scheduler,
+                                                sdp_ratio=sdp_ratio, noise_scale=noise_scale,
+                                                noise_scale_w=noise_scale_w, speed=speed)
+                    for audio in audios:
+                        sentence_pieces.append(audio)
+                        if len(sentence_pieces) < n_pieces[0]:
+                            continue
+                        n_pieces.pop(0)
+                        next(tx, None)
+                        yield self.audio_crossfade_concat(sentence_pieces, self.hps.data.sampling_rate)
+                        sentence_pieces = []
+                    del audios
+                del pieces
+                logger.debug(f"문장 {last} 추론 완료")
+        finally:
+            if pipeline > 0:
+                chunks.close()
+            if main_threads is not None:
+                torch.set_num_threads(main_threads)
+        for _ in tx:
+            pass
         
-        logger.debug(f"모든 문장 처리 완료, 오디오 결합 시작")
+        if scheduler is not None:
+            scheduler.report()
+
+    def tts_iter(self, text, speaker_id, sdp_ratio=0.2, noise_scale=0.6, noise_scale_w=0.8, speed=1.0, pbar=None, position=None, quiet=False, batch_size=1, scheduler=None, bert_batch_size=16, pipeline=0, frontend_threads=None, stream_chunk_size=None, ramp_frontend=True):
+        """Yield float32 numpy audio for each sentence as soon as it is synthesized.
+
+        Every chunk already ends with the inter-sentence silence, so concatenating the
+        chunks gives the same waveform as tts_to_file(output_path=None).
+
+        With pipeline=k > 0 the frontend (g2p + BERT) of the next k sentence groups runs in a
+        background thread while the current group is synthesized; frontend_threads torch threads
+        go to that thread and the rest stay with the acoustic model. The audio is unchanged.
+
+        With stream_chunk_size (frames) the Generator output of each sentence is yielded in chunks
+        as it is decoded, followed by a chunk holding the silence; sentences are not batched.
+        Only the torch backend supports it (ValueError otherwise).
+
+        With ramp_frontend the g2p / BERT groups grow 1, 2, 4, ... up to bert_batch_size, so the
+        first sentence is synthesized after a single-sentence frontend call. tts_to_file turns it
+        off and runs full bert_batch_size groups from the start.
+        """
+        if stream_chunk_size and self.backend != 'torch':
+            raise ValueError("stream_chunk_size is only supported with backend='torch'")
+        logger.debug(f"tts_iter 시작: 텍스트 길이 {len(text)} 문자")
+        n_silence = int((self.hps.data.sampling_rate * 0.05) / speed)
+        for audio in self._iter_sentence_audio(text, speaker_id, sdp_ratio=sdp_ratio, noise_scale=noise_scale,
+                                               noise_scale_w=noise_scale_w, speed=speed, pbar=pbar, position=position,
+                                               quiet=quiet, batch_size=batch_size, scheduler=scheduler,
+                                               bert_batch_size=bert_batch_size, pipeline=pipeline,
+                                               frontend_threads=frontend_threads, stream_chunk_size=stream_chunk_size,
+                                               ramp=ramp_frontend):
+            if stream_chunk_size:
+                for chunk in audio:
+                    yield chunk.astype(np.float32, copy=False)
+                yield np.zeros(n_silence, dtype=np.float32)
+                continue
+            chunk = np.zeros(len(audio) + n_silence, dtype=np.float32)
+            chunk[:len(audio)] = audio
+            yield chunk
+
+    def tts_to_file(self, text, speaker_id, output_path=None, sdp_ratio=0.2, noise_scale=0.6, noise_scale_w=0.8, speed=1.0, pbar=None, format=None, position=None, quiet=False, batch_size=1, scheduler=None, bert_batch_size=16, flush_every=10.0, pipeline=0, frontend_threads=None):
+        logger.debug(f"tts_to_file 시작: 텍스트 길이 {len(text)} 문자")
+        
+        if output_path is not None:
+            # 파일 저장 모드: 문장이 합성되는 대로 파일에 바로 기록 (전체 파형을 메모리에 두지 않음)
+            logger.debug(f"파일 스트리밍 저장 시작: {output_path}")
+            with AudioFileWriter(output_path, self.hps.data.sampling_rate, format=format, flush_every=flush_every) as writer:
+                for chunk in self.tts_iter(text, speaker_id, sdp_ratio=sdp_ratio, noise_scale=noise_scale,
+                                           noise_scale_w=noise_scale_w, speed=speed, pbar=pbar, position=position,
+                                           quiet=quiet, batch_size=batch_size, scheduler=scheduler,
+                                           bert_batch_size=bert_batch_size, pipeline=pipeline,
+                                           frontend_threads=frontend_threads, ramp_frontend=False):
+                    writer.write(chunk)
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            logger.info(f"파일 저장 완료: {output_path}")
+            return
+        
+        audio_list = list(self._iter_sentence_audio(text, speaker_id, sdp_ratio=sdp_ratio, noise_scale=noise_scale,
+                                                    noise_scale_w=noise_scale_w, speed=speed, pbar=pbar, position=position,
+                                                    quiet=quiet, batch_size=batch_size, scheduler=scheduler,
+                                                    bert_batch_size=bert_batch_size, pipeline=pipeline,
+                                                    frontend_threads=frontend_threads))
+        
+        logger.debug("모든 문장 처리 완료, 오디오 결합 시작")
         # 최종 메모리 정리
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
@@ -164,15 +599,5 @@ class TTS(nn.Module):
         # audio_list 메모리 해제
         del audio_list
         
-        if output_path is None:
-            logger.debug("메모리 반환 모드")
-            return audio
-        else:
-            logger.debug(f"파일 저장 시작: {output_path}")
-            if format:
-                soundfile.write(output_path, audio, self.hps.data.sampling_rate, format=format)
-            else:
-                soundfile.write(output_path, audio, self.hps.data.sampling_rate)
-            logger.info(f"파일 저장 완료: {output_path}")
-            # 파일 저장 후 메모리 해제
-            del audio
+        logger.debug("메모리 반환 모드")
+        return audio
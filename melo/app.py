@@ -4,20 +4,22 @@ import gradio as gr
 import os, torch, io
 # os.system('python -m unidic download')
 print("Make sure you've downloaded unidic (python -m unidic download) for this WebUI to work.")
-from melo.api import TTS
+from functools import lru_cache
+from melo.model_manager import ModelManager
+from melo.download_utils import load_or_download_config
 speed = 1.0
 import tempfile
 import click
 device = 'auto'
-models = {
-    'EN': TTS(language='EN', device=device),
-    'ES': TTS(language='ES', device=device),
-    'FR': TTS(language='FR', device=device),
-    'ZH': TTS(language='ZH', device=device),
-    'JP': TTS(language='JP', device=device),
-    'KR': TTS(language='KR', device=device),
-}
-speaker_ids = models['EN'].hps.data.spk2id
+# models are loaded on first use; MELO_MAX_MEMORY_MB caps the parameter memory of the loaded ones
+max_memory_mb = os.environ.get('MELO_MAX_MEMORY_MB')
+models = ModelManager(max_memory=int(max_memory_mb) * 1024 * 1024 if max_memory_mb else None)
+
+@lru_cache(maxsize=None)
+def get_speaker_ids(language):
+    return load_or_download_config(language).data.spk2id
+
+speaker_ids = get_speaker_ids('EN')
 
 default_text_dict = {
     'EN': 'The field of text-to-speech has seen rapid development recently.',
@@ -30,14 +32,15 @@ default_text_dict = {
     
 def synthesize(speaker, text, speed, language, progress=gr.Progress()):
     bio = io.BytesIO()
-    models[language].tts_to_file(text, models[language].hps.data.spk2id[speaker], bio, speed=speed, pbar=progress.tqdm, format='wav')
+    model = models.get(language, device=device)
+    model.tts_to_file(text, model.hps.data.spk2id[speaker], bio, speed=speed, pbar=progress.tqdm, format='wav')
     return bio.getvalue()
 def load_speakers(language, text):
     if text in list(default_text_dict.values()):
         newtext = default_text_dict[language]
     else:
         newtext = text
-    return gr.update(value=list(models[language].hps.data.spk2id.keys())[0], choices=list(models[language].hps.data.spk2id.keys())), newtext
+    return gr.update(value=list(get_speaker_ids(language).keys())[0], choices=list(get_speaker_ids(language).keys())), newtext
 with gr.Blocks() as demo:
     gr.Markdown('# MeloTTS WebUI\n\nA WebUI for MeloTTS.')
     with gr.Group():
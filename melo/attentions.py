@@ -8,6 +8,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# query rows per block in MultiHeadAttention.attention_blockwise
+INFERENCE_BLOCK_SIZE = 256
+
+
+def _use_blockwise_attention(module):
+    """Inference path: eval mode and not being traced (ONNX export keeps the reference graph)."""
+    return not (module.training or torch.jit.is_tracing() or torch.jit.is_scripting())
+
 
 class LayerNorm(nn.Module):
     def __init__(self, channels, eps=1e-5):
@@ -95,14 +103,21 @@ class Encoder(nn.Module):
             )
             self.norm_layers_2.append(LayerNorm(hidden_channels))
 
-    def forward(self, x, x_mask, g=None):
-        attn_mask = x_mask.unsqueeze(2) * x_mask.unsqueeze(-1)
+    def project_g(self, g):
+        return self.spk_emb_linear(g.transpose(1, 2)).transpose(1, 2)
+
+    def forward(self, x, x_mask, g=None, g_proj=None):
+        if _use_blockwise_attention(self):
+            # key mask only, padded query rows are zeroed by x_mask below; avoids a [t, t] mask
+            attn_mask = x_mask.unsqueeze(2)
+        else:
+            attn_mask = x_mask.unsqueeze(2) * x_mask.unsqueeze(-1)
         x = x * x_mask
+        if g_proj is None and g is not None and self.cond_layer_idx < self.n_layers:
+            g_proj = self.project_g(g)
         for i in range(self.n_layers):
-            if i == self.cond_layer_idx and g is not None:
-                g = self.spk_emb_linear(g.transpose(1, 2))
-                g = g.transpose(1, 2)
-                x = x + g
+            if i == self.cond_layer_idx and g_proj is not None:
+                x = x + g_proj
                 x = x * x_mask
             y = self.attn_layers[i](x, x, attn_mask)
             y = self.drop(y)
@@ -260,7 +275,15 @@ class MultiHeadAttention(nn.Module):
         k = self.conv_k(c)
         v = self.conv_v(c)
 
-        x, self.attn = self.attention(q, k, v, mask=attn_mask)
+        if (
+            _use_blockwise_attention(self)
+            and not self.proximal_bias
+            and self.block_length is None
+        ):
+            x = self.attention_blockwise(q, k, v, mask=attn_mask)
+            self.attn = None
+        else:
+            x, self.attn = self.attention(q, k, v, mask=attn_mask)
 
         x = self.conv_o(x)
         return x
@@ -316,6 +339,52 @@ class MultiHeadAttention(nn.Module):
         )  # [b, n_h, t_t, d_k] -> [b, d, t_t]
         return output, p_attn
 
+    def attention_blockwise(self, query, key, value, mask=None, block_size=INFERENCE_BLOCK_SIZE):
+        """Inference version of attention(): same output, computed block_size query rows at a time.
+
+        Relative positions only reach window_size steps, so their logits / weights are
+        scattered into and gathered from the 2 * window_size + 1 diagonals of each block
+        instead of building [t, 2t - 1] tensors. Peak memory is O(block_size * t_s) and the
+        attention map is not returned.
+        """
+        b, d, t_s, t_t = (*key.size(), query.size(2))
+        query = query.view(b, self.n_heads, self.k_channels, t_t).transpose(2, 3)
+        query = query / math.sqrt(self.k_channels)
+        key = key.view(b, self.n_heads, self.k_channels, t_s)
+        value = value.view(b, self.n_heads, self.k_channels, t_s).transpose(2, 3)
+        if self.window_size is not None:
+            assert (
+                t_s == t_t
+            ), "Relative attention is only available for self-attention."
+            offsets = torch.arange(
+                -self.window_size, self.window_size + 1, device=query.device
+            )
+            emb_rel_k = self.emb_rel_k.unsqueeze(0).transpose(-2, -1)
+            emb_rel_v = self.emb_rel_v.unsqueeze(0)
+
+        output = torch.empty_like(query)
+        for start in range(0, t_t, block_size):
+            end = min(start + block_size, t_t)
+            q = query[:, :, start:end]
+            scores = torch.matmul(q, key)  # [b, n_h, block, t_s]
+            if self.window_size is not None:
+                # index[i, r]: key position of relative offset r - window_size for row i
+                index = torch.arange(start, end, device=query.device).unsqueeze(1) + offsets
+                outside = (index < 0) | (index >= t_s)
+                index = index.clamp(0, t_s - 1).expand(b, self.n_heads, -1, -1)
+                rel_logits = torch.matmul(q, emb_rel_k).masked_fill(outside, 0)
+                scores = scores.scatter_add(-1, index, rel_logits)
+            if mask is not None:
+                block_mask = mask[:, :, start:end] if mask.size(2) > 1 else mask
+                scores = scores.masked_fill(block_mask == 0, -1e4)
+            p_attn = F.softmax(scores, dim=-1)
+            out = torch.matmul(p_attn, value)
+            if self.window_size is not None:
+                relative_weights = p_attn.gather(-1, index).masked_fill(outside, 0)
+                out = out + torch.matmul(relative_weights, emb_rel_v)
+            output[:, :, start:end] = out
+        return output.transpose(2, 3).contiguous().view(b, d, t_t)
+
     def _matmul_with_relative_values(self, x, y):
         """
         x: [b, h, l, m]
@@ -0,0 +1,76 @@
+import os
+import logging
+
+import numpy as np
+import soundfile
+
+logger = logging.getLogger('pdf2mp3')
+
+# 헤더에 길이를 기록하고 libsndfile 이 읽기/쓰기 ('r+') 로 다시 열 수 있는 형식
+HEADER_FORMATS = {'WAV', 'WAVEX', 'W64', 'RF64', 'AIFF', 'AU', 'CAF'}
+
+
+class AudioFileWriter:
+    """Append audio to a file while it is being synthesized.
+
+    The file is opened once with soundfile.SoundFile (WAV/FLAC/OGG/MP3, chosen from the
+    extension or `format`) and every chunk is written as soon as it arrives, so the whole
+    waveform never has to be held in memory. Every `flush_every` seconds of audio the
+    file is flushed. For formats with a length header (HEADER_FORMATS, e.g. WAV) written to
+    a path, the file is also closed and reopened with mode 'r+', which makes libsndfile
+    rewrite the header, so a crash leaves a playable file up to the last flush. FLAC, OGG
+    and MP3 have no header to update and are only flushed; how much of such a file survives
+    a crash is up to the decoder.
+    """
+
+    def __init__(self, path, samplerate, format=None, subtype=None, flush_every=10.0):
+        if format is None and isinstance(path, str):
+            ext = path.rsplit('.', 1)[-1].upper() if '.' in path else ''
+            if ext == 'MP3' and 'MP3' not in soundfile.available_formats():
+                raise ValueError(
+                    f"libsndfile {soundfile.__libsndfile_version__} cannot write MP3, "
+                    "soundfile>=0.12 with libsndfile>=1.1 is required"
+                )
+        self.path = path
+        self.samplerate = samplerate
+        self.flush_every = int(flush_every * samplerate) if flush_every else 0
+        self.frames = 0
+        self._unflushed = 0
+        self._file = soundfile.SoundFile(
+            path, 'w', samplerate=samplerate, channels=1, format=format, subtype=subtype
+        )
+        self._rewrite_header = isinstance(path, (str, os.PathLike)) and self._file.format in HEADER_FORMATS
+
+    def write(self, chunk):
+        chunk = np.asarray(chunk).reshape(-1)
+        self._file.write(chunk)
+        self.frames += chunk.size
+        self._unflushed += chunk.size
+        if self.flush_every and self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        if self._rewrite_header:
+            # close() 가 헤더를 갱신하고, 'r+' 로 다시 열어 끝에서부터 이어 씀
+            self._file.close()
+            try:
+                self._file = soundfile.SoundFile(self.path, 'r+')
+                self._file.seek(0, soundfile.SEEK_END)
+            except (RuntimeError, OSError) as e:
+                # 닫힌 파일에는 더 쓸 수 없으므로 에러를 그대로 전달
+                self._rewrite_header = False
+                logger.warning(f"{self.path} 를 다시 열지 못해 오디오 기록을 계속할 수 없습니다: {e}")
+                raise
+        self._unflushed = 0
+        logger.debug(f"오디오 flush: {self.frames / self.samplerate:.1f}초 기록됨")
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
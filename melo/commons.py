@@ -1,6 +1,9 @@
 import math
 import torch
 from torch.nn import functional as F
+from torch.nn.utils import parametrize, remove_weight_norm, remove_spectral_norm
+from torch.nn.utils.weight_norm import WeightNorm
+from torch.nn.utils.spectral_norm import SpectralNorm
 
 
 def init_weights(m, mean=0.0, std=0.01):
@@ -158,3 +161,35 @@ def clip_grad_value_(parameters, clip_value, norm_type=2):
             p.grad.data.clamp_(min=-clip_value, max=clip_value)
     total_norm = total_norm ** (1.0 / norm_type)
     return total_norm
+
+
+def count_weight_norm(model):
+    """Number of tensors fold_weight_norm(model) would fold."""
+    n = 0
+    for module in model.modules():
+        n += sum(isinstance(hook, (WeightNorm, SpectralNorm)) for hook in module._forward_pre_hooks.values())
+        if parametrize.is_parametrized(module):
+            n += len(module.parametrizations)
+    return n
+
+
+def fold_weight_norm(model):
+    """Fold every weight_norm / spectral_norm in model into a plain weight, in place.
+
+    Handles both the hook based torch.nn.utils.weight_norm / spectral_norm used by this repo and
+    torch.nn.utils.parametrizations. Returns the number of folded tensors.
+    """
+    n_folded = 0
+    for module in model.modules():
+        for hook in list(module._forward_pre_hooks.values()):
+            if isinstance(hook, WeightNorm):
+                remove_weight_norm(module, hook.name)
+                n_folded += 1
+            elif isinstance(hook, SpectralNorm):
+                remove_spectral_norm(module, hook.name)
+                n_folded += 1
+        if parametrize.is_parametrized(module):
+            for name in list(module.parametrizations.keys()):
+                parametrize.remove_parametrizations(module, name, leave_parametrized=True)
+                n_folded += 1
+    return n_folded
@@ -0,0 +1,248 @@
+"""Export a checkpoint as a slim inference-only artifact.
+
+The training checkpoint.pth holds the whole SynthesizerTrn (including the PosteriorEncoder
+enc_q, which infer never runs) with weight norm still split into weight_g / weight_v. The
+exported .safetensors file keeps only what infer needs, with weight norm already folded,
+optionally stored as float16, and carries the model config in its metadata, so it loads
+without config.json:
+
+    python -m melo.export -l KR -o melo-kr.safetensors --fp16
+    tts = TTS(language='KR', ckpt_path='melo-kr.safetensors')
+
+With --onnx, infer is split into two ONNX graphs for onnx_backend.OnnxSynthesizer: encoder.onnx
+(text encoder + duration predictors) and decoder.onnx (reverse flow + generator). The length
+regulation between them (commons.generate_path) runs in numpy. It needs the `onnx` extra
+(pip install melotts[onnx]):
+
+    python -m melo.export -l KR -o melo-kr-onnx --onnx
+    tts = TTS(language='KR', ckpt_path='melo-kr-onnx', backend='onnxruntime')
+"""
+import os
+import json
+
+import click
+import torch
+from safetensors import safe_open
+from safetensors.torch import save_file
+
+from . import utils
+from .models import SynthesizerTrn
+from .download_utils import load_or_download_config, load_or_download_model
+
+FORMAT = "melo-inference"
+VERSION = "1"
+
+
+def build_model(hps, inference_only=False):
+    return SynthesizerTrn(
+        len(hps.symbols),
+        hps.data.filter_length // 2 + 1,
+        hps.train.segment_size // hps.data.hop_length,
+        n_speakers=hps.data.n_speakers,
+        num_tones=hps.num_tones,
+        num_languages=hps.num_languages,
+        inference_only=inference_only,
+        **hps.model,
+    )
+
+
+def is_inference_model(path):
+    return str(path).endswith(".safetensors")
+
+
+def build_inference_model(hps, state_dict):
+    """SynthesizerTrn without enc_q, loaded from a training state_dict, weight norm folded."""
+    model = build_model(hps, inference_only=True)
+    model.load_state_dict({k: v for k, v in state_dict.items() if not k.startswith("enc_q.")}, strict=True)
+    model.remove_weight_norm()
+    return model.eval()
+
+
+def export_inference_model(hps, state_dict, output_path, half=False):
+    """Write the infer-only part of a SynthesizerTrn state_dict to output_path (safetensors)."""
+    model = build_inference_model(hps, state_dict)
+
+    dtype = torch.float16 if half else torch.float32
+    tensors = {
+        k: (v.to(dtype) if v.is_floating_point() else v).detach().cpu().contiguous()
+        for k, v in model.state_dict().items()
+    }
+    metadata = {
+        "format": FORMAT,
+        "version": VERSION,
+        "dtype": str(dtype).replace("torch.", ""),
+        "config": json.dumps(hps.to_dict(), ensure_ascii=False),
+    }
+    save_file(tensors, output_path, metadata=metadata)
+    return output_path
+
+
+def load_inference_model(path, device="cpu", dtype=None):
+    """Load an export_inference_model file -> (hps, model in eval mode on device).
+
+    The model is built on the meta device and takes the tensors read from the mmapped file
+    directly, so no random init is run and no second copy of the weights is made.
+    With dtype=None the weights keep the dtype stored in the file (see the "dtype" metadata).
+    Otherwise only floating point tensors of a different dtype are cast, e.g. dtype=torch.float32
+    copies the weights of a --fp16 file once and leaves a float32 file mmapped as is.
+    """
+    with safe_open(path, framework="pt", device="cpu") as f:
+        metadata = f.metadata() or {}
+        if metadata.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a melo inference model (see melo.export)")
+        state_dict = {k: f.get_tensor(k) for k in f.keys()}
+    hps = utils.HParams(**json.loads(metadata["config"]))
+    if dtype is not None:
+        state_dict = {
+            k: v.to(dtype) if v.is_floating_point() and v.dtype != dtype else v
+            for k, v in state_dict.items()
+        }
+
+    with torch.device("meta"):
+        model = build_model(hps, inference_only=True)
+        model.remove_weight_norm()
+    model.load_state_dict(state_dict, strict=True, assign=True)
+    model = model.to(device)
+    model.eval()
+    return hps, model
+
+
+class OnnxEncoder(torch.nn.Module):
+    """First ONNX graph: text encoder and the sdp_ratio blend of both duration predictors.
+
+    sdp_noise is the standard normal noise of the stochastic duration predictor [b, 2, t],
+    drawn by the caller. Returns logw [b, 1, t], x_mask [b, 1, t], m_p and logs_p [b, c, t].
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x, x_lengths, tone, language, bert, ja_bert, sid, sdp_noise, noise_scale_w, sdp_ratio):
+        model = self.model
+        g = model.emb_g(sid).unsqueeze(-1)
+        x, m_p, logs_p, x_mask = model.enc_p(
+            x, x_lengths, tone, language, bert, ja_bert, g=None if model.use_vc else g
+        )
+        logw = model.sdp(
+            x, x_mask, g=g, reverse=True, noise_scale=noise_scale_w, noise=sdp_noise
+        ) * sdp_ratio + model.dp(x, x_mask, g=g) * (1 - sdp_ratio)
+        return logw, x_mask, m_p, logs_p
+
+
+class OnnxDecoder(torch.nn.Module):
+    """Second ONNX graph: reverse flow and generator, z_p [b, c, t_y] -> audio [b, 1, t_y * hop]."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, z_p, y_mask, sid):
+        model = self.model
+        g = model.emb_g(sid).unsqueeze(-1)
+        z = model.flow(z_p, y_mask, g=g, reverse=True)
+        return model.dec(z * y_mask, g=g)
+
+
+def export_onnx(hps, model, output_dir, opset_version=17):
+    """Write encoder.onnx, decoder.onnx and config.json for an inference model to output_dir."""
+    os.makedirs(output_dir, exist_ok=True)
+    # export 는 wrapper 의 training 플래그를 하위 모듈 전체에 되돌려 놓으므로 wrapper 도 eval
+    encoder = OnnxEncoder(model).eval()
+    decoder = OnnxDecoder(model).eval()
+    length = 32
+    generator = torch.Generator().manual_seed(0)
+    x = torch.randint(1, len(hps.symbols), (1, length), generator=generator)
+    sid = torch.zeros(1, dtype=torch.long)
+    encoder_inputs = (
+        x,
+        torch.LongTensor([length]),
+        torch.zeros_like(x),
+        torch.zeros_like(x),
+        torch.randn(1, model.enc_p.bert_proj.in_channels, length, generator=generator),
+        torch.randn(1, model.enc_p.ja_bert_proj.in_channels, length, generator=generator),
+        sid,
+        torch.randn(1, 2, length, generator=generator),
+        torch.tensor(0.8),
+        torch.tensor(0.2),
+    )
+    with torch.no_grad():
+        torch.onnx.export(
+            encoder,
+            encoder_inputs,
+            os.path.join(output_dir, "encoder.onnx"),
+            input_names=["x", "x_lengths", "tone", "language", "bert", "ja_bert", "sid", "sdp_noise",
+                         "noise_scale_w", "sdp_ratio"],
+            output_names=["logw", "x_mask", "m_p", "logs_p"],
+            dynamic_axes={
+                "x": {0: "batch", 1: "t_x"},
+                "x_lengths": {0: "batch"},
+                "tone": {0: "batch", 1: "t_x"},
+                "language": {0: "batch", 1: "t_x"},
+                "bert": {0: "batch", 2: "t_x"},
+                "ja_bert": {0: "batch", 2: "t_x"},
+                "sid": {0: "batch"},
+                "sdp_noise": {0: "batch", 2: "t_x"},
+                "logw": {0: "batch", 2: "t_x"},
+                "x_mask": {0: "batch", 2: "t_x"},
+                "m_p": {0: "batch", 2: "t_x"},
+                "logs_p": {0: "batch", 2: "t_x"},
+            },
+            opset_version=opset_version,
+            dynamo=False,
+        )
+        torch.onnx.export(
+            decoder,
+            (torch.randn(1, model.inter_channels, 2 * length, generator=generator),
+             torch.ones(1, 1, 2 * length), sid),
+            os.path.join(output_dir, "decoder.onnx"),
+            input_names=["z_p", "y_mask", "sid"],
+            output_names=["audio"],
+            dynamic_axes={
+                "z_p": {0: "batch", 2: "t_y"},
+                "y_mask": {0: "batch", 2: "t_y"},
+                "sid": {0: "batch"},
+                "audio": {0: "batch", 2: "t_audio"},
+            },
+            opset_version=opset_version,
+            dynamo=False,
+        )
+    with open(os.path.join(output_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump(hps.to_dict(), f, ensure_ascii=False, indent=2)
+    return output_dir
+
+
+@click.command()
+@click.option('--language', '-l', type=str, default="EN", help="Language of the model")
+@click.option('--output_path', '-o', type=str, required=True,
+              help="Path of the .safetensors file to write, or the output directory with --onnx")
+@click.option('--config_path', '-c', type=str, default=None, help="Path to config.json, downloaded if not given")
+@click.option('--ckpt_path', '-m', type=str, default=None, help="Path to checkpoint.pth, downloaded if not given")
+@click.option('--fp16', is_flag=True, default=False, help="Store the weights as float16")
+@click.option('--onnx', is_flag=True, default=False, help="Export encoder.onnx / decoder.onnx for backend='onnxruntime'")
+@click.option('--use_hf/--no_hf', default=True, help="Download from the Hugging Face hub instead of S3")
+def main(language, output_path, config_path, ckpt_path, fp16, onnx, use_hf):
+    if not onnx and not is_inference_model(output_path):
+        raise click.BadParameter("output path must end with .safetensors", param_hint="--output_path")
+    if onnx:
+        try:
+            import onnx as _onnx  # noqa: F401  (torch.onnx.export 가 사용)
+        except ImportError:
+            raise click.UsageError("--onnx needs the onnx package: pip install melotts[onnx]")
+    hps = load_or_download_config(language, use_hf=use_hf, config_path=config_path)
+    checkpoint_dict = load_or_download_model(language, "cpu", use_hf=use_hf, ckpt_path=ckpt_path)
+    if onnx:
+        export_onnx(hps, build_inference_model(hps, checkpoint_dict["model"]), output_path)
+        size_mb = sum(
+            os.path.getsize(os.path.join(output_path, name)) for name in ["encoder.onnx", "decoder.onnx"]
+        ) / 1024 / 1024
+    else:
+        export_inference_model(hps, checkpoint_dict["model"], output_path, half=fp16)
+        size_mb = os.path.getsize(output_path) / 1024 / 1024
+    print(f"Exported {language} inference model to {output_path} ({size_mb:.1f} MB)")
+    if ckpt_path is not None:
+        print(f"  checkpoint: {os.path.getsize(ckpt_path) / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
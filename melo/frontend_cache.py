@@ -0,0 +1,203 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+import torch
+
+from melo.text import lang_bert_model_id_map
+
+logger = logging.getLogger('pdf2mp3')
+
+
+def normalize_key_text(text):
+    """Unicode NFC + collapsed whitespace, so trivially different copies of a sentence share one entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class FrontendCache:
+    """
+    Cache of utils.get_text_for_tts_infer results: phones, tones, lang_ids, word2ph and the BERT feature matrix.
+
+    Entries are keyed by (language, normalized text, BERT model id, symbol-set namespace), so a hit
+    skips both clean_text (g2p) and the BERT forward pass.
+
+    In memory: LRU bounded by `max_bytes` (BERT matrices stored as float16, about 2 KB per phone).
+    On disk (optional, `cache_dir`): one `<sha1>.bert.npy` float16 matrix plus a `<sha1>.json` with
+    the id sequences. The matrix is memory-mapped when it is read back.
+    get() returns fresh float32 tensors, so callers may modify them in place.
+    The in-memory LRU is guarded by a lock, so one cache can be shared between threads.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def namespace(hps, symbol_to_id=None):
+        """Everything besides the text that changes the frontend output of a model."""
+        symbols = sorted(symbol_to_id, key=symbol_to_id.get) if symbol_to_id else list(hps.symbols)
+        h = hashlib.sha1("\x00".join(symbols).encode("utf-8"))
+        h.update(f"add_blank={hps.data.add_blank}".encode())
+        h.update(f"disable_bert={getattr(hps.data, 'disable_bert', False)}".encode())
+        return h.hexdigest()[:16]
+
+    def make_key(self, text, language_str, namespace):
+        model_id = lang_bert_model_id_map.get(language_str, "")
+        return (language_str, normalize_key_text(text), model_id, namespace)
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha1("\x00".join(key).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return (bert, ja_bert, phone, tone, language, word2ph) or None (word2ph None for old disk entries)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            return self._unpack(entry)
+        if self.cache_dir is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self._put(key, entry)
+                with self._lock:
+                    self.disk_hits += 1
+                return self._unpack(entry)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, bert, ja_bert, phone, tone, language, word2ph=None):
+        # 0 으로 채워진 쪽 BERT 행렬은 저장하지 않고 slot 만 기록
+        slot = "bert" if bert.abs().sum() > 0 or ja_bert.abs().sum() == 0 else "ja_bert"
+        feat = bert if slot == "bert" else ja_bert
+        entry = {
+            "slot": slot,
+            "dims": (bert.shape[0], ja_bert.shape[0]),
+            # float16 복사본: 메모리 절반, 호출자의 텐서와 저장 공간을 공유하지 않음
+            "feat": feat.detach().cpu().numpy().astype(np.float16),
+            "phone": phone.numpy().astype(np.int32),
+            "tone": tone.numpy().astype(np.int32),
+            "language": language.numpy().astype(np.int32),
+            "word2ph": None if word2ph is None else list(word2ph),
+        }
+        self._put(key, entry)
+        if self.cache_dir is not None:
+            self._save(key, entry)
+
+    @staticmethod
+    def _nbytes(entry):
+        return sum(entry[name].nbytes for name in ("feat", "phone", "tone", "language"))
+
+    def _put(self, key, entry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= self._nbytes(old)
+            self._entries[key] = entry
+            self._bytes += self._nbytes(entry)
+            # max_bytes 보다 큰 항목 하나는 메모리에 남기지 않음
+            while self._entries and self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._nbytes(evicted)
+
+    @staticmethod
+    def _unpack(entry):
+        n = len(entry["phone"])
+        # astype 은 항상 새 배열: 호출자가 in-place 로 바꿔도 캐시 항목은 그대로
+        feat = torch.from_numpy(entry["feat"].astype(np.float32))
+        bert_dim, ja_bert_dim = entry["dims"]
+        if entry["slot"] == "bert":
+            bert, ja_bert = feat, torch.zeros(ja_bert_dim, n)
+        else:
+            bert, ja_bert = torch.zeros(bert_dim, n), feat
+        return (
+            bert,
+            ja_bert,
+            torch.LongTensor(entry["phone"]),
+            torch.LongTensor(entry["tone"]),
+            torch.LongTensor(entry["language"]),
+            entry.get("word2ph"),
+        )
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, self._digest(key))
+        return base + ".bert.npy", base + ".json"
+
+    def _save(self, key, entry):
+        npy_path, meta_path = self._paths(key)
+        try:
+            np.save(npy_path, entry["feat"])
+            meta = {
+                "key": list(key),
+                "slot": entry["slot"],
+                "dims": list(entry["dims"]),
+                "phone": entry["phone"].tolist(),
+                "tone": entry["tone"].tolist(),
+                "language": entry["language"].tolist(),
+                "word2ph": entry["word2ph"],
+            }
+            # json 을 마지막에 써서, 쓰다 중단된 항목은 _load 에서 무시되도록 함
+            tmp_path = meta_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_path, meta_path)
+        except OSError as e:
+            logger.warning(f"frontend cache 저장 실패: {e}")
+
+    def _load(self, key):
+        npy_path, meta_path = self._paths(key)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if tuple(meta["key"]) != key:
+                return None
+            feat = np.load(npy_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"frontend cache 읽기 실패: {e}")
+            return None
+        return {
+            "slot": meta["slot"],
+            "dims": tuple(meta["dims"]),
+            "feat": feat,
+            "phone": np.asarray(meta["phone"], dtype=np.int32),
+            "tone": np.asarray(meta["tone"], dtype=np.int32),
+            "language": np.asarray(meta["language"], dtype=np.int32),
+            "word2ph": meta.get("word2ph"),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / total if total else 0.0,
+        }
@@ -0,0 +1,155 @@
+"""On-demand TTS model loading with a memory budget.
+
+ModelManager keeps the TTS instances that were asked for, keyed by
+(language, checkpoint, device, precision), and evicts the least recently used ones when the
+parameter memory of the loaded models (plus their BERT encoders) or the process RSS goes over
+budget. BERT encoders are shared between languages using the same checkpoint
+(text.bert_utils), and an encoder is only unloaded once no loaded TTS uses it any more.
+
+    manager = ModelManager(max_memory=2 * 1024 ** 3)
+    tts = manager.get('KR', device='cpu')
+"""
+import os
+import gc
+import logging
+import threading
+from collections import OrderedDict
+
+import psutil
+import torch
+
+from .api import TTS
+from .text import lang_bert_model_id_map
+from .text import bert_utils
+
+logger = logging.getLogger('pdf2mp3')
+
+PRECISIONS = ('fp32', 'int8')
+
+
+def module_nbytes(module):
+    """Bytes held by the parameters and buffers of module (packed int8 weights included)."""
+    if not isinstance(module, torch.nn.Module):
+        return 0
+    total = 0
+    for value in module.state_dict().values():
+        tensors = value if isinstance(value, (tuple, list)) else (value,)
+        for tensor in tensors:
+            if isinstance(tensor, torch.Tensor):
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def process_rss():
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+class ModelManager:
+    """LRU cache of TTS instances under a memory budget.
+
+    max_memory: budget in bytes for the parameters of the loaded TTS models and BERT encoders
+    max_rss: budget in bytes for the RSS of the whole process
+    The model just requested is never evicted, so a single model over budget still loads.
+    """
+
+    def __init__(self, max_memory=None, max_rss=None, use_hf=True):
+        self.max_memory = max_memory
+        self.max_rss = max_rss
+        self.use_hf = use_hf
+        self._models = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(language, device='cpu', ckpt_path=None, precision='fp32'):
+        return (language.upper(), ckpt_path, device, precision)
+
+    def get(self, language, device='cpu', ckpt_path=None, config_path=None, precision='fp32'):
+        if precision not in PRECISIONS:
+            raise ValueError(f"unknown precision: {precision}")
+        key = self.make_key(language, device, ckpt_path, precision)
+        with self._lock:
+            tts = self._models.get(key)
+            if tts is not None:
+                self._models.move_to_end(key)
+            else:
+                logger.info(f"TTS 모델 로딩: {key}")
+                tts = TTS(
+                    language=language,
+                    device=device,
+                    use_hf=self.use_hf,
+                    config_path=config_path,
+                    ckpt_path=ckpt_path,
+                    quantize='int8' if precision == 'int8' else None,
+                )
+                bert_utils.acquire_bert_encoder(lang_bert_model_id_map[tts.language])
+                self._models[key] = tts
+            # BERT 인코더는 첫 합성 때 로딩되므로 캐시 적중 시에도 예산을 다시 확인
+            self._enforce_budget(keep=key)
+            return tts
+
+    def release(self, language, device='cpu', ckpt_path=None, precision='fp32'):
+        """Unload one model. Returns True if it was loaded."""
+        with self._lock:
+            key = self.make_key(language, device, ckpt_path, precision)
+            if key not in self._models:
+                return False
+            self._evict(key)
+            self._collect()
+            return True
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._models):
+                self._evict(key)
+            self._collect()
+
+    def memory_usage(self):
+        """Parameter bytes of the loaded TTS models and the loaded BERT encoders."""
+        with self._lock:
+            total = sum(module_nbytes(tts.model) for tts in self._models.values())
+            total += sum(module_nbytes(model) for model in bert_utils.loaded_bert_encoders().values())
+            return total
+
+    def stats(self):
+        with self._lock:
+            return {
+                'models': list(self._models),
+                'bert_encoders': list(bert_utils.loaded_bert_encoders()),
+                'memory': self.memory_usage(),
+                'rss': process_rss(),
+            }
+
+    def __contains__(self, key):
+        return key in self._models
+
+    def __len__(self):
+        return len(self._models)
+
+    def _over_budget(self):
+        if self.max_memory is not None and self.memory_usage() > self.max_memory:
+            return True
+        return self.max_rss is not None and process_rss() > self.max_rss
+
+    def _enforce_budget(self, keep):
+        evicted = False
+        while self._over_budget():
+            victim = next((key for key in self._models if key != keep), None)
+            if victim is None:
+                break
+            self._evict(victim)
+            # RSS 는 메모리를 실제로 돌려준 뒤에야 줄어듦
+            self._collect()
+            evicted = True
+        if evicted:
+            logger.info(f"TTS 모델 캐시: {len(self._models)}개 유지, 파라미터 {self.memory_usage() / 1024 ** 2:.0f}MB")
+
+    def _evict(self, key):
+        tts = self._models.pop(key)
+        unloaded = bert_utils.release_bert_encoder(lang_bert_model_id_map[tts.language])
+        logger.info(f"TTS 모델 해제: {key}" + (" (BERT 인코더 포함)" if unloaded else ""))
+
+    @staticmethod
+    def _collect():
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
@@ -144,13 +144,22 @@ class TransformerCouplingBlock(nn.Module):
             )
             self.flows.append(modules.Flip())
 
-    def forward(self, x, x_mask, g=None, reverse=False):
+    def project_g(self, g):
+        # one projection per TransformerCouplingLayer, None for Flip
+        return [
+            flow.enc.project_g(g) if isinstance(flow, modules.TransformerCouplingLayer) else None
+            for flow in self.flows
+        ]
+
+    def forward(self, x, x_mask, g=None, reverse=False, g_proj=None):
+        if g_proj is None:
+            g_proj = [None] * len(self.flows)
         if not reverse:
-            for flow in self.flows:
-                x, _ = flow(x, x_mask, g=g, reverse=reverse)
+            for flow, flow_g_proj in zip(self.flows, g_proj):
+                x, _ = flow(x, x_mask, g=g, reverse=reverse, g_proj=flow_g_proj)
         else:
-            for flow in reversed(self.flows):
-                x = flow(x, x_mask, g=g, reverse=reverse)
+            for flow, flow_g_proj in zip(reversed(self.flows), reversed(g_proj)):
+                x = flow(x, x_mask, g=g, reverse=reverse, g_proj=flow_g_proj)
         return x
 
 
@@ -203,12 +212,13 @@ class StochasticDurationPredictor(nn.Module):
         if gin_channels != 0:
             self.cond = nn.Conv1d(gin_channels, filter_channels, 1)
 
-    def forward(self, x, x_mask, w=None, g=None, reverse=False, noise_scale=1.0):
+    def forward(self, x, x_mask, w=None, g=None, reverse=False, noise_scale=1.0, g_proj=None, noise=None):
         x = torch.detach(x)
         x = self.pre(x)
-        if g is not None:
-            g = torch.detach(g)
-            x = x + self.cond(g)
+        if g_proj is None and g is not None:
+            g_proj = self.cond(torch.detach(g))
+        if g_proj is not None:
+            x = x + g_proj
         x = self.convs(x, x_mask)
         x = self.proj(x) * x_mask
 
@@ -254,10 +264,10 @@ class StochasticDurationPredictor(nn.Module):
         else:
             flows = list(reversed(self.flows))
             flows = flows[:-2] + [flows[-1]]  # remove a useless vflow
-            z = (
-                torch.randn(x.size(0), 2, x.size(2)).to(device=x.device, dtype=x.dtype)
-                * noise_scale
-            )
+            if noise is None:
+                # standard normal [b, 2, t]; can be passed in for reproducible / exported graphs
+                noise = torch.randn(x.size(0), 2, x.size(2)).to(device=x.device, dtype=x.dtype)
+            z = noise * noise_scale
             for flow in flows:
                 z = flow(z, x_mask, g=x, reverse=reverse)
             z0, z1 = torch.split(z, [1, 1], 1)
@@ -291,11 +301,12 @@ class DurationPredictor(nn.Module):
         if gin_channels != 0:
             self.cond = nn.Conv1d(gin_channels, in_channels, 1)
 
-    def forward(self, x, x_mask, g=None):
+    def forward(self, x, x_mask, g=None, g_proj=None):
         x = torch.detach(x)
-        if g is not None:
-            g = torch.detach(g)
-            x = x + self.cond(g)
+        if g_proj is None and g is not None:
+            g_proj = self.cond(torch.detach(g))
+        if g_proj is not None:
+            x = x + g_proj
         x = self.conv_1(x * x_mask)
         x = torch.relu(x)
         x = self.norm_1(x)
@@ -357,7 +368,7 @@ class TextEncoder(nn.Module):
         )
         self.proj = nn.Conv1d(hidden_channels, out_channels * 2, 1)
 
-    def forward(self, x, x_lengths, tone, language, bert, ja_bert, g=None):
+    def forward(self, x, x_lengths, tone, language, bert, ja_bert, g=None, g_proj=None):
         bert_emb = self.bert_proj(bert).transpose(1, 2)
         ja_bert_emb = self.ja_bert_proj(ja_bert).transpose(1, 2)
         x = (
@@ -374,7 +385,7 @@ class TextEncoder(nn.Module):
             x.dtype
         )
 
-        x = self.encoder(x * x_mask, x_mask, g=g)
+        x = self.encoder(x * x_mask, x_mask, g=g, g_proj=g_proj)
         stats = self.proj(x) * x_mask
 
         m, logs = torch.split(stats, self.out_channels, dim=1)
@@ -483,6 +494,7 @@ class Generator(torch.nn.Module):
         super(Generator, self).__init__()
         self.num_kernels = len(resblock_kernel_sizes)
         self.num_upsamples = len(upsample_rates)
+        self.upsample_factor = math.prod(upsample_rates)
         self.conv_pre = Conv1d(
             initial_channel, upsample_initial_channel, 7, 1, padding=3
         )
@@ -516,10 +528,12 @@ class Generator(torch.nn.Module):
         if gin_channels != 0:
             self.cond = nn.Conv1d(gin_channels, upsample_initial_channel, 1)
 
-    def forward(self, x, g=None):
+    def forward(self, x, g=None, g_proj=None):
         x = self.conv_pre(x)
-        if g is not None:
-            x = x + self.cond(g)
+        if g_proj is None and g is not None:
+            g_proj = self.cond(g)
+        if g_proj is not None:
+            x = x + g_proj
 
         for i in range(self.num_upsamples):
             x = F.leaky_relu(x, modules.LRELU_SLOPE)
@@ -537,6 +551,25 @@ class Generator(torch.nn.Module):
 
         return x
 
+    def receptive_field(self):
+        """Input frames on each side of a frame that can reach its output samples (upper bound).
+
+        Every layer is a convolution with zero padding, so decoding a window of z padded by
+        this many frames on both sides gives exactly the full-decode samples of its centre.
+        """
+        # 최종 해상도(샘플) 단위로 누적한 뒤 프레임 수로 올림
+        scale = self.upsample_factor
+        samples = (self.conv_pre.kernel_size[0] // 2) * scale
+        for i, up in enumerate(self.ups):
+            samples += -(-up.kernel_size[0] // up.stride[0]) * scale
+            scale //= up.stride[0]
+            samples += scale * max(
+                sum(m.dilation[0] * (m.kernel_size[0] - 1) // 2 for m in resblock.modules() if isinstance(m, nn.Conv1d))
+                for resblock in self.resblocks[i * self.num_kernels:(i + 1) * self.num_kernels]
+            )
+        samples += (self.conv_post.kernel_size[0] // 2) * scale
+        return -(-samples // self.upsample_factor)
+
     def remove_weight_norm(self):
         print("Removing weight norm...")
         for layer in self.ups:
@@ -783,6 +816,7 @@ class SynthesizerTrn(nn.Module):
         num_languages=None,
         num_tones=None,
         norm_refenc=False,
+        inference_only=False,
         **kwargs
     ):
         super().__init__()
@@ -840,15 +874,18 @@ class SynthesizerTrn(nn.Module):
             upsample_kernel_sizes,
             gin_channels=gin_channels,
         )
-        self.enc_q = PosteriorEncoder(
-            spec_channels,
-            inter_channels,
-            hidden_channels,
-            5,
-            1,
-            16,
-            gin_channels=gin_channels,
-        )
+        # enc_q is only used by forward (training) and voice_conversion, not by infer
+        self.inference_only = inference_only
+        if not inference_only:
+            self.enc_q = PosteriorEncoder(
+                spec_channels,
+                inter_channels,
+                hidden_channels,
+                5,
+                1,
+                16,
+                gin_channels=gin_channels,
+            )
         if use_transformer_flow:
             self.flow = TransformerCouplingBlock(
                 inter_channels,
@@ -883,6 +920,8 @@ class SynthesizerTrn(nn.Module):
         else:
             self.ref_enc = ReferenceEncoder(spec_channels, gin_channels, layernorm=norm_refenc)
         self.use_vc = use_vc
+        # (speaker id, device) -> speaker_conditioning, filled by infer_fast
+        self._speaker_conditioning_cache = {}
 
 
     def forward(self, x, x_lengths, y, y_lengths, sid, tone, language, bert, ja_bert):
@@ -979,6 +1018,8 @@ class SynthesizerTrn(nn.Module):
         sdp_ratio=0,
         y=None,
         g=None,
+        sdp_noise=None,
+        dec_chunk_size=None,
     ):
         # x, m_p, logs_p, x_mask = self.enc_p(x, x_lengths, tone, language, bert)
         # g = self.gst(y)
@@ -994,9 +1035,98 @@ class SynthesizerTrn(nn.Module):
         x, m_p, logs_p, x_mask = self.enc_p(
             x, x_lengths, tone, language, bert, ja_bert, g=g_p
         )
-        logw = self.sdp(x, x_mask, g=g, reverse=True, noise_scale=noise_scale_w) * (
+        logw = self.sdp(x, x_mask, g=g, reverse=True, noise_scale=noise_scale_w, noise=sdp_noise) * (
             sdp_ratio
         ) + self.dp(x, x_mask, g=g) * (1 - sdp_ratio)
+        return self._decode_durations(
+            logw, x_mask, m_p, logs_p, g, noise_scale, length_scale, max_len, dec_chunk_size=dec_chunk_size
+        )
+
+    def speaker_conditioning(self, g):
+        """Project the speaker embedding g [b, gin_channels, 1] through every conditioning layer infer uses."""
+        g_p = None if self.use_vc else g
+        return {
+            "g": g,
+            "g_p": g_p,
+            "enc_p": self.enc_p.encoder.project_g(g_p)
+            if g_p is not None and self.enc_gin_channels > 0
+            else None,
+            "sdp": self.sdp.cond(g),
+            "dp": self.dp.cond(g),
+            "flow": self.flow.project_g(g)
+            if isinstance(self.flow, TransformerCouplingBlock)
+            else None,
+            "dec": self.dec.cond(g),
+        }
+
+    def clear_speaker_cache(self):
+        self._speaker_conditioning_cache.clear()
+
+    def load_state_dict(self, *args, **kwargs):
+        self.clear_speaker_cache()
+        return super().load_state_dict(*args, **kwargs)
+
+    @torch.inference_mode()
+    def infer_fast(
+        self,
+        x,
+        x_lengths,
+        sid,
+        tone,
+        language,
+        bert,
+        ja_bert,
+        noise_scale=0.667,
+        length_scale=1,
+        noise_scale_w=0.8,
+        max_len=None,
+        sdp_ratio=0,
+        g=None,
+        sdp_noise=None,
+        dec_chunk_size=None,
+        decode=True,
+    ):
+        """infer for a batch of one speaker, skipping the work that does not reach the output.
+
+        Only the duration predictors with a non-zero weight are run, and the projections of
+        the speaker embedding (encoder, duration predictors, flow and decoder) are computed
+        once per speaker and cached. sid holds the same speaker id for every item; the cached
+        [1, c, 1] projections broadcast over the batch. Call clear_speaker_cache() after
+        changing weights without load_state_dict / remove_weight_norm.
+        With decode=False the Generator is not run and o is None (see iter_decode).
+        """
+        if g is not None:
+            cond = self.speaker_conditioning(g)
+        else:
+            key = (int(sid[0]), x.device)
+            cond = self._speaker_conditioning_cache.get(key)
+            if cond is None:
+                cond = self.speaker_conditioning(self.emb_g(sid[:1]).unsqueeze(-1))
+                self._speaker_conditioning_cache[key] = cond
+        x, m_p, logs_p, x_mask = self.enc_p(
+            x, x_lengths, tone, language, bert, ja_bert, g=cond["g_p"], g_proj=cond["enc_p"]
+        )
+        logw = 0
+        if sdp_ratio > 0:
+            logw = self.sdp(
+                x,
+                x_mask,
+                reverse=True,
+                noise_scale=noise_scale_w,
+                g_proj=cond["sdp"],
+                noise=sdp_noise,
+            ) * sdp_ratio
+        if sdp_ratio < 1:
+            logw = logw + self.dp(x, x_mask, g_proj=cond["dp"]) * (1 - sdp_ratio)
+        return self._decode_durations(
+            logw, x_mask, m_p, logs_p, cond["g"], noise_scale, length_scale, max_len, cond=cond,
+            dec_chunk_size=dec_chunk_size, decode=decode,
+        )
+
+    def _decode_durations(
+        self, logw, x_mask, m_p, logs_p, g, noise_scale, length_scale, max_len, cond=None,
+        dec_chunk_size=None, decode=True,
+    ):
         w = torch.exp(logw) * x_mask * length_scale
         
         w_ceil = torch.ceil(w)
@@ -1015,11 +1145,71 @@ class SynthesizerTrn(nn.Module):
         )  # [b, t', t], [b, t, d] -> [b, d, t']
 
         z_p = m_p + torch.randn_like(m_p) * torch.exp(logs_p) * noise_scale
-        z = self.flow(z_p, y_mask, g=g, reverse=True)
-        o = self.dec((z * y_mask)[:, :, :max_len], g=g)
+        if cond is not None and cond["flow"] is not None:
+            z = self.flow(z_p, y_mask, g=g, reverse=True, g_proj=cond["flow"])
+        else:
+            z = self.flow(z_p, y_mask, g=g, reverse=True)
+        o = None
+        if decode:
+            o = self._decode_items(
+                (z * y_mask)[:, :, :max_len], y_lengths, g=g, g_proj=None if cond is None else cond["dec"],
+                chunk_size=dec_chunk_size,
+            )
         # print('max/min of o:', o.max(), o.min())
         return o, attn, y_mask, (z, z_p, m_p, logs_p)
 
+    def iter_decode(self, z, g=None, g_proj=None, chunk_size=64, context=None):
+        """Run the Generator on z [b, c, t] chunk_size frames at a time, yielding [b, 1, frames * hop] audio.
+
+        Each window is padded with `context` frames of z on both sides (dec.receptive_field() by
+        default) and the padding is cropped after decoding, so the chunks concatenate to dec(z)
+        up to float rounding while only one window of activations is alive at a time.
+        """
+        hop = self.dec.upsample_factor
+        if context is None:
+            context = self.dec.receptive_field()
+        t = z.size(2)
+        for start in range(0, t, chunk_size):
+            end = min(start + chunk_size, t)
+            window_start = max(0, start - context)
+            # yield 중에 grad 모드가 호출자 쪽으로 새지 않도록 청크마다 no_grad
+            with torch.no_grad():
+                o = self.dec(z[:, :, window_start:min(t, end + context)], g=g, g_proj=g_proj)
+                o = o[:, :, (start - window_start) * hop:(end - window_start) * hop]
+            yield o
+
+    def decode(self, z, g=None, g_proj=None, chunk_size=None, context=None):
+        """self.dec(z), or iter_decode chunks concatenated when z is longer than chunk_size frames."""
+        if chunk_size is None or z.size(2) <= chunk_size:
+            return self.dec(z, g=g, g_proj=g_proj)
+        return torch.cat(list(self.iter_decode(z, g=g, g_proj=g_proj, chunk_size=chunk_size, context=context)), 2)
+
+    def _decode_items(self, z, y_lengths, g=None, g_proj=None, chunk_size=None):
+        """decode() for a batch, each item on its own z[i, :, :y_lengths[i]], zero padded to z's length.
+
+        The Generator has no mask between its layers, so when items of different lengths share a
+        batch the padded frames (non-zero after conv_pre / cond bias) leak about one receptive field
+        into the end of the shorter items. Decoding every item alone matches batch-of-one output.
+        """
+        t = z.size(2)
+        lengths = y_lengths.clamp(max=t).tolist()
+        if z.size(0) == 1 or min(lengths) == t:
+            return self.decode(z, g=g, g_proj=g_proj, chunk_size=chunk_size)
+        hop = self.dec.upsample_factor
+        o = z.new_zeros(z.size(0), 1, t * hop)
+        for i, length in enumerate(lengths):
+            o[i:i + 1, :, :length * hop] = self.decode(
+                z[i:i + 1, :, :length],
+                g=g if g is None or g.size(0) == 1 else g[i:i + 1],
+                g_proj=g_proj if g_proj is None or g_proj.size(0) == 1 else g_proj[i:i + 1],
+                chunk_size=chunk_size,
+            )
+        return o
+
+    def remove_weight_norm(self):
+        self.clear_speaker_cache()
+        return commons.fold_weight_norm(self)
+
     def voice_conversion(self, y, y_lengths, sid_src, sid_tgt, tau=1.0):        
         g_src = sid_src
         g_tgt = sid_tgt
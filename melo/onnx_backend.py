@@ -0,0 +1,115 @@
+"""ONNX Runtime backend for the acoustic model (numpy only, no torch).
+
+Runs the two graphs written by `python -m melo.export --onnx` with the same steps as
+SynthesizerTrn.infer: encoder.onnx -> durations / length regulation in numpy -> decoder.onnx.
+"""
+import os
+
+import numpy as np
+import onnxruntime as ort
+
+
+def sequence_mask(length, max_length=None):
+    if max_length is None:
+        max_length = length.max()
+    return np.arange(max_length)[None, :] < length[:, None]
+
+
+def generate_path(duration, mask):
+    """numpy commons.generate_path.
+
+    duration: [b, 1, t_x]
+    mask: [b, 1, t_y, t_x]
+    """
+    b, _, t_y, t_x = mask.shape
+    cum_duration = np.cumsum(duration, -1)
+
+    path = sequence_mask(cum_duration.reshape(b * t_x), t_y).astype(mask.dtype)
+    path = path.reshape(b, t_x, t_y)
+    path[:, 1:] -= path[:, :-1].copy()
+    return path[:, None].transpose(0, 1, 3, 2) * mask
+
+
+def get_providers(device="cpu"):
+    if "cuda" in device and "CUDAExecutionProvider" in ort.get_available_providers():
+        return ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    return ["CPUExecutionProvider"]
+
+
+class OnnxSynthesizer:
+    """SynthesizerTrn.infer on top of encoder.onnx / decoder.onnx.
+
+    Inputs and outputs are numpy arrays with the shapes of SynthesizerTrn.infer. Noise is
+    drawn from `rng` (numpy Generator), so a fixed seed gives a reproducible waveform.
+    """
+
+    def __init__(self, model_dir, device="cpu", seed=None, num_threads=None):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        providers = get_providers(device)
+        self.encoder = ort.InferenceSession(os.path.join(model_dir, "encoder.onnx"), options, providers=providers)
+        self.decoder = ort.InferenceSession(os.path.join(model_dir, "decoder.onnx"), options, providers=providers)
+        self.rng = np.random.default_rng(seed)
+
+    def infer(
+        self,
+        x,
+        x_lengths,
+        sid,
+        tone,
+        language,
+        bert,
+        ja_bert,
+        noise_scale=0.667,
+        length_scale=1,
+        noise_scale_w=0.8,
+        sdp_ratio=0,
+        sdp_noise=None,
+        rng=None,
+    ):
+        rng = self.rng if rng is None else rng
+        if sdp_noise is None:
+            sdp_noise = rng.standard_normal((x.shape[0], 2, x.shape[1]), dtype=np.float32)
+        logw, x_mask, m_p, logs_p = self.encoder.run(None, {
+            "x": x.astype(np.int64),
+            "x_lengths": x_lengths.astype(np.int64),
+            "tone": tone.astype(np.int64),
+            "language": language.astype(np.int64),
+            "bert": bert.astype(np.float32),
+            "ja_bert": ja_bert.astype(np.float32),
+            "sid": sid.astype(np.int64),
+            "sdp_noise": sdp_noise.astype(np.float32),
+            "noise_scale_w": np.array(noise_scale_w, dtype=np.float32),
+            "sdp_ratio": np.array(sdp_ratio, dtype=np.float32),
+        })
+
+        w = np.exp(logw) * x_mask * length_scale
+        w_ceil = np.ceil(w)
+        y_lengths = np.maximum(w_ceil.sum((1, 2)), 1).astype(np.int64)
+        y_mask = sequence_mask(y_lengths)[:, None, :].astype(x_mask.dtype)
+        attn_mask = x_mask[:, :, None, :] * y_mask[:, :, :, None]
+        attn = generate_path(w_ceil, attn_mask)
+
+        m_p = np.matmul(attn[:, 0], m_p.transpose(0, 2, 1)).transpose(0, 2, 1)  # [b, t', t], [b, t, d] -> [b, d, t']
+        logs_p = np.matmul(attn[:, 0], logs_p.transpose(0, 2, 1)).transpose(0, 2, 1)
+
+        z_p = m_p + rng.standard_normal(m_p.shape, dtype=np.float32) * np.exp(logs_p) * noise_scale
+        z_p = z_p.astype(np.float32)
+        sid = sid.astype(np.int64)
+        if len(y_lengths) == 1 or y_lengths.min() == y_lengths.max():
+            o = self.decoder.run(None, {"z_p": z_p, "y_mask": y_mask, "sid": sid})[0]
+        else:
+            # 길이가 다른 문장은 하나씩 디코딩 (SynthesizerTrn._decode_items 와 같은 이유: Generator 패딩 누수)
+            t = z_p.shape[2]
+            o = None
+            for i, length in enumerate(y_lengths.tolist()):
+                o_i = self.decoder.run(None, {
+                    "z_p": z_p[i:i + 1, :, :length], "y_mask": y_mask[i:i + 1, :, :length], "sid": sid[i:i + 1],
+                })[0]
+                if o is None:
+                    hop = o_i.shape[2] // length
+                    o = np.zeros((len(y_lengths), 1, t * hop), dtype=o_i.dtype)
+                o[i, :, :o_i.shape[2]] = o_i[0]
+        return o, attn, y_mask, (None, z_p, m_p, logs_p)
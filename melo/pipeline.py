@@ -0,0 +1,73 @@
+import queue
+import logging
+import threading
+
+import torch
+
+logger = logging.getLogger('pdf2mp3')
+
+_DONE = object()
+
+
+class _Error:
+    def __init__(self, exc):
+        self.exc = exc
+
+
+class Prefetcher:
+    """
+    Run an iterator in a background thread, `depth` items ahead of the consumer.
+
+    Used by TTS to overlap the text frontend (g2p + BERT) of the next sentences with the
+    acoustic model of the current ones. The queue is bounded, so at most `depth` prepared
+    items wait in memory. An exception raised by the iterator is re-raised in the consumer,
+    and closing the consumer early stops the producer thread.
+
+    num_threads sets torch intra-op threads of the producer thread only (OpenMP thread counts
+    are per thread), so the two stages can split the cores.
+    """
+
+    def __init__(self, iterable, depth=2, num_threads=None):
+        self.iterable = iterable
+        self.num_threads = num_threads
+        self._queue = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="melo-frontend", daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        try:
+            for item in self.iterable:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._put(_Error(e))
+            return
+        self._put(_DONE)
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Error):
+                    raise item.exc
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,68 @@
+"""Dynamic int8 quantization of SynthesizerTrn for CPU inference.
+
+quantize_dynamic quantizes nn.Linear, so the pointwise (1x1) Conv1d layers are first rewritten
+as PointwiseConv1d (an nn.Linear over the channel axis) and then quantized together with the
+real Linear layers. Only the text encoder, the flow and the duration predictors are touched:
+the Generator convolutions (kernel 3-16) keep float32 weights.
+
+    tts = TTS(language='KR', device='cpu', quantize='int8')
+"""
+import torch
+from torch import nn
+from torch.ao.quantization import quantize_dynamic
+
+QUANTIZED_MODULES = ["enc_p", "flow", "sdp", "dp"]
+
+
+class PointwiseConv1d(nn.Module):
+    """Conv1d with kernel_size 1 as an nn.Linear over channels: [b, c_in, t] -> [b, c_out, t]."""
+
+    def __init__(self, conv):
+        super().__init__()
+        self.in_channels = conv.in_channels
+        self.out_channels = conv.out_channels
+        self.linear = nn.Linear(conv.in_channels, conv.out_channels, bias=conv.bias is not None)
+        with torch.no_grad():
+            self.linear.weight.copy_(conv.weight.squeeze(-1))
+            if conv.bias is not None:
+                self.linear.bias.copy_(conv.bias)
+
+    def forward(self, x):
+        return self.linear(x.transpose(1, 2)).transpose(1, 2)
+
+
+def is_pointwise_conv(module):
+    return (
+        type(module) is nn.Conv1d
+        and module.kernel_size == (1,)
+        and module.stride == (1,)
+        and module.dilation == (1,)
+        and module.groups == 1
+        and module.padding in ((0,), "valid")
+    )
+
+
+def replace_pointwise_convs(module):
+    """Swap every pointwise Conv1d below module for a PointwiseConv1d, in place. Returns the count."""
+    n_replaced = 0
+    for name, child in module.named_children():
+        if is_pointwise_conv(child):
+            setattr(module, name, PointwiseConv1d(child))
+            n_replaced += 1
+        else:
+            n_replaced += replace_pointwise_convs(child)
+    return n_replaced
+
+
+def quantize_int8(model, modules=QUANTIZED_MODULES):
+    """Dynamic int8 quantization of the Linear / pointwise Conv1d layers of model.<modules>, in place.
+
+    The model must be on the CPU (quantized kernels are CPU only). Returns the model.
+    """
+    for name in modules:
+        submodule = getattr(model, name)
+        replace_pointwise_convs(submodule)
+        quantize_dynamic(submodule, {nn.Linear}, dtype=torch.qint8, inplace=True)
+    if hasattr(model, "clear_speaker_cache"):
+        model.clear_speaker_cache()
+    return model
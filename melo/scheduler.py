@@ -0,0 +1,125 @@
+import bisect
+import logging
+
+logger = logging.getLogger('pdf2mp3')
+
+# 예측 프레임 수 초기값 (음소 하나당 프레임, add_blank 포함)
+DEFAULT_FRAMES_PER_PHONE = 3.0
+
+
+class SentenceBucketScheduler:
+    """
+    Group sentences of similar length into batches for SynthesizerTrn.infer.
+    Inference-side counterpart of data_utils.DistributedBucketSampler.
+
+    Length groups are specified by boundaries on the phone count.
+    Ex) boundaries = [b1, b2, b3] -> a batch only holds sentences with b1 < length(x) <= b2 or b2 < length(x) <= b3.
+    Sentences longer than the last boundary are not dropped, they go to an extra bucket.
+
+    A batch is also bounded by a padded budget:
+        batch_size * max(phones in batch)           <= max_tokens
+        batch_size * max(predicted frames in batch) <= max_frames
+    so that the TextEncoder attention and the Generator convolutions do not spend most of
+    their time on padding.
+    """
+
+    def __init__(
+        self,
+        batch_size=8,
+        boundaries=(0, 32, 64, 96, 128, 192, 256, 384, 512),
+        max_tokens=2048,
+        max_frames=8192,
+        frames_per_phone=DEFAULT_FRAMES_PER_PHONE,
+    ):
+        self.batch_size = batch_size
+        self.boundaries = list(boundaries)
+        self.max_tokens = max_tokens
+        self.max_frames = max_frames
+        self.frames_per_phone = frames_per_phone
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.real_tokens = 0
+        self.padded_tokens = 0
+        self.real_frames = 0
+        self.padded_frames = 0
+        self.num_batches = 0
+
+    def predict_frames(self, n_phones, speed=1.0):
+        # frames_per_phone 은 speed 1.0 기준 (record 에서 정규화)
+        return int(n_phones * self.frames_per_phone / speed) + 1
+
+    def _bucket(self, length):
+        return bisect.bisect_left(self.boundaries, length, lo=1)
+
+    def schedule(self, lengths, speed=1.0):
+        """Split sentence indices into batches.
+
+        lengths: phone count of every sentence (after add_blank).
+        Returns a list of batches, each a list of indices into `lengths`.
+        Callers put the audio back in the original order with those indices.
+        """
+        buckets = {}
+        for i, length in enumerate(lengths):
+            buckets.setdefault(self._bucket(length), []).append(i)
+
+        batches = []
+        for idx_bucket in sorted(buckets):
+            # longest first so the first sentence of a batch fixes its padded size
+            bucket = sorted(buckets[idx_bucket], key=lambda i: lengths[i], reverse=True)
+            batch = []
+            max_len = 0
+            for i in bucket:
+                n = len(batch) + 1
+                new_max_len = max(max_len, lengths[i])
+                if batch and (
+                    n > self.batch_size
+                    or n * new_max_len > self.max_tokens
+                    or n * self.predict_frames(new_max_len, speed) > self.max_frames
+                ):
+                    batches.append(batch)
+                    batch = []
+                    new_max_len = lengths[i]
+                batch.append(i)
+                max_len = new_max_len
+            if batch:
+                batches.append(batch)
+        return batches
+
+    def record(self, lengths, frame_lengths=None, speed=1.0):
+        """Accumulate padding statistics of one executed batch.
+
+        frame_lengths were produced at `speed` (length_scale = 1 / speed); frames_per_phone is
+        learned at speed 1.0 so that predict_frames can apply any speed.
+        """
+        self.num_batches += 1
+        self.real_tokens += sum(lengths)
+        self.padded_tokens += max(lengths) * len(lengths)
+        if frame_lengths is not None:
+            self.real_frames += sum(frame_lengths)
+            self.padded_frames += max(frame_lengths) * len(frame_lengths)
+            # 실제 프레임 수로 다음 배치의 프레임 예측값을 보정
+            self.frames_per_phone = 0.9 * self.frames_per_phone + 0.1 * (
+                sum(frame_lengths) * speed / max(sum(lengths), 1)
+            )
+
+    @property
+    def token_efficiency(self):
+        return self.real_tokens / self.padded_tokens if self.padded_tokens else 1.0
+
+    @property
+    def frame_efficiency(self):
+        return self.real_frames / self.padded_frames if self.padded_frames else 1.0
+
+    def report(self):
+        msg = (
+            f"batches: {self.num_batches}, "
+            f"phone padding efficiency: {self.token_efficiency * 100:.1f}%, "
+            f"frame padding efficiency: {self.frame_efficiency * 100:.1f}%"
+        )
+        logger.info(msg)
+        return {
+            'num_batches': self.num_batches,
+            'token_efficiency': self.token_efficiency,
+            'frame_efficiency': self.frame_efficiency,
+        }
@@ -1,14 +1,29 @@
 import re
 import os
 import glob
+import bisect
 import numpy as np
 import soundfile as sf
 import torchaudio
 import re
 
-def split_sentence(text, min_len=10, language_str='EN'):
+# KR / JP 문장 조각의 기본 예산 (추정 음소 수): 배치 추론에서 길이가 고르고 attention 메모리가 제한되도록
+DEFAULT_MAX_PHONES = 120
+DEFAULT_MIN_PHONES = 10
+
+
+def split_sentence(text, min_len=10, language_str='EN', max_phones=None, max_seconds=None):
+    """Split text into the pieces synthesized one by one.
+
+    KR and JP pieces are packed from whole sentences under a phone budget (split_sentences_budget):
+    max_phones, or max_seconds of speech (phones_for_seconds), DEFAULT_MAX_PHONES by default.
+    """
     if language_str in ['EN', 'FR', 'ES', 'SP']:
         sentences = split_sentences_latin(text, min_len=min_len)
+    elif language_str in ['KR', 'JP']:
+        if max_phones is None:
+            max_phones = phones_for_seconds(max_seconds) if max_seconds else DEFAULT_MAX_PHONES
+        sentences = split_sentences_kr(text, language_str=language_str, max_phones=max_phones)
     else:
         sentences = split_sentences_zh(text, min_len=min_len)
     return sentences
@@ -48,6 +63,131 @@ def split_sentences_zh(text, min_len=10):
     return merge_short_sentences_zh(new_sentences)
 
 
+SENTENCE_END = {
+    # 문장 부호 (+ 닫는 따옴표/괄호) 뒤에 공백이나 텍스트 끝이 올 때, 또는 빈 줄
+    'KR': re.compile(r'[.!?…]+["\'”’)\]」』]*(?=\s|$)|\n\s*\n'),
+    'JP': re.compile(r'[。！？!?.．…]+[」』）)"\'”’]*|\n\s*\n'),
+}
+# 예산을 넘는 문장은 절 경계(쉼표 등), 공백, (일본어) 히라가나 뒤 한자/가타카나 시작 위치 순으로 나눔
+_SPLIT_BOUNDARIES = [
+    re.compile(r'[,，、;；:：]+\s*'),
+    re.compile(r'\s+'),
+    re.compile(r'(?<=[\u3040-\u309F])(?=[\u30A0-\u30FF\u4E00-\u9FFF])'),
+]
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+
+def estimate_phones(text, language_str='KR'):
+    """Phone count of text without running g2p (used to size pieces before the frontend runs).
+
+    Korean syllables count as their jamo (2 or 3), Japanese kana as one mora (2 phones) and
+    kanji as two morae; other non-space characters count as one phone.
+    """
+    n = 0
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            n += 3 if (code - _HANGUL_BASE) % 28 else 2
+        elif 0x3040 <= code <= 0x30FF:
+            n += 2
+        elif 0x4E00 <= code <= 0x9FFF:
+            n += 4
+        elif not ch.isspace():
+            n += 1
+    return n
+
+
+def phones_for_seconds(seconds, sampling_rate=44100, hop_length=512, frames_per_phone=3.0):
+    """Phone budget for about `seconds` of audio (frames_per_phone as in SentenceBucketScheduler)."""
+    return max(1, int(seconds * sampling_rate / hop_length / frames_per_phone))
+
+
+def _split_long_span(text, start, end, max_length, length_fn):
+    """Split text[start:end] at the boundary closest to its middle (_SPLIT_BOUNDARIES order) until every part fits."""
+    if length_fn(text[start:end]) <= max_length or end - start < 2:
+        return [(start, end)]
+    middle = (start + end) / 2
+    cut = None
+    for pattern in _SPLIT_BOUNDARIES:
+        cuts = [m.end() for m in pattern.finditer(text, start, end) if start < m.end() < end]
+        if cuts:
+            cut = min(cuts, key=lambda c: abs(c - middle))
+            break
+    if cut is None:
+        cut = int(middle)
+    return (_split_long_span(text, start, cut, max_length, length_fn)
+            + _split_long_span(text, cut, end, max_length, length_fn))
+
+
+def split_sentences_budget(text, language_str='KR', max_length=DEFAULT_MAX_PHONES, min_length=DEFAULT_MIN_PHONES,
+                           length_fn=None, sentence_end=None):
+    """Pack the sentences of text into pieces of at most max_length, sized as evenly as possible.
+
+    Lengths are estimate_phones(piece, language_str) unless length_fn is given (pdf2mp3 uses
+    len for its per-file chunks). Sentences end at sentence_end (a regex, SENTENCE_END[language_str]
+    by default). A sentence longer than max_length is split at clause boundaries, then spaces.
+    The pieces are whitespace-stripped slices of text, in order.
+    """
+    if length_fn is None:
+        length_fn = lambda t: estimate_phones(t, language_str)
+    if sentence_end is None:
+        sentence_end = SENTENCE_END.get(language_str, SENTENCE_END['KR'])
+    elif isinstance(sentence_end, str):
+        sentence_end = re.compile(sentence_end)
+
+    bounds = [0] + [m.end() for m in sentence_end.finditer(text)] + [len(text)]
+    units = []
+    for start, end in zip(bounds, bounds[1:]):
+        if text[start:end].strip():
+            units.extend(_split_long_span(text, start, end, max_length, length_fn))
+    if not units:
+        return []
+    lengths = [length_fn(text[start:end]) for start, end in units]
+
+    # 조각 수는 ceil(total / max_length) 로 두고, 조각 길이가 total / 조각 수 에 가깝도록
+    # (제곱 오차 합 최소) 문장 경계를 고르는 DP. 한 조각은 max_length 를 넘지 않음
+    total = sum(lengths)
+    target = total / max(1, -(-total // max_length))
+    prefix = [0]
+    for length in lengths:
+        prefix.append(prefix[-1] + length)
+    best = [0.0] + [float('inf')] * len(units)
+    prev = [0] * (len(units) + 1)
+    for i in range(1, len(units) + 1):
+        for j in range(i - 1, -1, -1):
+            size = prefix[i] - prefix[j]
+            if size > max_length and j < i - 1:
+                break
+            cost = best[j] + (size - target) ** 2
+            if cost < best[i]:
+                best[i] = cost
+                prev[i] = j
+    pieces = []
+    i = len(units)
+    while i > 0:
+        j = prev[i]
+        pieces.append((units[j][0], units[i - 1][1], prefix[i] - prefix[j]))
+        i = j
+    pieces.reverse()
+
+    # 너무 짧은 마지막 조각은 앞 조각에 붙임
+    if len(pieces) > 1 and pieces[-1][2] < min_length and pieces[-2][2] + pieces[-1][2] <= max_length:
+        last = pieces.pop()
+        pieces[-1] = (pieces[-1][0], last[1], pieces[-1][2] + last[2])
+    pieces = [text[start:end].strip() for start, end, _ in pieces]
+    return [piece for piece in pieces if piece and not re.match(r'^[\s\.,;:!?。、]*$', piece)]
+
+
+def split_sentences_kr(text, language_str='KR', max_phones=DEFAULT_MAX_PHONES, min_phones=DEFAULT_MIN_PHONES):
+    """split_sentence for KR / JP: the split_sentences_zh punctuation normalization, then split_sentences_budget."""
+    text = re.sub('[。！？；]', '.', text)
+    text = re.sub('[，]', ',', text)
+    # 줄바꿈은 문장 끝 검출 (SENTENCE_END 의 빈 줄) 뒤에 조각 안에서만 공백으로 합침
+    pieces = split_sentences_budget(text, language_str=language_str, max_length=max_phones, min_length=min_phones)
+    return [re.sub(r'\s+', ' ', piece) for piece in pieces]
+
+
 def merge_short_sentences_en(sens):
     """Avoid short sentences by merging them with the following sentence.
 
@@ -102,73 +242,151 @@ def merge_short_sentences_zh(sens):
 
 
 
-def txtsplit(text, desired_length=100, max_length=200):
-    """Split text it into chunks of a desired length trying to keep sentences intact."""
+# positions where txtsplit can act: quotes, sentence punctuation, and the char before a quote
+_TXTSPLIT_EVENT = re.compile(r'["!?\n.,]|.(?=")', re.S)
+_TXTSPLIT_TOKEN = re.compile(r'(\s+)|([,.?!])|[^\s,.?!]+')
+
+
+def _txtsplit_normalize(text):
     text = re.sub(r'\n\n+', '\n', text)
     text = re.sub(r'\s+', ' ', text)
     text = re.sub(r'[""]', '"', text)
     text = re.sub(r'([,.?!])', r'\1 ', text)
     text = re.sub(r'\s+', ' ', text)
-    
-    rv = []
+    return text
+
+
+def _txtsplit_source_map(text):
+    """Piecewise-linear map of _txtsplit_normalize(text) positions back to positions in text.
+
+    Returns (norm_starts, src_starts): normalized position i maps to
+    src_starts[k] + i - norm_starts[k] with k the last segment starting at or before i.
+    """
+    norm_starts = []
+    src_starts = []
+    n = 0
+    after_punct = False
+    for m in _TXTSPLIT_TOKEN.finditer(text):
+        if m.group(1) is not None:
+            # 공백 묶음은 공백 하나, 구두점 뒤라면 구두점이 이미 넣은 공백에 합쳐짐
+            if after_punct:
+                continue
+            norm_starts.append(n)
+            src_starts.append(m.start())
+            n += 1
+        else:
+            norm_starts.append(n)
+            src_starts.append(m.start())
+            n += m.end() - m.start()
+            if m.group(2) is not None:
+                # 구두점 + 추가된 공백 (원문의 다음 위치로 대응)
+                n += 1
+                after_punct = True
+                continue
+        after_punct = False
+    return norm_starts, src_starts
+
+
+def _txtsplit_spans(text, desired_length, max_length):
+    """Chunk boundaries of txtsplit as (start, end) slices of the normalized text."""
+    spans = []
     in_quote = False
-    current = ""
+    start = 0
     split_pos = []
     pos = -1
     end_pos = len(text) - 1
-    def seek(delta):
-        nonlocal pos, in_quote, current
-        is_neg = delta < 0
-        for _ in range(abs(delta)):
-            if is_neg:
-                pos -= 1
-                current = current[:-1]
-            else:
-                pos += 1
-                current += text[pos]
-            if text[pos] == '"':
-                in_quote = not in_quote
-        return text[pos]
-    def peek(delta):
-        p = pos + delta
+
+    def peek(p):
         return text[p] if p < end_pos and p >= 0 else ""
-    def commit():
-        nonlocal rv, current, split_pos
-        rv.append(current)
-        current = ""
-        split_pos = []
+
+    def toggle(a, b):
+        # text[a:b] 안의 따옴표 수만큼 in_quote 반전
+        nonlocal in_quote
+        if text.count('"', a, b) % 2:
+            in_quote = not in_quote
+
     while pos < end_pos:
-        c = seek(1)
-        if len(current) >= max_length:
-            if len(split_pos) > 0 and len(current) > (desired_length / 2):
+        # 다음 이벤트 위치(또는 max_length 에 닿는 위치)까지 건너뜀, 그 사이 문자는 아무 일도 일으키지 않음
+        limit = min(max(start + max_length - 1, pos + 1), end_pos)
+        m = _TXTSPLIT_EVENT.search(text, pos + 1, limit + 1)
+        pos = m.start() if m else limit
+        c = text[pos]
+        if c == '"':
+            in_quote = not in_quote
+
+        if pos + 1 - start >= max_length:
+            if len(split_pos) > 0 and pos + 1 - start > (desired_length / 2):
                 d = pos - split_pos[-1]
-                seek(-d)
+                toggle(pos - d, pos)
+                pos -= d
             else:
-                while c not in '!?.\n ' and pos > 0 and len(current) > desired_length:
-                    c = seek(-1)
-            commit()
-        elif not in_quote and (c in '!?\n' or (c in '.,' and peek(1) in '\n ')):
-            while pos < len(text) - 1 and len(current) < max_length and peek(1) in '!?.':
-                c = seek(1)
+                while c not in '!?.\n ' and pos > 0 and pos + 1 - start > desired_length:
+                    pos -= 1
+                    c = text[pos]
+                    if c == '"':
+                        in_quote = not in_quote
+            spans.append((start, pos + 1))
+            start = pos + 1
+            split_pos = []
+        elif not in_quote and (c in '!?\n' or (c in '.,' and peek(pos + 1) in '\n ')):
+            while pos < len(text) - 1 and pos + 1 - start < max_length and peek(pos + 1) in '!?.':
+                pos += 1
+                c = text[pos]
+                if c == '"':
+                    in_quote = not in_quote
             split_pos.append(pos)
-            if len(current) >= desired_length:
-                commit()
-        elif in_quote and peek(1) == '"' and peek(2) in '\n ':
-            seek(2)
+            if pos + 1 - start >= desired_length:
+                spans.append((start, pos + 1))
+                start = pos + 1
+                split_pos = []
+        elif in_quote and peek(pos + 1) == '"' and peek(pos + 2) in '\n ':
+            toggle(pos + 1, pos + 3)
+            pos += 2
             split_pos.append(pos)
-    rv.append(current)
-    rv = [s.strip() for s in rv]
-    rv = [s for s in rv if len(s) > 0 and not re.match(r'^[\s\.,;:!?]*$', s)]
-    return rv
+    spans.append((start, pos + 1))
+    return spans
+
+
+def txtsplit(text, desired_length=100, max_length=200, return_offsets=False):
+    """Split text it into chunks of a desired length trying to keep sentences intact.
+
+    With return_offsets=True, also returns one (start, end) pair per chunk: the slice of the
+    input text the chunk was taken from (chunks are whitespace-normalized, so text[start:end]
+    can differ from the chunk in spacing).
+    """
+    norm_text = _txtsplit_normalize(text)
+    rv = []
+    spans = []
+    for start, end in _txtsplit_spans(norm_text, desired_length, max_length):
+        s = norm_text[start:end]
+        stripped = s.strip()
+        if len(stripped) == 0 or re.match(r'^[\s\.,;:!?]*$', stripped):
+            continue
+        rv.append(stripped)
+        start += len(s) - len(s.lstrip())
+        spans.append((start, start + len(stripped)))
+    if not return_offsets:
+        return rv
+
+    norm_starts, src_starts = _txtsplit_source_map(text)
+
+    def to_source(i):
+        k = bisect.bisect_right(norm_starts, i) - 1
+        return src_starts[k] + i - norm_starts[k]
+
+    offsets = [(to_source(start), to_source(end - 1) + 1) for start, end in spans]
+    return rv, offsets
 
 
 if __name__ == '__main__':
     zh_text = "好的，我来给你讲一个故事吧。从前有一个小姑娘，她叫做小红。小红非常喜欢在森林里玩耍，她经常会和她的小伙伴们一起去探险。有一天，小红和她的小伙伴们走到了森林深处，突然遇到了一只凶猛的野兽。小红的小伙伴们都吓得不敢动弹，但是小红并没有被吓倒，她勇敢地走向野兽，用她的智慧和勇气成功地制服了野兽，保护了她的小伙伴们。从那以后，小红变得更加勇敢和自信，成为了她小伙伴们心中的英雄。"
     en_text = "I didn’t know what to do. I said please kill her because it would be better than being kidnapped,” Ben, whose surname CNN is not using for security concerns, said on Wednesday. “It’s a nightmare. I said ‘please kill her, don’t take her there.’"
     sp_text = "¡Claro! ¿En qué tema te gustaría que te hable en español? Puedo proporcionarte información o conversar contigo sobre una amplia variedad de temas, desde cultura y comida hasta viajes y tecnología. ¿Tienes alguna preferencia en particular?"
+    kr_text = "최근 텍스트 음성 변환 분야가 급속도로 발전하고 있습니다. 문장을 적당한 길이로 나누면 배치 추론이 빨라지고, 너무 긴 문장은 쉼표에서 나뉩니다. 짧은 문장도 있다. 그리고 마지막 문장입니다."
     fr_text = "Bien sûr ! En quelle matière voudriez-vous que je vous parle en français ? Je peux vous fournir des informations ou discuter avec vous sur une grande variété de sujets, que ce soit la culture, la nourriture, les voyages ou la technologie. Avez-vous une préférence particulière ?"
 
     print(split_sentence(zh_text, language_str='ZH'))
     print(split_sentence(en_text, language_str='EN'))
     print(split_sentence(sp_text, language_str='SP'))
     print(split_sentence(fr_text, language_str='FR'))
+    print(split_sentence(kr_text, language_str='KR'))
@@ -1,3 +1,7 @@
+import sys
+import importlib
+from collections.abc import Mapping
+
 from .symbols import *
 
 
@@ -20,16 +24,60 @@ def cleaned_text_to_sequence(cleaned_text, tones, language, symbol_to_id=None):
     return phones, tones, lang_ids
 
 
+# BERT checkpoint used by each language's get_bert_feature (frontend cache keys depend on it)
+lang_bert_model_id_map = {
+    "ZH": "hfl/chinese-roberta-wwm-ext-large",
+    "EN": "bert-base-uncased",
+    "JP": "tohoku-nlp/bert-base-japanese-v3",
+    "ZH_MIX_EN": "bert-base-multilingual-uncased",
+    "FR": "dbmdz/bert-base-french-europeana-cased",
+    "SP": "dccuchile/bert-base-spanish-wwm-uncased",
+    "ES": "dccuchile/bert-base-spanish-wwm-uncased",
+    "KR": "kykim/bert-kor-base",
+}
+
+
+class LazyModuleMap(Mapping):
+    """language -> module mapping that imports a module the first time it is looked up.
+
+    Language frontends pull in heavy dependencies (jieba, MeCab, g2p_en, gruut, HF tokenizers),
+    so a process serving one language should only import that language's modules.
+    """
+
+    def __init__(self, module_names, package=__name__):
+        self._module_names = dict(module_names)
+        self._package = package
+
+    def __getitem__(self, language):
+        return importlib.import_module(f".{self._module_names[language]}", self._package)
+
+    def __iter__(self):
+        return iter(self._module_names)
+
+    def __len__(self):
+        return len(self._module_names)
+
+    def loaded(self):
+        """Languages whose module is already imported."""
+        return [lang for lang, name in self._module_names.items() if f"{self._package}.{name}" in sys.modules]
+
+
+# text_normalize / g2p
+language_module_map = LazyModuleMap({"ZH": "chinese", "JP": "japanese", "EN": "english", 'ZH_MIX_EN': "chinese_mix",
+                                     'KR': "korean", 'FR': "french", 'SP': "spanish", 'ES': "spanish"})
+
+# get_bert_feature / get_bert_features
+lang_bert_module_map = LazyModuleMap({"ZH": "chinese_bert", "EN": "english_bert", "JP": "japanese_bert",
+                                      'ZH_MIX_EN': "chinese_mix", 'FR': "french_bert", 'SP': "spanish_bert",
+                                      'ES': "spanish_bert", "KR": "korean"})
+
+
 def get_bert(norm_text, word2ph, language, device):
-    from .chinese_bert import get_bert_feature as zh_bert
-    from .english_bert import get_bert_feature as en_bert
-    from .japanese_bert import get_bert_feature as jp_bert
-    from .chinese_mix import get_bert_feature as zh_mix_en_bert
-    from .spanish_bert import get_bert_feature as sp_bert
-    from .french_bert import get_bert_feature as fr_bert
-    from .korean import get_bert_feature as kr_bert
-
-    lang_bert_func_map = {"ZH": zh_bert, "EN": en_bert, "JP": jp_bert, 'ZH_MIX_EN': zh_mix_en_bert, 
-                          'FR': fr_bert, 'SP': sp_bert, 'ES': sp_bert, "KR": kr_bert}
-    bert = lang_bert_func_map[language](norm_text, word2ph, device)
+    bert = lang_bert_module_map[language].get_bert_feature(norm_text, word2ph, device)
     return bert
+
+
+def get_berts(norm_texts, word2phs, language, device):
+    """Batched get_bert: phone-level features of several sentences in padded forward passes."""
+    berts = lang_bert_module_map[language].get_bert_features(norm_texts, word2phs, device)
+    return berts
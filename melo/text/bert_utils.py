@@ -0,0 +1,131 @@
+import sys
+import threading
+
+import torch
+from transformers import AutoConfig, AutoModel
+from transformers.utils import logging as hf_logging
+
+# 모든 언어 모듈이 사용하는 BERT 레이어 (hidden_states[-3])
+BERT_HIDDEN_LAYER = -3
+
+
+def resolve_device(device):
+    if (
+        sys.platform == "darwin"
+        and torch.backends.mps.is_available()
+        and device == "cpu"
+    ):
+        device = "mps"
+    if not device:
+        device = "cuda"
+    return device
+
+
+def load_bert_encoder(model_id, device=None, hidden_layer=BERT_HIDDEN_LAYER):
+    """Load only the encoder layers up to `hidden_layer` of a BERT/RoBERTa checkpoint.
+
+    hidden_states[k] of the full model is the output of its first (num_hidden_layers + 1 + k)
+    layers when k < 0, so an encoder cut to that many layers returns exactly that tensor as
+    last_hidden_state. The remaining layers, the pooler and the masked-LM head are never
+    instantiated and their weights are not kept.
+    """
+    config = AutoConfig.from_pretrained(model_id)
+    config.num_hidden_layers = config.num_hidden_layers + 1 + hidden_layer
+    # 잘라낸 레이어와 LM head 가중치가 "unexpected key" 로 보고되는 것은 의도된 것
+    verbosity = hf_logging.get_verbosity()
+    hf_logging.set_verbosity_error()
+    try:
+        model = AutoModel.from_pretrained(model_id, config=config, add_pooling_layer=False)
+    finally:
+        hf_logging.set_verbosity(verbosity)
+    return model.to(device).eval()
+
+
+# model_id -> encoder, shared by every language module using that checkpoint
+# (KR loads kykim/bert-kor-base through japanese_bert, ES and SP share spanish_bert, ...)
+_encoders = {}
+# model_id -> number of registered users (loaded TTS models), see acquire_bert_encoder
+_refcounts = {}
+_lock = threading.Lock()
+
+
+def get_bert_encoder(model_id, device=None):
+    """Shared load_bert_encoder: one encoder per checkpoint, loaded on first use."""
+    with _lock:
+        model = _encoders.get(model_id)
+        if model is None:
+            model = _encoders[model_id] = load_bert_encoder(model_id, device)
+    return model
+
+
+def acquire_bert_encoder(model_id):
+    """Register one user of model_id. The encoder itself is still loaded lazily by get_bert_encoder."""
+    with _lock:
+        _refcounts[model_id] = _refcounts.get(model_id, 0) + 1
+
+
+def release_bert_encoder(model_id):
+    """Drop one user of model_id and unload its encoder once no user is left. Returns True if unloaded."""
+    with _lock:
+        count = _refcounts.get(model_id, 0) - 1
+        if count > 0:
+            _refcounts[model_id] = count
+            return False
+        _refcounts.pop(model_id, None)
+        return _encoders.pop(model_id, None) is not None
+
+
+def loaded_bert_encoders():
+    return dict(_encoders)
+
+
+def word2ph_to_phone_level(word_feature, word2ph):
+    """[n_tokens, hidden] token features -> [hidden, n_phones], token i repeated word2ph[i] times.
+
+    Tokens past len(word2ph) are ignored, like the original per-token loop.
+    """
+    repeats = torch.as_tensor(word2ph, dtype=torch.long, device=word_feature.device)
+    return torch.repeat_interleave(word_feature[:len(word2ph)], repeats, dim=0).T
+
+
+def word2ph_to_phone_level_batch(word_features, word2phs):
+    """Batched word2ph_to_phone_level with one repeat_interleave for the whole batch.
+
+    word_features: [batch, max_tokens, hidden] (padded), word2phs: one word2ph list per sample.
+    Returns a list of [hidden, n_phones_i] tensors.
+    """
+    n_tokens = [len(word2ph) for word2ph in word2phs]
+    tokens = torch.cat([word_features[i, :n] for i, n in enumerate(n_tokens)], dim=0)
+    repeats = torch.as_tensor([r for word2ph in word2phs for r in word2ph], dtype=torch.long,
+                              device=word_features.device)
+    phone_level_feature = torch.repeat_interleave(tokens, repeats, dim=0)
+    n_phones = [sum(word2ph) for word2ph in word2phs]
+    return [feature.T for feature in torch.split(phone_level_feature, n_phones, dim=0)]
+
+
+def get_bert_features(model, tokenizer, texts, word2phs, device, batch_size=32, check_length=True):
+    """Phone-level BERT features for several sentences with padded forward passes.
+
+    Sentences are sorted by token count and run `batch_size` at a time, so each pass pads
+    to a similar length. `model` comes from load_bert_encoder, so its last_hidden_state is
+    the layer the synthesizer was trained with. Returns one [hidden, n_phones] tensor per
+    text, in the order of `texts`.
+    """
+    encodings = [tokenizer(text) for text in texts]
+    order = sorted(range(len(texts)), key=lambda i: len(encodings[i]["input_ids"]))
+    features = [None] * len(texts)
+
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        with torch.no_grad():
+            inputs = tokenizer.pad([encodings[i] for i in idx], padding=True, return_tensors="pt")
+            for k in inputs:
+                inputs[k] = inputs[k].to(device)
+            res = model(**inputs)["last_hidden_state"].cpu()
+        if check_length:
+            n_tokens = inputs["attention_mask"].sum(-1).tolist()
+            for j, i in enumerate(idx):
+                assert n_tokens[j] == len(word2phs[i]), f"{n_tokens[j]}/{len(word2phs[i])}"
+        for i, feature in zip(idx, word2ph_to_phone_level_batch(res, [word2phs[i] for i in idx])):
+            features[i] = feature
+    return features
@@ -1,6 +1,8 @@
 import torch
 import sys
-from transformers import AutoTokenizer, AutoModelForMaskedLM
+from transformers import AutoTokenizer
+
+from . import bert_utils
 
 
 # model_id = 'hfl/chinese-roberta-wwm-ext-large'
@@ -8,15 +10,11 @@ local_path = "./bert/chinese-roberta-wwm-ext-large"
 
 
 tokenizers = {}
-models = {}
 
 def get_bert_feature(text, word2ph, device=None, model_id='hfl/chinese-roberta-wwm-ext-large'):
-    if model_id not in models:
-        models[model_id] = AutoModelForMaskedLM.from_pretrained(
-            model_id
-        ).to(device)
+    model = bert_utils.get_bert_encoder(model_id, device)
+    if model_id not in tokenizers:
         tokenizers[model_id] = AutoTokenizer.from_pretrained(model_id)
-    model = models[model_id]
     tokenizer = tokenizers[model_id]
 
     if (
@@ -32,18 +30,21 @@ def get_bert_feature(text, word2ph, device=None, model_id='hfl/chinese-roberta-w
         inputs = tokenizer(text, return_tensors="pt")
         for i in inputs:
             inputs[i] = inputs[i].to(device)
-        res = model(**inputs, output_hidden_states=True)
-        res = torch.cat(res["hidden_states"][-3:-2], -1)[0].cpu()
+        res = model(**inputs)["last_hidden_state"][0].cpu()
     # import pdb; pdb.set_trace()
     # assert len(word2ph) == len(text) + 2
-    word2phone = word2ph
-    phone_level_feature = []
-    for i in range(len(word2phone)):
-        repeat_feature = res[i].repeat(word2phone[i], 1)
-        phone_level_feature.append(repeat_feature)
+    return bert_utils.word2ph_to_phone_level(res, word2ph)
 
-    phone_level_feature = torch.cat(phone_level_feature, dim=0)
-    return phone_level_feature.T
+
+def get_bert_features(texts, word2phs, device=None, model_id='hfl/chinese-roberta-wwm-ext-large'):
+    """Batched get_bert_feature: one padded forward pass per group of sentences."""
+    device = bert_utils.resolve_device(device)
+    model = bert_utils.get_bert_encoder(model_id, device)
+    if model_id not in tokenizers:
+        tokenizers[model_id] = AutoTokenizer.from_pretrained(model_id)
+    # get_bert_feature 과 마찬가지로 토큰 수와 word2ph 길이는 검사하지 않음
+    return bert_utils.get_bert_features(model, tokenizers[model_id], texts, word2phs, device,
+                                        check_length=False)
 
 
 if __name__ == "__main__":
@@ -4,19 +4,28 @@ import re
 from g2p_en import G2p
 
 from . import symbols
+from .g2p_cache import memoize_g2p
 
 from .english_utils.abbreviations import expand_abbreviations
 from .english_utils.time_norm import expand_time_english
 from .english_utils.number_norm import normalize_numbers
-from .japanese import distribute_phone
+from .english_utils.compact_lexicon import open_lexicon
 
 from transformers import AutoTokenizer
 
 current_file_path = os.path.dirname(__file__)
 CMU_DICT_PATH = os.path.join(current_file_path, "cmudict.rep")
 CACHE_PATH = os.path.join(current_file_path, "cmudict_cache.pickle")
+# 미리 만들어 둔 lexicon (있으면 사용). 없으면 사용자 캐시 디렉토리에 만듦 (get_lexicon)
+LEXICON_PATH = os.path.join(current_file_path, "cmudict.lex")
 _g2p = G2p()
 
+
+@memoize_g2p("EN")
+def _g2p_word(word):
+    """g2p_en for an out-of-dictionary word (neural model), memoized."""
+    return _g2p(word)
+
 arpa = {
     "AH0",
     "S",
@@ -150,12 +159,27 @@ def get_dict():
             g2p_dict = pickle.load(pickle_file)
     else:
         g2p_dict = read_dict()
-        cache_dict(g2p_dict, CACHE_PATH)
+        try:
+            cache_dict(g2p_dict, CACHE_PATH)
+        except OSError:
+            # 읽기 전용 설치 (site-packages 등): 메모리에 읽은 dict 만 사용
+            pass
 
     return g2p_dict
 
 
-eng_dict = get_dict()
+def get_lexicon():
+    """CMU dict as a CompactLexicon: mmap-ed, shared between processes, same lookups as get_dict().
+
+    Uses a prebuilt cmudict.lex next to cmudict.rep if there is one, otherwise builds it once in
+    the user cache directory (MELO_CACHE_DIR, default ~/.cache/melo). If that is not writable
+    either, the dict is parsed in memory.
+    """
+    lexicon = open_lexicon(CMU_DICT_PATH, prebuilt_path=LEXICON_PATH)
+    return lexicon if lexicon is not None else get_dict()
+
+
+eng_dict = get_lexicon()
 
 
 def refine_ph(phn):
@@ -185,6 +209,15 @@ def text_normalize(text):
     text = expand_abbreviations(text)
     return text
 
+def distribute_phone(n_phone, n_word):
+    phones_per_word = [0] * n_word
+    for task in range(n_phone):
+        min_tasks = min(phones_per_word)
+        min_index = phones_per_word.index(min_tasks)
+        phones_per_word[min_index] += 1
+    return phones_per_word
+
+
 model_id = 'bert-base-uncased'
 tokenizer = AutoTokenizer.from_pretrained(model_id)
 def g2p_old(text):
@@ -233,13 +266,14 @@ def g2p(text, pad_start_end=True, tokenized=None):
         w = "".join(group)
         phone_len = 0
         word_len = len(group)
-        if w.upper() in eng_dict:
-            phns, tns = refine_syllables(eng_dict[w.upper()])
+        syllables = eng_dict.get(w.upper())
+        if syllables is not None:
+            phns, tns = refine_syllables(syllables)
             phones += phns
             tones += tns
             phone_len += len(phns)
         else:
-            phone_list = list(filter(lambda p: p != " ", _g2p(w)))
+            phone_list = list(filter(lambda p: p != " ", _g2p_word(w)))
             for ph in phone_list:
                 if ph in arpa:
                     ph, tn = refine_ph(ph)
@@ -1,13 +1,13 @@
 import torch
-from transformers import AutoTokenizer, AutoModelForMaskedLM
+from transformers import AutoTokenizer
 import sys
 
+from . import bert_utils
+
 model_id = 'bert-base-uncased'
 tokenizer = AutoTokenizer.from_pretrained(model_id)
-model = None
 
 def get_bert_feature(text, word2ph, device=None):
-    global model
     if (
         sys.platform == "darwin"
         and torch.backends.mps.is_available()
@@ -16,24 +16,19 @@ def get_bert_feature(text, word2ph, device=None):
         device = "mps"
     if not device:
         device = "cuda"
-    if model is None:
-        model = AutoModelForMaskedLM.from_pretrained(model_id).to(
-            device
-        )
+    model = bert_utils.get_bert_encoder(model_id, device)
     with torch.no_grad():
         inputs = tokenizer(text, return_tensors="pt")
         for i in inputs:
             inputs[i] = inputs[i].to(device)
-        res = model(**inputs, output_hidden_states=True)
-        res = torch.cat(res["hidden_states"][-3:-2], -1)[0].cpu()
+        res = model(**inputs)["last_hidden_state"][0].cpu()
         
     assert inputs["input_ids"].shape[-1] == len(word2ph)
-    word2phone = word2ph
-    phone_level_feature = []
-    for i in range(len(word2phone)):
-        repeat_feature = res[i].repeat(word2phone[i], 1)
-        phone_level_feature.append(repeat_feature)
+    return bert_utils.word2ph_to_phone_level(res, word2ph)
 
-    phone_level_feature = torch.cat(phone_level_feature, dim=0)
 
-    return phone_level_feature.T
+def get_bert_features(texts, word2phs, device=None):
+    """Batched get_bert_feature: one padded forward pass per group of sentences."""
+    device = bert_utils.resolve_device(device)
+    model = bert_utils.get_bert_encoder(model_id, device)
+    return bert_utils.get_bert_features(model, tokenizer, texts, word2phs, device)
@@ -0,0 +1,180 @@
+import os
+import mmap
+import struct
+
+# File layout (little endian):
+#   header   : magic, version, n_words, n_phones, phone_table_size, keys_size, values_size
+#   phones   : "\n".join(phone symbols), utf-8
+#   index    : n_words x (key_offset, key_len, value_offset, value_len), sorted by key bytes
+#   keys     : concatenated utf-8 keys
+#   values   : one uint8 phone id per phone, SYLLABLE_SEP between syllables
+MAGIC = b"MLEX"
+VERSION = 1
+HEADER = struct.Struct("<4sIIIIII")
+RECORD = struct.Struct("<IIII")
+SYLLABLE_SEP = 0xFF
+
+
+def read_cmudict(path, start_line=49):
+    """cmudict.rep -> {word: [[phone, ...] per syllable]}, same as english.read_dict."""
+    g2p_dict = {}
+    with open(path) as f:
+        for line_index, line in enumerate(f, start=1):
+            if line_index < start_line:
+                continue
+            word_split = line.strip().split("  ")
+            g2p_dict[word_split[0]] = [syllable.split(" ") for syllable in word_split[1].split(" - ")]
+    return g2p_dict
+
+
+def build_lexicon(g2p_dict, path):
+    """Write {word: [[phone, ...], ...]} in the compact format."""
+    phones = sorted({phone for syllables in g2p_dict.values() for syllable in syllables for phone in syllable})
+    assert len(phones) < SYLLABLE_SEP, f"too many phones for uint8 ids: {len(phones)}"
+    phone_to_id = {phone: i for i, phone in enumerate(phones)}
+
+    entries = sorted((word.encode("utf-8"), syllables) for word, syllables in g2p_dict.items())
+    index = bytearray()
+    keys = bytearray()
+    values = bytearray()
+    for key, syllables in entries:
+        value = bytearray()
+        for i, syllable in enumerate(syllables):
+            if i:
+                value.append(SYLLABLE_SEP)
+            value.extend(phone_to_id[phone] for phone in syllable)
+        index += RECORD.pack(len(keys), len(key), len(values), len(value))
+        keys += key
+        values += value
+
+    phone_table = "\n".join(phones).encode("utf-8")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(entries), len(phones), len(phone_table), len(keys), len(values)))
+        f.write(phone_table)
+        f.write(index)
+        f.write(keys)
+        f.write(values)
+    os.replace(tmp_path, path)
+
+
+class CompactLexicon:
+    """Read-only word -> syllables lexicon backed by an mmap of a build_lexicon file.
+
+    Supports the dict operations english.py uses on eng_dict (`in`, `[]`, get, len, iteration).
+    Lookups binary-search the sorted key table, and only the matching phone ids are decoded, so
+    nothing is unpickled at import and every process maps the same pages of the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._n_words, n_phones, phone_table_size, keys_size, values_size = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} compact lexicon")
+        offset = HEADER.size
+        self._phones = self._mm[offset:offset + phone_table_size].decode("utf-8").split("\n")
+        assert len(self._phones) == n_phones
+        index_offset = offset + phone_table_size
+        keys_offset = index_offset + self._n_words * RECORD.size
+        values_offset = keys_offset + keys_size
+        # uint32 view of the index (no copy, native byte order = little endian on supported platforms)
+        # record i is self._index[4 * i: 4 * i + 4]
+        self._index = memoryview(self._mm)[index_offset:keys_offset].cast("I")
+        self._keys = memoryview(self._mm)[keys_offset:values_offset]
+        self._values = memoryview(self._mm)[values_offset:values_offset + values_size]
+
+    def _key(self, i):
+        key_offset = self._index[4 * i]
+        return self._keys[key_offset:key_offset + self._index[4 * i + 1]].tobytes()
+
+    def _find(self, word):
+        key = word.encode("utf-8")
+        lo, hi = 0, self._n_words
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n_words and self._key(lo) == key:
+            return lo
+        return -1
+
+    def _decode(self, i):
+        value_offset = self._index[4 * i + 2]
+        syllables = [[]]
+        for phone_id in self._values[value_offset:value_offset + self._index[4 * i + 3]]:
+            if phone_id == SYLLABLE_SEP:
+                syllables.append([])
+            else:
+                syllables[-1].append(self._phones[phone_id])
+        return syllables
+
+    def __contains__(self, word):
+        return self._find(word) >= 0
+
+    def __getitem__(self, word):
+        i = self._find(word)
+        if i < 0:
+            raise KeyError(word)
+        return self._decode(i)
+
+    def get(self, word, default=None):
+        i = self._find(word)
+        return default if i < 0 else self._decode(i)
+
+    def __len__(self):
+        return self._n_words
+
+    def __iter__(self):
+        for i in range(self._n_words):
+            yield self._key(i).decode("utf-8")
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        for i in range(self._n_words):
+            yield self._key(i).decode("utf-8"), self._decode(i)
+
+
+def _is_fresh(path, source_path):
+    return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source_path)
+
+
+def load_lexicon(path, source_path):
+    """Open the compact lexicon at `path`, (re)building it from cmudict `source_path` when missing or stale."""
+    if not _is_fresh(path, source_path):
+        build_lexicon(read_cmudict(source_path), path)
+    return CompactLexicon(path)
+
+
+def default_cache_dir():
+    """Per-user cache directory: $MELO_CACHE_DIR, else $XDG_CACHE_HOME/melo, else ~/.cache/melo."""
+    if os.environ.get("MELO_CACHE_DIR"):
+        return os.path.expanduser(os.environ["MELO_CACHE_DIR"])
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "melo")
+
+
+def open_lexicon(source_path, prebuilt_path=None, cache_dir=None):
+    """CompactLexicon for cmudict `source_path`, without writing into the package directory.
+
+    A `prebuilt_path` file that is not older than the source (shipped or built ahead of time) is
+    opened as is. Otherwise the lexicon is built once in `cache_dir` (default_cache_dir()) and
+    reused from there. Returns None when neither works (e.g. read-only home); the caller then
+    parses the source in memory.
+    """
+    if prebuilt_path is not None and _is_fresh(prebuilt_path, source_path):
+        try:
+            return CompactLexicon(prebuilt_path)
+        except (OSError, ValueError):
+            pass
+    cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        return load_lexicon(os.path.join(cache_dir, f"{name}.lex"), source_path)
+    except (OSError, ValueError):
+        return None
@@ -1,8 +1,31 @@
 from .cleaner import spanish_cleaners
 from .gruut_wrapper import Gruut
+from ..g2p_cache import memoize_g2p
 
+_phonemizer = None
+
+
+def get_phonemizer():
+    """Gruut phonemizer shared by every es2ipa call (constructing one checks gruut's language list)."""
+    global _phonemizer
+    if _phonemizer is None:
+        _phonemizer = Gruut(language="es-es", keep_puncs=True, keep_stress=True, use_espeak_phonemes=True)
+    return _phonemizer
+
+
+def es2ipa_words(words):
+    """es2ipa of every word, with one gruut pass over the words not memoized yet and per-word fallback."""
+    todo = [w for w in dict.fromkeys(words) if w not in es2ipa]
+    if todo:
+        for w, p in zip(todo, get_phonemizer().phonemize_words(todo)):
+            if p is not None:
+                es2ipa.put(w, p)
+    return [es2ipa(w) for w in words]
+
+
+@memoize_g2p("ES")
 def es2ipa(text):
-    e = Gruut(language="es-es", keep_puncs=True, keep_stress=True, use_espeak_phonemes=True)
+    e = get_phonemizer()
     # text = spanish_cleaners(text)
     phonemes = e.phonemize(text, separator="")
     return phonemes
@@ -2,13 +2,10 @@ import importlib
 from typing import List
 
 import gruut
-from gruut_ipa import IPA # pip install gruut_ipa
 
 from .base import BasePhonemizer
 from .punctuation import Punctuation
-
-# Table for str.translate to fix gruut/TTS phoneme mismatch
-GRUUT_TRANS_TABLE = str.maketrans("g", "ɡ")
+from .. import gruut_words
 
 
 class Gruut(BasePhonemizer):
@@ -86,18 +83,7 @@ class Gruut(BasePhonemizer):
                         ph_list.append([word.text])
                 elif word.phonemes:
                     # Add phonemes for word
-                    word_phonemes = []
-
-                    for word_phoneme in word.phonemes:
-                        if not self.keep_stress:
-                            # Remove primary/secondary stress
-                            word_phoneme = IPA.without_stress(word_phoneme)
-
-                        word_phoneme = word_phoneme.translate(GRUUT_TRANS_TABLE)
-
-                        if word_phoneme:
-                            # Flatten phonemes
-                            word_phonemes.extend(word_phoneme)
+                    word_phonemes = self._word_phonemes(word)
 
                     if word_phonemes:
                         ph_list.append(word_phonemes)
@@ -106,6 +92,13 @@ class Gruut(BasePhonemizer):
         ph = f"{separator} ".join(ph_words)
         return ph
 
+    def _word_phonemes(self, word) -> List[str]:
+        return gruut_words.word_phonemes(word, self.keep_stress)
+
+    def phonemize_words(self, words: List[str], separator: str = "") -> List[str]:
+        """One gruut pass over a sentence's words, None for words left to `phonemize` (gruut_words.phonemize_words)."""
+        return gruut_words.phonemize_words(self, words, separator)
+
     def _phonemize(self, text, separator):
         return self.phonemize_gruut(text, separator, tie=False)
 
@@ -1,5 +1,6 @@
 from .cleaner import french_cleaners
 from .gruut_wrapper import Gruut
+from ..g2p_cache import memoize_g2p
 
 
 def remove_consecutive_t(input_str):
@@ -20,8 +21,30 @@ def remove_consecutive_t(input_str):
 
     return ''.join(result)
 
+_phonemizer = None
+
+
+def get_phonemizer():
+    """Gruut phonemizer shared by every fr2ipa call (constructing one checks gruut's language list)."""
+    global _phonemizer
+    if _phonemizer is None:
+        _phonemizer = Gruut(language="fr-fr", keep_puncs=True, keep_stress=True, use_espeak_phonemes=True)
+    return _phonemizer
+
+
+def fr2ipa_words(words):
+    """fr2ipa of every word, with one gruut pass over the words not memoized yet and per-word fallback."""
+    todo = [w for w in dict.fromkeys(words) if w not in fr2ipa]
+    if todo:
+        for w, p in zip(todo, get_phonemizer().phonemize_words(todo)):
+            if p is not None:
+                fr2ipa.put(w, remove_consecutive_t(p))
+    return [fr2ipa(w) for w in words]
+
+
+@memoize_g2p("FR")
 def fr2ipa(text):
-    e = Gruut(language="fr-fr", keep_puncs=True, keep_stress=True, use_espeak_phonemes=True)
+    e = get_phonemizer()
     # text = french_cleaners(text)
     phonemes = e.phonemize(text, separator="")
     # print(phonemes)
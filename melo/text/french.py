@@ -23,7 +23,9 @@ def text_normalize(text):
 model_id = 'dbmdz/bert-base-french-europeana-cased'
 tokenizer = AutoTokenizer.from_pretrained(model_id)
 
-def g2p(text, pad_start_end=True, tokenized=None):
+def g2p(text, pad_start_end=True, tokenized=None, sentence_level=True):
+    """sentence_level: phonemize all word groups with one gruut pass (fr_to_ipa.fr2ipa_words)
+    instead of one fr2ipa call per group."""
     if tokenized is None:
         tokenized = tokenizer.tokenize(text)
     # import pdb; pdb.set_trace()
@@ -39,14 +41,22 @@ def g2p(text, pad_start_end=True, tokenized=None):
     tones = []
     word2ph = []
     # print(ph_groups)
-    for group in ph_groups:
-        w = "".join(group)
+    group_words = ["".join(group) for group in ph_groups]
+    group_ipa = [None] * len(group_words)
+    if sentence_level:
+        known = [i for i, w in enumerate(group_words) if w != '[UNK]']
+        if known:
+            for i, ipa in zip(known, fr_to_ipa.fr2ipa_words([group_words[i] for i in known])):
+                group_ipa[i] = ipa
+    for group, w, ipa in zip(ph_groups, group_words, group_ipa):
         phone_len = 0
         word_len = len(group)
         if w == '[UNK]':
             phone_list = ['UNK']
         else:
-            phone_list = list(filter(lambda p: p != " ", fr_to_ipa.fr2ipa(w)))
+            if ipa is None:
+                ipa = fr_to_ipa.fr2ipa(w)
+            phone_list = list(filter(lambda p: p != " ", ipa))
         
         for ph in phone_list:
             phones.append(ph)
@@ -0,0 +1,197 @@
+"""Word-level memoization of the slow per-word G2P calls of the language frontends.
+
+korean_text_to_phonemes (g2pkk), english _g2p (g2p_en neural model), fr2ipa / es2ipa (gruut) and
+japanese kata2phoneme only depend on their word (plus whatever the key_fn adds), so a book
+repeating a word thousands of times only needs to phonemize it once.
+
+    from melo.text import g2p_cache
+
+    g2p_cache.configure(store_dir="~/.cache/melo/g2p")   # optional persistent store
+    g2p_cache.prewarm("KR", open("book.txt").read().splitlines())
+    g2p_cache.save_all()
+    print(g2p_cache.stats())
+"""
+import os
+import json
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 100000
+
+# name -> WordPhonemeCache
+_caches = {}
+_store_dir = None
+
+
+def _default_key(word):
+    return word
+
+
+class WordPhonemeCache:
+    """Bounded LRU word -> phonemes memo in front of one G2P function.
+
+    key_fn maps the call arguments to the cache key. It defaults to the word itself and should
+    include everything besides the word that changes the output (mode flags, neighbouring
+    context). Keys and values must be JSON serializable (str / list / tuple) for the
+    persistent store. List values are stored as tuples and returned as fresh lists.
+    Safe to call from several threads (TTS pipeline prefetch, several TTS objects); fn itself
+    runs outside the lock.
+    """
+
+    def __init__(self, name, fn, maxsize=DEFAULT_MAXSIZE, key_fn=None):
+        self.name = name
+        self.fn = fn
+        self.maxsize = maxsize
+        self.key_fn = key_fn or _default_key
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, *args, **kwargs):
+        if not self.maxsize:
+            return self.fn(*args, **kwargs)
+        key = self.key_fn(*args, **kwargs)
+        value = self.get(key)
+        if value is None:
+            value = self.fn(*args, **kwargs)
+            self.put(key, value)
+            return value
+        return list(value) if isinstance(value, tuple) else value
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if not self.maxsize:
+            return
+        if isinstance(value, list):
+            value = tuple(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _path(self, store_dir):
+        return os.path.join(store_dir, f"{self.name}.json")
+
+    def save(self, store_dir):
+        os.makedirs(store_dir, exist_ok=True)
+        path = self._path(store_dir)
+        # 여러 스레드가 동시에 저장해도 서로의 임시 파일을 덮지 않도록 스레드별 이름
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            entries = [[key, value] for key, value in self._entries.items()]
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, store_dir):
+        path = self._path(store_dir)
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        for key, value in entries:
+            # json 은 tuple 을 list 로 저장하므로 되돌림
+            self.put(tuple(key) if isinstance(key, list) else key, value)
+        return len(entries)
+
+
+def memoize_g2p(name, maxsize=DEFAULT_MAXSIZE, key_fn=None):
+    """Decorator registering a WordPhonemeCache under `name` in front of a G2P function."""
+    def decorator(fn):
+        cache = WordPhonemeCache(name, fn, maxsize=maxsize, key_fn=key_fn)
+        cache.__doc__ = fn.__doc__
+        cache.__wrapped__ = fn
+        _caches[name] = cache
+        if _store_dir is not None:
+            cache.load(_store_dir)
+        return cache
+    return decorator
+
+
+def configure(store_dir=None, maxsize=None):
+    """Set the persistent store (loaded now and by frontends imported later) and/or the LRU size."""
+    global _store_dir
+    if maxsize is not None:
+        for cache in _caches.values():
+            cache.maxsize = maxsize
+    if store_dir is not None:
+        _store_dir = os.path.expanduser(store_dir)
+        for cache in _caches.values():
+            cache.load(_store_dir)
+
+
+def get_cache(name):
+    return _caches[name]
+
+
+def save_all(store_dir=None):
+    store_dir = os.path.expanduser(store_dir) if store_dir else _store_dir
+    assert store_dir is not None, "no store_dir given and none configured"
+    for cache in _caches.values():
+        cache.save(store_dir)
+
+
+def clear_all():
+    for cache in _caches.values():
+        cache.clear()
+
+
+def stats():
+    return {name: cache.info() for name, cache in _caches.items()}
+
+
+def prewarm(language, texts):
+    """Fill the caches of `language` by running its frontend over a corpus (one text per item)."""
+    from .cleaner import clean_text
+
+    for text in texts:
+        if text.strip():
+            clean_text(text, language)
+    return stats()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prewarm the persistent word G2P cache from a corpus")
+    parser.add_argument("--language", "-l", required=True)
+    parser.add_argument("--store", "-s", required=True, help="cache directory")
+    parser.add_argument("corpus", help="text file, one sentence or paragraph per line")
+    args = parser.parse_args()
+
+    configure(store_dir=args.store)
+    with open(args.corpus, encoding="utf-8") as f:
+        print(prewarm(args.language, f.read().splitlines()))
+    save_all()
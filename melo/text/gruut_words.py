@@ -0,0 +1,66 @@
+"""Sentence-level gruut phonemization shared by fr_phonemizer and es_phonemizer Gruut wrappers."""
+from typing import List
+
+import gruut
+from gruut_ipa import IPA
+
+GRUUT_TRANS_TABLE = str.maketrans("g", "ɡ")
+
+
+def word_phonemes(word, keep_stress=False) -> List[str]:
+    """Flattened phonemes of a gruut word, without stress unless keep_stress."""
+    phonemes = []
+
+    for word_phoneme in word.phonemes:
+        if not keep_stress:
+            # Remove primary/secondary stress
+            word_phoneme = IPA.without_stress(word_phoneme)
+
+        word_phoneme = word_phoneme.translate(GRUUT_TRANS_TABLE)
+
+        if word_phoneme:
+            # Flatten phonemes
+            phonemes.extend(word_phoneme)
+    return phonemes
+
+
+def phonemize_words(phonemizer, words: List[str], separator: str = "") -> List[str]:
+    """Phonemize a list of words with a single gruut pass over the whole sentence.
+
+    phonemizer is a fr_phonemizer / es_phonemizer Gruut instance. Returns one phoneme string
+    per word, or None for words that gruut does not keep as a word of its own (punctuation,
+    numbers, contractions split differently). Callers fall back to `phonemizer.phonemize` for
+    those. Post-processing such as liaison is disabled so every word gets the pronunciation
+    it would get on its own.
+
+    Examples::
+        ["bonjour", ",", "monde"] -> ["bɔ̃ʒˈuʁ", None, "mˈɔ̃d"]
+    """
+    text = " ".join(words)
+    start_to_index = {}
+    start = 0
+    for i, w in enumerate(words):
+        start_to_index[start] = i
+        start += len(w) + 1
+
+    result = [None] * len(words)
+    cursor = 0
+    sentences = gruut.sentences(
+        text, lang=phonemizer.language, espeak=phonemizer.use_espeak_phonemes, post_process=False
+    )
+    for sentence in sentences:
+        for word in sentence:
+            start = text.find(word.text, cursor)
+            if start < 0:
+                continue
+            cursor = start + len(word.text)
+            i = start_to_index.get(start)
+            if i is None or word.is_break or not word.phonemes or words[i] != word.text:
+                continue
+            if phonemizer._punctuator.puncs_regular_exp.search(word.text):
+                # phonemize() strips/restores punctuation, leave those words to it
+                continue
+            phonemes = word_phonemes(word, phonemizer.keep_stress)
+            if phonemes:
+                result[i] = separator.join(phonemes)
+    return result
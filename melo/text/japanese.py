@@ -6,6 +6,7 @@ import unicodedata
 from transformers import AutoTokenizer
 
 from . import symbols
+from .g2p_cache import memoize_g2p
 punctuation = ["!", "?", "…", ",", ".", "'", "-"]
 
 try:
@@ -330,6 +331,7 @@ def _makerulemap():
 _RULEMAP1, _RULEMAP2 = _makerulemap()
 
 
+@memoize_g2p("JP")
 def kata2phoneme(text: str) -> str:
     """Convert katakana text to phonemes."""
     text = text.strip()
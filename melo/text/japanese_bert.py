@@ -1,14 +1,12 @@
 import torch
-from transformers import AutoTokenizer, AutoModelForMaskedLM
+from transformers import AutoTokenizer
 import sys
 
+from . import bert_utils
+
 
-models = {}
 tokenizers = {}
 def get_bert_feature(text, word2ph, device=None, model_id='tohoku-nlp/bert-base-japanese-v3'):
-    global model
-    global tokenizer
-
     if (
         sys.platform == "darwin"
         and torch.backends.mps.is_available()
@@ -17,16 +15,10 @@ def get_bert_feature(text, word2ph, device=None, model_id='tohoku-nlp/bert-base-
         device = "mps"
     if not device:
         device = "cuda"
-    if model_id not in models:
-        model = AutoModelForMaskedLM.from_pretrained(model_id).to(
-            device
-        )
-        models[model_id] = model
-        tokenizer = AutoTokenizer.from_pretrained(model_id)
-        tokenizers[model_id] = tokenizer
-    else:
-        model = models[model_id]
-        tokenizer = tokenizers[model_id]
+    model = bert_utils.get_bert_encoder(model_id, device)
+    if model_id not in tokenizers:
+        tokenizers[model_id] = AutoTokenizer.from_pretrained(model_id)
+    tokenizer = tokenizers[model_id]
 
 
     with torch.no_grad():
@@ -34,16 +26,16 @@ def get_bert_feature(text, word2ph, device=None, model_id='tohoku-nlp/bert-base-
         tokenized = tokenizer.tokenize(text)
         for i in inputs:
             inputs[i] = inputs[i].to(device)
-        res = model(**inputs, output_hidden_states=True)
-        res = torch.cat(res["hidden_states"][-3:-2], -1)[0].cpu()
+        res = model(**inputs)["last_hidden_state"][0].cpu()
 
     assert inputs["input_ids"].shape[-1] == len(word2ph), f"{inputs['input_ids'].shape[-1]}/{len(word2ph)}"
-    word2phone = word2ph
-    phone_level_feature = []
-    for i in range(len(word2phone)):
-        repeat_feature = res[i].repeat(word2phone[i], 1)
-        phone_level_feature.append(repeat_feature)
+    return bert_utils.word2ph_to_phone_level(res, word2ph)
 
-    phone_level_feature = torch.cat(phone_level_feature, dim=0)
 
-    return phone_level_feature.T
+def get_bert_features(texts, word2phs, device=None, model_id='tohoku-nlp/bert-base-japanese-v3'):
+    """Batched get_bert_feature: one padded forward pass per group of sentences."""
+    device = bert_utils.resolve_device(device)
+    model = bert_utils.get_bert_encoder(model_id, device)
+    if model_id not in tokenizers:
+        tokenizers[model_id] = AutoTokenizer.from_pretrained(model_id)
+    return bert_utils.get_bert_features(model, tokenizers[model_id], texts, word2phs, device)
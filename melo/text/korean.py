@@ -12,6 +12,7 @@ from num2words import num2words
 from melo.text.ko_dictionary import english_dictionary, etc_dictionary
 from anyascii import anyascii
 from jamo import hangul_to_jamo
+from .g2p_cache import memoize_g2p
 
 def normalize(text):
     text = text.strip()
@@ -41,6 +42,8 @@ def normalize_english(text):
 
 
 g2p_kr = None
+# g2p.g2p 는 BERT 단어 그룹을 하나씩 따로 변환하므로 (연음 등) 문맥은 그룹 안에만 있음 -> 그룹 + 출력 형식이 키
+@memoize_g2p("KR", key_fn=lambda text, character="hangeul": (text, character))
 def korean_text_to_phonemes(text, character: str = "hangeul") -> str:
     """
 
@@ -143,6 +146,11 @@ def get_bert_feature(text, word2ph, device='cuda'):
     return japanese_bert.get_bert_feature(text, word2ph, device=device, model_id=model_id)
 
 
+def get_bert_features(texts, word2phs, device='cuda'):
+    from . import japanese_bert
+    return japanese_bert.get_bert_features(texts, word2phs, device=device, model_id=model_id)
+
+
 if __name__ == "__main__":
     # tokenizer = AutoTokenizer.from_pretrained("./bert/bert-base-japanese-v3")
     from text.symbols import symbols
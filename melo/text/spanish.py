@@ -65,7 +65,9 @@ def refine_syllables(syllables):
 model_id = 'dccuchile/bert-base-spanish-wwm-uncased'
 tokenizer = AutoTokenizer.from_pretrained(model_id)
 
-def g2p(text, pad_start_end=True, tokenized=None):
+def g2p(text, pad_start_end=True, tokenized=None, sentence_level=True):
+    """sentence_level: phonemize all word groups with one gruut pass (es_to_ipa.es2ipa_words)
+    instead of one es2ipa call per group."""
     if tokenized is None:
         tokenized = tokenizer.tokenize(text)
     # import pdb; pdb.set_trace()
@@ -81,14 +83,22 @@ def g2p(text, pad_start_end=True, tokenized=None):
     tones = []
     word2ph = []
     # print(ph_groups)
-    for group in ph_groups:
-        w = "".join(group)
+    group_words = ["".join(group) for group in ph_groups]
+    group_ipa = [None] * len(group_words)
+    if sentence_level:
+        known = [i for i, w in enumerate(group_words) if w != '[UNK]']
+        if known:
+            for i, ipa in zip(known, es_to_ipa.es2ipa_words([group_words[i] for i in known])):
+                group_ipa[i] = ipa
+    for group, w, ipa in zip(ph_groups, group_words, group_ipa):
         phone_len = 0
         word_len = len(group)
         if w == '[UNK]':
             phone_list = ['UNK']
         else:
-            phone_list = list(filter(lambda p: p != " ", es_to_ipa.es2ipa(w)))
+            if ipa is None:
+                ipa = es_to_ipa.es2ipa(w)
+            phone_list = list(filter(lambda p: p != " ", ipa))
         
         for ph in phone_list:
             phones.append(ph)
@@ -9,7 +9,7 @@ from scipy.io.wavfile import read
 import torch
 import torchaudio
 import librosa
-from melo.text import cleaned_text_to_sequence, get_bert
+from melo.text import cleaned_text_to_sequence, get_bert, get_berts
 from melo.text.cleaner import clean_text
 from melo import commons
 
@@ -19,7 +19,7 @@ logger = logging.getLogger(__name__)
 
 
 
-def get_text_for_tts_infer(text, language_str, hps, device, symbol_to_id=None):
+def _clean_text_for_tts_infer(text, language_str, hps, symbol_to_id=None):
     norm_text, phone, tone, word2ph = clean_text(text, language_str)
     phone, tone, language = cleaned_text_to_sequence(phone, tone, language_str, symbol_to_id)
 
@@ -30,13 +30,14 @@ def get_text_for_tts_infer(text, language_str, hps, device, symbol_to_id=None):
         for i in range(len(word2ph)):
             word2ph[i] = word2ph[i] * 2
         word2ph[0] += 1
+    return norm_text, phone, tone, language, word2ph
 
+
+def _to_tts_infer_tensors(bert, phone, tone, language, language_str, hps):
     if getattr(hps.data, "disable_bert", False):
         bert = torch.zeros(1024, len(phone))
         ja_bert = torch.zeros(768, len(phone))
     else:
-        bert = get_bert(norm_text, word2ph, language_str, device)
-        del word2ph
         assert bert.shape[-1] == len(phone), phone
 
         if language_str == "ZH":
@@ -57,6 +58,53 @@ def get_text_for_tts_infer(text, language_str, hps, device, symbol_to_id=None):
     language = torch.LongTensor(language)
     return bert, ja_bert, phone, tone, language
 
+
+def get_text_for_tts_infer(text, language_str, hps, device, symbol_to_id=None, cache=None, return_word2ph=False):
+    """-> (bert, ja_bert, phone, tone, language), plus word2ph with return_word2ph=True."""
+    if cache is not None:
+        key = cache.make_key(text, language_str, cache.namespace(hps, symbol_to_id))
+        cached = cache.get(key)
+        if cached is not None:
+            return cached if return_word2ph else cached[:5]
+
+    norm_text, phone, tone, language, word2ph = _clean_text_for_tts_infer(text, language_str, hps, symbol_to_id)
+    bert = None
+    if not getattr(hps.data, "disable_bert", False):
+        bert = get_bert(norm_text, word2ph, language_str, device)
+
+    # word2ph 는 긴 문장을 단어 경계에서 다시 나눌 때 사용 (TTS._split_item)
+    result = _to_tts_infer_tensors(bert, phone, tone, language, language_str, hps) + (word2ph,)
+    if cache is not None:
+        cache.put(key, *result)
+    return result if return_word2ph else result[:5]
+
+
+def get_texts_for_tts_infer(texts, language_str, hps, device, symbol_to_id=None, cache=None, return_word2ph=False):
+    """Batched get_text_for_tts_infer: BERT features of all cache misses in one get_berts call."""
+    results = [None] * len(texts)
+    keys = [None] * len(texts)
+    if cache is not None:
+        namespace = cache.namespace(hps, symbol_to_id)
+        for i, text in enumerate(texts):
+            keys[i] = cache.make_key(text, language_str, namespace)
+            results[i] = cache.get(keys[i])
+
+    todo = [i for i in range(len(texts)) if results[i] is None]
+    if not todo:
+        return results if return_word2ph else [result[:5] for result in results]
+    cleaned = [_clean_text_for_tts_infer(texts[i], language_str, hps, symbol_to_id) for i in todo]
+    if getattr(hps.data, "disable_bert", False):
+        berts = [None] * len(todo)
+    else:
+        berts = get_berts([c[0] for c in cleaned], [c[4] for c in cleaned], language_str, device)
+
+    for i, (norm_text, phone, tone, language, word2ph), bert in zip(todo, cleaned, berts):
+        results[i] = _to_tts_infer_tensors(bert, phone, tone, language, language_str, hps) + (word2ph,)
+        if cache is not None:
+            cache.put(keys[i], *results[i])
+    return results if return_word2ph else [result[:5] for result in results]
+
+
 def load_checkpoint(checkpoint_path, model, optimizer=None, skip_optimizer=False):
     assert os.path.isfile(checkpoint_path)
     checkpoint_dict = torch.load(checkpoint_path, map_location="cpu")
@@ -422,3 +470,6 @@ class HParams:
 
     def __repr__(self):
         return self.__dict__.__repr__()
+
+    def to_dict(self):
+        return {k: v.to_dict() if isinstance(v, HParams) else v for k, v in self.items()}
@@ -1,6 +1,5 @@
 import fitz  # PyMuPDF
 import re, sys, os
-import gc
 import torch
 import logging
 import datetime
@@ -8,9 +7,13 @@ import psutil  # 시스템 리소스 모니터링
 import traceback
 #from gtts import gTTS
 from melo.api import TTS
+from melo.model_manager import ModelManager
+from melo.split_utils import split_sentences_budget
 
-# 전역 TTS 모델 인스턴스 (싱글톤 패턴)
-_tts_model = None
+# 전역 TTS 모델 관리자: (언어, 디바이스) 별로 필요할 때 로딩, 메모리 예산 초과 시 오래된 모델부터 해제
+# MELO_MAX_MEMORY_MB 환경 변수로 파라미터 메모리 예산(MB) 지정
+_max_memory_mb = os.environ.get('MELO_MAX_MEMORY_MB')
+_model_manager = ModelManager(max_memory=int(_max_memory_mb) * 1024 * 1024 if _max_memory_mb else None)
 
 # 로깅 설정
 def setup_logging(log_file='pdf2mp3.log'):
@@ -92,11 +95,11 @@ def force_memory_cleanup():
 
 def get_tts_model(lang='KR', device='cpu'):
     """
-    TTS 모델을 싱글톤 패턴으로 관리
-    한 번만 로딩하고 재사용하여 메모리 절약
+    TTS 모델을 ModelManager 로 관리
+    (언어, 디바이스) 별로 한 번만 로딩하고 재사용하여 메모리 절약
     """
-    global _tts_model
-    if _tts_model is None:
+    key = ModelManager.make_key(lang, device)
+    if key not in _model_manager:
         # 모델 로딩 전 메모리 정리
         logger.info("TTS 모델 로딩 전 메모리 정리")
         force_memory_cleanup()
@@ -105,7 +108,7 @@ def get_tts_model(lang='KR', device='cpu'):
         print("⚠️  메모리가 부족한 경우 시간이 걸릴 수 있습니다...")
         logger.info(f"TTS 모델 로딩 중 (언어: {lang}, 디바이스: {device})")
         log_memory_status("BEFORE_TTS_INIT")
-        _tts_model = TTS(language=lang, device=device)
+        model = _model_manager.get(lang, device=device)
         logger.info("TTS 모델 인스턴스 생성 완료")
         log_memory_status("AFTER_TTS_INIT")
         print("TTS 모델 로딩 완료!")
@@ -115,20 +118,17 @@ def get_tts_model(lang='KR', device='cpu'):
         force_memory_cleanup()
     else:
         logger.debug("기존 TTS 모델 재사용")
-    return _tts_model
+        model = _model_manager.get(lang, device=device)
+    return model
 
 def release_tts_model():
     """
     TTS 모델을 메모리에서 완전히 해제
     """
-    global _tts_model
-    if _tts_model is not None:
+    if len(_model_manager):
         logger.info("TTS 모델 메모리 해제 중")
         log_memory_status("BEFORE_MODEL_DELETE")
-        del _tts_model
-        _tts_model = None
-        gc.collect()
-        torch.cuda.empty_cache()  # GPU 사용 시를 위해
+        _model_manager.clear()
         logger.info("TTS 모델 메모리 해제 완료")
         log_memory_status("AFTER_MODEL_DELETE")
         print("TTS 모델 메모리 해제 완료")
@@ -396,134 +396,20 @@ def text_to_mp3(text, mp3_path, lang):
 def split_text(text, max_length=2000, split_pattern=r'니다\.|습니다\.|었다\.|한다\.|였다\.'):
     """
     긴 텍스트를 지정된 최대 길이 이내에서 문장 끝을 기준으로 분리합니다.
+    melo.split_utils.split_sentences_budget (KR/JP 문장 분할과 같은 엔진) 을 글자 수 기준으로 사용하므로
+    청크 길이가 고르게 나뉘고, max_length 를 넘는 긴 문장은 쉼표, 공백 순으로 나뉩니다.
 
     Args:
         text (str): 분리할 원본 텍스트.
-        max_length (int): 각 청크의 최대 길이.
+        max_length (int): 각 청크의 최대 길이 (글자 수).
         split_pattern (str): 문장 끝을 나타내는 정규 표현식 패턴.
                              '니다.' 또는 '다.' 등 한글 문장의 종결 어미를 포함합니다.
-                             마지막에 '\s'를 추가하여 공백으로도 분리될 수 있도록 합니다.
 
     Returns:
         list: 분리된 텍스트 청크를 담은 리스트.
     """
-    chunks = []
-    current_chunk = []
-    current_length = 0
-
-    # 문장을 분리하되, 분리 기준이 되는 구분자도 함께 유지
-    # re.split은 구분자를 제거하므로, re.finditer를 사용하거나
-    # lookbehind/lookahead assertion을 활용하여 구분자를 포함하도록 처리
-    # 여기서는 간단히 구분자로 분리 후 다시 합치는 방식을 사용
-    
-    # 문장 단위로 우선 분리 (구분자를 포함하여 분리)
-    # 긍정형 후방 탐색을 사용하여 구분자를 포함
-    sentences = re.split(f'({split_pattern})', text)
-
-    # re.split이 빈 문자열을 만들 수 있으므로 필터링
-    sentences = [s for s in sentences if s]
-
-    # 분리된 문장들을 다시 합쳐서 청크 생성
-    for i in range(0, len(sentences), 2): # 문장과 구분자가 번갈아 나오므로 2칸씩 점프
-        sentence_part = sentences[i]
-        delimiter = sentences[i+1] if i+1 < len(sentences) else ''
-        
-        # 현재 문장(구분자 포함)의 길이
-        segment = sentence_part + delimiter
-        segment_length = len(segment)
-
-        # 현재 청크에 추가했을 때 max_length를 초과하는지 확인
-        if current_length + segment_length <= max_length:
-            current_chunk.append(segment)
-            current_length += segment_length
-        else:
-            # max_length를 초과하면 현재까지의 청크를 저장하고 새 청크 시작
-            if current_chunk: # 현재 청크가 비어있지 않으면 저장
-                chunks.append("".join(current_chunk).strip())
-            
-            # 새 청크에 현재 문장 추가
-            current_chunk = [segment]
-            current_length = segment_length
-
-            # 만약 단일 문장 자체가 max_length를 초과하는 경우 (매우 긴 문장)
-            # 이 경우에는 어쩔 수 없이 max_length에서 강제 분리해야 합니다.
-            # 이 시나리오를 처리하는 고급 로직이 필요할 수 있으나,
-            # 여기서는 편의상 그대로 넣어두고, 필요시 `split_long_segment` 함수 등을 추가합니다.
-            if segment_length > max_length:
-                # 단일 문장이 max_length를 초과하면 강제로 분할
-                print(f"경고: {segment_length} 길이의 단일 문장이 최대 길이({max_length})를 초과하여 강제 분할될 수 있습니다.")
-                # 이 부분을 재귀적으로 처리하거나, 단순 잘라내기 로직 추가
-                # 여기서는 일단 그대로 current_chunk에 넣고 다음 반복에서 처리되도록 함
-                # (실제로는 이럴 경우 해당 segment를 max_length로 자르고 나머지를 다음으로 넘기는 로직이 필요)
-                # 간략화를 위해 현재는 단일 긴 문장이 그대로 들어갈 수 있음을 알림.
-                # 실제 배포 시에는 더 견고한 처리가 필요함.
-                # 예를 들어, 이 segment 자체를 max_length 단위로 쪼개는 보조 함수 호출
-
-    # 마지막 남은 청크 저장
-    if current_chunk:
-        chunks.append("".join(current_chunk).strip())
-
-    # 만약 split_pattern에 해당하지 않는, 매우 긴 연속된 텍스트가 있으면
-    # 해당 텍스트는 max_length를 초과하여 청크에 포함될 수 있습니다.
-    # 이를 방지하려면 `split_pattern`에 공백 문자나 다른 최소한의 분리 기준을 추가하거나,
-    # `segment_length > max_length` 케이스에서 강제 분할 로직을 더 강화해야 합니다.
-    # 현재 split_pattern에 '\s'를 추가하여 어느 정도 공백 기준으로도 분리되도록 했습니다.
-
-    # 최종적으로 각 청크가 max_length를 초과하지 않는지 확인하는 방어 코드
-    final_chunks = []
-    for chunk in chunks:
-        while len(chunk) > max_length:
-            # 13000자 근처에서 마지막 "니다."를 찾기
-            # 뒤에서부터 검색하여 가장 적절한 분리점 찾기
-            
-            # max_length 근처의 윈도우에서 '니다.' 찾기
-            search_window_start = max(0, max_length - 500) # 13000자에서 500자 앞부터 검색
-            search_window_end = min(len(chunk), max_length + 50) # 13000자에서 50자 뒤까지 검색 (넉넉하게)
-
-            sub_string = chunk[search_window_start:search_window_end]
-            
-            # 뒤에서부터 문장 종결 패턴 찾기
-            # re.finditer를 역순으로 찾아 가장 마지막에 나오는 패턴 사용
-            best_split_idx = -1
-            found_match_length = 0
-            
-            # 패턴을 역순으로 찾기 위해, 문자열을 뒤집고 패턴도 뒤집어서 검색
-            reversed_sub_string = sub_string[::-1]
-            reversed_split_pattern = split_pattern[::-1] # 패턴도 뒤집기
-
-            # 단순 패턴 뒤집기는 복잡하므로, 여기서는 원래 패턴으로 search_window 내에서 마지막 일치 항목 찾기
-            # 13000자 언저리에서 가장 마지막으로 발견되는 '니다.' 등의 패턴을 찾음
-            matches = list(re.finditer(split_pattern, sub_string))
-            
-            temp_split_point = -1 # sub_string 내에서의 인덱스
-            
-            for m in reversed(matches):
-                # m.end()는 패턴 끝 다음 인덱스
-                # 실제 청크 내의 인덱스는 search_window_start + m.end()
-                actual_end_index_in_chunk = search_window_start + m.end()
-                
-                # 이 분리점이 max_length보다 작거나 같으면서 (너무 길어지지 않게),
-                # 그리고 최소 길이(예: max_length - 1000)보다는 큰 지점
-                # 이 조건은 복잡해질 수 있으니, 간단히 max_length 근처에서 찾도록.
-                
-                if actual_end_index_in_chunk <= max_length + 10: # 13000자 + 10자 이내 허용
-                     temp_split_point = actual_end_index_in_chunk
-                     break # 뒤에서부터 찾았으므로 가장 적합한 마지막 지점
-
-            if temp_split_point != -1:
-                # 찾은 분리점에서 자르기
-                final_chunks.append(chunk[:temp_split_point].strip())
-                chunk = chunk[temp_split_point:].strip()
-            else:
-                # 적절한 '니다.' 패턴을 찾지 못했다면, max_length에서 강제 분할
-                final_chunks.append(chunk[:max_length].strip())
-                chunk = chunk[max_length:].strip()
-        
-        # 남은 최종 청크 추가
-        if chunk:
-            final_chunks.append(chunk.strip())
-
-    return final_chunks
+    return split_sentences_budget(text, language_str='KR', max_length=max_length, min_length=0,
+                                  length_fn=len, sentence_end=split_pattern)
 
 def load_ignore_patterns(ignore_file='ignores.txt'):
     """
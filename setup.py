@@ -27,6 +27,10 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=reqs,
+    extras_require={
+        # backend='onnxruntime' 와 melo.export --onnx
+        'onnx': ['onnx>=1.14.0', 'onnxruntime>=1.16.0'],
+    },
     package_data={
         '': ['*.txt', 'cmudict_*'],
     },
@@ -35,6 +39,7 @@ setup(
             "melotts = melo.main:main",
             "melo = melo.main:main",
             "melo-ui = melo.app:main",
+            "melo-export = melo.export:main",
         ],
     },
 )
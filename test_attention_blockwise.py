@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MultiHeadAttention 블록 단위 추론 경로 테스트
+
+eval 모드의 attention_blockwise (상대 위치 logit 을 블록마다 대각선에만 더하고 attention map 을
+저장하지 않는 경로) 가 학습용 attention() 과 같은 결과를 내는지 비교합니다.
+    1. 여러 길이 (window_size 보다 짧은 길이 포함), 패딩이 있는 배치, 여러 block_size 에서 최대 오차
+    2. heads_share=False (헤드별 상대 위치 임베딩)
+    3. attentions.Encoder 전체 (TextEncoder / TransformerCouplingBlock 구조) 출력과 self.attn 미저장
+    4. SynthesizerTrn.infer_fast 파형 (noise 0)
+
+사용법:
+    pytest test_attention_blockwise.py
+"""
+import sys
+
+import pytest
+import torch
+
+from melo import attentions
+from melo.attentions import MultiHeadAttention, Encoder
+
+ATOL = 1e-5
+LENGTHS = [1, 3, 5, 9, 100, 257, 600]
+BLOCK_SIZES = [1, 7, 64, 256]
+
+
+def make_mask(lengths, t):
+    return (torch.arange(t).unsqueeze(0) < torch.LongTensor(lengths).unsqueeze(1)).float().unsqueeze(1)
+
+
+def reference(fn):
+    """attentions 의 추론 경로를 끄고 fn() 실행 (학습용 전체 행렬 경로)"""
+    use_blockwise = attentions._use_blockwise_attention
+    attentions._use_blockwise_attention = lambda module: False
+    try:
+        return fn()
+    finally:
+        attentions._use_blockwise_attention = use_blockwise
+
+
+@pytest.mark.parametrize('heads_share', [True, False])
+def test_attention_blockwise(heads_share):
+    torch.manual_seed(0)
+    module = MultiHeadAttention(192, 192, 2, window_size=4, heads_share=heads_share).eval()
+    for t in LENGTHS:
+        q, k, v = [torch.randn(2, 192, t) for _ in range(3)]
+        x_mask = make_mask([t, t // 2 + 1], t)
+        expected = module.attention(q, k, v, mask=x_mask.unsqueeze(2) * x_mask.unsqueeze(-1))[0] * x_mask
+        for block_size in BLOCK_SIZES:
+            output = module.attention_blockwise(q, k, v, mask=x_mask.unsqueeze(2), block_size=block_size)
+            error = (output * x_mask - expected).abs().max().item()
+            assert error <= ATOL, f"길이 {t}, block_size {block_size}: 최대 오차 {error:.2e}"
+
+
+def test_encoder():
+    torch.manual_seed(0)
+    encoder = Encoder(192, 768, 2, 6, 3, 0.1, gin_channels=256).eval()
+    x = torch.randn(2, 192, 700)
+    x_mask = make_mask([700, 333], 700)
+    g = torch.randn(2, 256, 1)
+    with torch.no_grad():
+        output = encoder(x, x_mask, g=g)
+        expected = reference(lambda: encoder(x, x_mask, g=g))
+    error = (output - expected).abs().max().item()
+    assert error <= ATOL, f"Encoder 출력 최대 오차 {error:.2e}"
+    with torch.no_grad():
+        encoder(x, x_mask, g=g)
+    assert all(layer.attn is None for layer in encoder.attn_layers), "추론 시 self.attn 이 저장됨"
+
+
+def test_infer_fast(random_model):
+    _, model = random_model
+    generator = torch.Generator().manual_seed(1)
+    x = torch.randint(1, model.n_vocab, (1, 120), generator=generator)
+    inputs = (
+        x, torch.LongTensor([120]), torch.LongTensor([0]), torch.zeros_like(x), torch.zeros_like(x),
+        torch.randn(1, 1024, 120, generator=generator), torch.randn(1, 768, 120, generator=generator),
+    )
+    params = dict(sdp_ratio=0.2, noise_scale=0., noise_scale_w=0.)
+    audio = model.infer_fast(*inputs, **params)[0]
+    expected = reference(lambda: model.infer_fast(*inputs, **params)[0])
+    assert audio.shape == expected.shape
+    error = (audio - expected).abs().max().item()
+    assert error <= ATOL, f"infer_fast 파형 최대 오차 {error:.2e}"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
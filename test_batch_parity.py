@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+배치 합성 (TTS._infer_batch) 과 한 문장씩 합성한 결과 비교
+
+길이가 다른 문장을 한 배치로 합성해도 (짧은 문장 뒤는 0 패딩) 문장마다 한 문장씩 합성한 파형과
+같은지 noise 0 에서 확인합니다. Generator 층 사이에는 마스크가 없어서 배치로 디코딩하면 패딩 프레임이
+짧은 문장 끝 (receptive field 만큼) 으로 새어 들어가던 문제의 회귀 테스트입니다.
+
+사용법:
+    pytest test_batch_parity.py
+"""
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+from testing_utils import make_tts
+
+ATOL = 1e-4
+PARAMS = dict(sdp_ratio=0.2, noise_scale=0., noise_scale_w=0.)
+
+
+def make_items(lengths, seed=0):
+    generator = torch.Generator().manual_seed(seed)
+    items = []
+    for n in lengths:
+        phones = torch.randint(1, 112, (n,), generator=generator)
+        items.append((torch.randn(1024, n, generator=generator), torch.randn(768, n, generator=generator),
+                      phones, torch.zeros(n, dtype=torch.long), torch.zeros(n, dtype=torch.long)))
+    return items
+
+
+@pytest.mark.parametrize('dec_chunk_size', [None, 32])
+def test_batched_matches_single(model, dec_chunk_size):
+    hps, model = model
+    tts = make_tts(hps, model, dec_chunk_size=dec_chunk_size)
+    items = make_items([80, 13, 47, 30])
+    batched = tts._infer_batch(items, 0, **PARAMS)
+    for i, item in enumerate(items):
+        single = tts._infer_batch([item], 0, **PARAMS)[0]
+        assert batched[i].shape == single.shape
+        error = float(np.abs(batched[i] - single).max())
+        assert error <= ATOL, f"문장 {i} (음소 {item[2].size(0)}): 최대 오차 {error:.2e}"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPhonemeCache / FrontendCache 스레드 안전성 테스트
+
+작은 LRU 에 여러 스레드가 동시에 get / put 을 반복해 eviction 이 계속 일어나게 한 뒤
+    1. 예외 (KeyError, OrderedDict 변경 중 순회 등) 가 없는지
+    2. 모든 호출이 올바른 값을 돌려받는지
+    3. hits + misses 가 호출 수와 같은지, 항목 수 / 바이트 수가 상한 이하인지
+확인합니다.
+
+사용법:
+    pytest test_cache_threads.py
+"""
+import sys
+import random
+import tempfile
+import threading
+
+import pytest
+import torch
+
+from melo.frontend_cache import FrontendCache
+from melo.text.g2p_cache import WordPhonemeCache
+
+N_THREADS = 8
+N_CALLS = 20000
+
+
+def run_threads(target):
+    errors = []
+
+    def worker(seed):
+        try:
+            target(random.Random(seed))
+        except Exception as e:  # 스레드 안의 예외를 메인 스레드에서 보고
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(N_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_word_phoneme_cache():
+    cache = WordPhonemeCache("test", lambda word: list(word.upper()), maxsize=16)
+    wrong = []
+
+    def g2p_calls(rng):
+        for _ in range(N_CALLS):
+            word = f"w{rng.randint(0, 40)}"
+            if cache(word) != list(word.upper()):
+                wrong.append(word)
+            if rng.random() < 0.001:
+                cache.save(store_dir)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        errors = run_threads(g2p_calls)
+    info = cache.info()
+    assert not errors, errors[:3]
+    assert not wrong, wrong[:3]
+    assert info["hits"] + info["misses"] == N_THREADS * N_CALLS and info["entries"] <= 16, info
+
+
+def test_frontend_cache():
+    frontend_cache = FrontendCache(max_bytes=2000)
+    wrong = []
+
+    def frontend_calls(rng):
+        for _ in range(N_CALLS // 10):
+            n = rng.randint(1, 20)
+            key = ("KR", str(n), "", "")
+            entry = frontend_cache.get(key)
+            if entry is None:
+                phone = torch.arange(n)
+                frontend_cache.put(key, torch.ones(4, n), torch.zeros(3, n), phone, phone, phone, [n])
+            elif entry[2].tolist() != list(range(n)):
+                wrong.append(key)
+
+    errors = run_threads(frontend_calls)
+    stats = frontend_cache.stats()
+    assert not errors, errors[:3]
+    assert not wrong, wrong[:3]
+    assert stats["hits"] + stats["misses"] == N_THREADS * (N_CALLS // 10) and stats["bytes"] <= 2000, stats
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
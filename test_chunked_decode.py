@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generator 청크 디코딩 테스트
+
+SynthesizerTrn.iter_decode / decode(chunk_size=...) 결과를 전체 디코딩 self.dec(z) 와 샘플 단위로 비교합니다.
+    1. 여러 청크 크기, 배치 2 에서 최대 오차가 ATOL 이하인지 (창 양쪽에 dec.receptive_field() 프레임 패딩)
+    2. 패딩이 receptive field 보다 작으면 이음매에서 오차가 생기는지 (패딩이 실제로 필요한지)
+    3. infer_fast(dec_chunk_size=...) 가 noise 0 에서 infer_fast 와 같은 파형을 내는지
+    4. onnxruntime 백엔드에서 dec_chunk_size / stream_chunk_size 를 주면 ValueError 인지
+
+체크포인트를 주지 않으면 config.json 구조의 랜덤 초기화 모델을 사용합니다.
+
+사용법:
+    pytest test_chunked_decode.py
+    pytest test_chunked_decode.py --ckpt_path melo-kr.safetensors
+"""
+import sys
+import tempfile
+
+import pytest
+import torch
+
+from melo.api import TTS
+from testing_utils import make_tts
+
+ATOL = 1e-5
+CHUNK_SIZES = [1, 16, 37, 64, 256]
+N_FRAMES = 300
+
+
+@pytest.fixture(scope='module')
+def latent(model):
+    _, model = model
+    generator = torch.Generator().manual_seed(1)
+    z = torch.randn(2, model.inter_channels, N_FRAMES, generator=generator)
+    g = model.emb_g(torch.LongTensor([0, 0])).unsqueeze(-1)
+    with torch.no_grad():
+        full = model.dec(z, g=g)
+    return z, g, full
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_chunked_decode(model, latent, chunk_size):
+    _, model = model
+    z, g, full = latent
+    with torch.no_grad():
+        chunked = model.decode(z, g=g, chunk_size=chunk_size)
+    assert chunked.shape == full.shape
+    error = (chunked - full).abs().max().item()
+    assert error <= ATOL, f"최대 오차 {error:.2e}"
+
+
+def test_short_context_has_seam_error(model, latent):
+    """패딩이 receptive field 보다 작으면 이음매에서 오차가 생김 (패딩이 실제로 필요함)"""
+    _, model = model
+    z, g, full = latent
+    with torch.no_grad():
+        short = model.decode(z, g=g, chunk_size=64, context=max(0, model.dec.receptive_field() // 4))
+    assert (short - full).abs().max().item() > ATOL
+
+
+def test_infer_fast_dec_chunk_size(model):
+    _, model = model
+    generator = torch.Generator().manual_seed(1)
+    x = torch.randint(1, model.n_vocab, (1, 80), generator=generator)
+    inputs = (
+        x, torch.LongTensor([80]), torch.LongTensor([0]), torch.zeros_like(x), torch.zeros_like(x),
+        torch.randn(1, 1024, 80, generator=generator), torch.randn(1, 768, 80, generator=generator),
+    )
+    params = dict(sdp_ratio=0.2, noise_scale=0., noise_scale_w=0.)
+    o_full = model.infer_fast(*inputs, **params)[0]
+    o_chunked = model.infer_fast(*inputs, dec_chunk_size=32, **params)[0]
+    assert o_full.shape == o_chunked.shape
+    error = (o_full - o_chunked).abs().max().item()
+    assert error <= ATOL, f"최대 오차 {error:.2e}"
+
+
+def test_onnxruntime_rejects_chunking():
+    with tempfile.TemporaryDirectory() as onnx_dir:
+        with pytest.raises(ValueError):
+            TTS('KR', device='cpu', backend='onnxruntime', ckpt_path=onnx_dir, dec_chunk_size=32)
+    # 모델 로드 없이 backend 만 onnxruntime 인 TTS
+    tts = make_tts(backend='onnxruntime')
+    with pytest.raises(ValueError):
+        next(tts.tts_iter("문장.", 0, stream_chunk_size=16))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
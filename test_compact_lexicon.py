@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CompactLexicon 위치 테스트 (english.get_lexicon 이 쓰는 compact_lexicon.open_lexicon)
+
+    1. 미리 만든 lexicon 이 없으면 사용자 캐시 디렉토리에 만들고, cmudict 옆 (패키지 디렉토리) 에는 쓰지 않는지
+    2. 미리 만든 lexicon 이 원본보다 새것이면 그대로 여는지, 오래됐으면 캐시 쪽을 쓰는지
+    3. 캐시 디렉토리에도 쓸 수 없으면 None (호출자가 메모리에서 파싱) 인지
+    4. 조회 결과가 read_cmudict 와 같은지, MELO_CACHE_DIR / XDG_CACHE_HOME 이 반영되는지
+
+사용법:
+    pytest test_compact_lexicon.py
+"""
+import os
+import sys
+
+import pytest
+
+from melo.text.english_utils.compact_lexicon import build_lexicon, default_cache_dir, open_lexicon, read_cmudict
+
+ENTRIES = [
+    "HELLO  HH AH0 - L OW1",
+    "WORLD  W ER1 L D",
+    "TEST  T EH1 S T",
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    src_dir = tmp_path / "package"
+    src_dir.mkdir()
+    path = src_dir / "cmudict.rep"
+    # read_cmudict 는 49 번째 줄부터 읽음
+    path.write_text("".join(f";;; header {i}\n" for i in range(48)) + "\n".join(ENTRIES) + "\n")
+    return str(path)
+
+
+def test_builds_in_cache_dir(source, tmp_path):
+    src_dir = os.path.dirname(source)
+    cache_dir = str(tmp_path / "cache")
+    lexicon = open_lexicon(source, prebuilt_path=os.path.join(src_dir, "cmudict.lex"), cache_dir=cache_dir)
+    assert lexicon.path == os.path.join(cache_dir, "cmudict.lex")
+    assert os.listdir(src_dir) == ["cmudict.rep"]
+    assert dict(lexicon.items()) == read_cmudict(source)
+    assert lexicon["HELLO"] == [["HH", "AH0"], ["L", "OW1"]] and "NOPE" not in lexicon
+
+
+def test_prebuilt(source, tmp_path):
+    prebuilt = os.path.join(os.path.dirname(source), "cmudict.lex")
+    build_lexicon(read_cmudict(source), prebuilt)
+    cache_dir = str(tmp_path / "cache")
+    assert open_lexicon(source, prebuilt_path=prebuilt, cache_dir=cache_dir).path == prebuilt
+    assert not os.path.exists(cache_dir)
+    # 원본이 더 새것이면 미리 만든 파일은 무시
+    os.utime(prebuilt, (0, 0))
+    assert open_lexicon(source, prebuilt_path=prebuilt, cache_dir=cache_dir).path.startswith(cache_dir)
+
+
+def test_unwritable_cache_dir(source, tmp_path):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    assert open_lexicon(source, cache_dir=str(not_a_dir / "melo")) is None
+
+
+def test_default_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("MELO_CACHE_DIR", str(tmp_path / "melo-cache"))
+    assert default_cache_dir() == str(tmp_path / "melo-cache")
+    monkeypatch.delenv("MELO_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == str(tmp_path / "melo")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FrontendCache 테스트
+
+    1. BERT 행렬을 float16 으로 저장하고 get 은 float32 로 돌려주는지
+    2. put 한 텐서나 get 으로 받은 텐서를 in-place 로 바꿔도 캐시 항목이 그대로인지
+    3. 메모리 LRU 가 max_bytes 를 넘지 않고 오래된 항목부터 버리는지
+    4. cache_dir 에 저장한 항목을 새 캐시에서 다시 읽는지
+
+사용법:
+    pytest test_frontend_cache.py
+"""
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+from melo.frontend_cache import FrontendCache
+
+
+def make_entry(n, seed=0):
+    generator = torch.Generator().manual_seed(seed)
+    phone = torch.arange(n)
+    return torch.randn(1024, n, generator=generator), torch.zeros(768, n), phone, phone, phone, [n]
+
+
+def key(i):
+    return ("KR", f"문장 {i}.", "", "")
+
+
+def test_float16_storage():
+    cache = FrontendCache()
+    bert = make_entry(50)[0]
+    cache.put(key(0), *make_entry(50))
+    assert cache._entries[key(0)]["feat"].dtype == np.float16
+    cached = cache.get(key(0))
+    assert cached[0].dtype == torch.float32 and cached[1].shape == (768, 50)
+    assert (cached[0] - bert).abs().max().item() < 1e-2
+
+
+def test_returned_tensors_are_copies():
+    cache = FrontendCache()
+    entry = make_entry(50)
+    expected = entry[0].clone()
+    cache.put(key(0), *entry)
+    entry[0].zero_()
+    cached = cache.get(key(0))
+    cached[0].mul_(0)
+    cached[2].zero_()
+    again = cache.get(key(0))
+    assert (again[0] - expected).abs().max().item() < 1e-2
+    assert again[2].tolist() == list(range(50))
+
+
+def test_max_bytes():
+    entry_bytes = 1024 * 100 * 2 + 3 * 100 * 4
+    cache = FrontendCache(max_bytes=5 * entry_bytes)
+    for i in range(20):
+        cache.put(key(i), *make_entry(100, seed=i))
+        assert cache.stats()["bytes"] <= cache.max_bytes
+    assert len(cache) == 5 and cache.stats()["bytes"] == 5 * entry_bytes
+    assert cache.get(key(0)) is None and cache.get(key(19)) is not None
+    # max_bytes 보다 큰 항목은 메모리에 남지 않음
+    cache.put(key(99), *make_entry(1000))
+    assert cache.get(key(99)) is None and cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_disk_tier(tmp_path):
+    FrontendCache(cache_dir=str(tmp_path)).put(key(0), *make_entry(30))
+    cache = FrontendCache(cache_dir=str(tmp_path))
+    cached = cache.get(key(0))
+    assert cached is not None and cache.disk_hits == 1
+    assert (cached[0] - make_entry(30)[0]).abs().max().item() < 1e-2
+    cached[0].zero_()
+    assert cache.get(key(0))[0].abs().sum() > 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ONNX Runtime 백엔드 parity 테스트
+
+SynthesizerTrn 을 encoder.onnx / decoder.onnx 로 export 한 뒤, 고정 시드의 numpy 노이즈로
+OnnxSynthesizer 와 PyTorch (infer_fast) 출력을 비교합니다.
+    1. 같은 sdp 노이즈에서 duration (y 길이) 과 확장된 m_p 가 일치하는지
+    2. OnnxSynthesizer 가 뽑은 z_p 노이즈를 PyTorch flow + generator 에 넣었을 때 파형이 일치하는지
+    3. 같은 시드로 두 번 실행하면 같은 파형이 나오는지, 배치 결과가 한 문장씩 합성한 결과와 같은지
+    4. onnxruntime 이 없을 때 TTS(backend='onnxruntime') 가 설치 안내가 담긴 ImportError 를 내는지
+onnx / onnxruntime 이 설치되어 있지 않으면 (pip install melotts[onnx]) 모든 테스트를 skip 합니다.
+추론 시간 비교는 bench_onnx.py 에 있습니다.
+
+체크포인트를 주지 않으면 config.json 구조의 랜덤 초기화 모델을 사용합니다.
+
+사용법:
+    pytest test_onnx_parity.py
+    pytest test_onnx_parity.py --ckpt_path melo-kr.safetensors
+"""
+import sys
+import subprocess
+import warnings
+
+import numpy as np
+import pytest
+import torch
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from melo.export import export_onnx
+from melo.onnx_backend import OnnxSynthesizer
+
+warnings.filterwarnings('ignore')
+
+ATOL = 1e-3
+SEED = 1234
+PARAMS = dict(sdp_ratio=0.2, noise_scale=0.667, noise_scale_w=0.8, length_scale=1.0)
+
+
+def make_inputs(model, lengths, seed):
+    rng = np.random.default_rng(seed)
+    b, t = len(lengths), max(lengths)
+    x = rng.integers(1, model.n_vocab, (b, t))
+    mask = np.arange(t)[None, :] < np.array(lengths)[:, None]
+    return (
+        x * mask,
+        np.array(lengths),
+        np.zeros(b, dtype=np.int64),
+        np.zeros((b, t), dtype=np.int64),
+        np.zeros((b, t), dtype=np.int64),
+        (rng.standard_normal((b, 1024, t)) * mask[:, None]).astype(np.float32),
+        (rng.standard_normal((b, 768, t)) * mask[:, None]).astype(np.float32),
+    )
+
+
+def torch_infer(model, inputs, **kwargs):
+    x, x_lengths, sid, tone, language, bert, ja_bert = [torch.from_numpy(np.asarray(a)) for a in inputs]
+    if 'sdp_noise' in kwargs:
+        kwargs['sdp_noise'] = torch.from_numpy(kwargs['sdp_noise'])
+    return model.infer_fast(x, x_lengths, sid, tone, language, bert, ja_bert, **kwargs)
+
+
+@pytest.fixture(scope='module')
+def onnx_dir(model, tmp_path_factory):
+    hps, model = model
+    path = str(tmp_path_factory.mktemp('onnx'))
+    export_onnx(hps, model, path)
+    return path
+
+
+@pytest.fixture(scope='module')
+def onnx_model(onnx_dir):
+    return OnnxSynthesizer(onnx_dir)
+
+
+@pytest.mark.parametrize('lengths', [[7], [40], [64, 23]])
+def test_parity(model, onnx_model, lengths):
+    _, model = model
+    inputs = make_inputs(model, lengths, seed=len(lengths) * 100 + lengths[0])
+    rng = np.random.default_rng(SEED)
+    sdp_noise = rng.standard_normal((len(lengths), 2, max(lengths)), dtype=np.float32)
+
+    o, _, y_mask, (_, z_p, m_p, _) = onnx_model.infer(*inputs, sdp_noise=sdp_noise, rng=rng, **PARAMS)
+    # PyTorch: 같은 sdp 노이즈, noise_scale=0 이면 z_p == 확장된 m_p
+    _, _, y_mask_ref, (_, _, m_p_ref, _) = torch_infer(
+        model, inputs, sdp_noise=sdp_noise, **dict(PARAMS, noise_scale=0.))
+    assert np.array_equal(y_mask.sum((1, 2)), y_mask_ref.sum((1, 2)).numpy())
+    error = float(np.abs(m_p - m_p_ref.numpy()).max())
+    assert error <= ATOL, f"m_p 최대 오차 {error:.2e}"
+
+    # 같은 z_p 노이즈를 PyTorch flow + generator 에 넣어 파형 비교
+    with torch.inference_mode():
+        sid = torch.from_numpy(inputs[2])
+        g = model.emb_g(sid).unsqueeze(-1)
+        z = model.flow(torch.from_numpy(z_p), torch.from_numpy(y_mask), g=g, reverse=True)
+        y_lengths = torch.from_numpy(y_mask).sum((1, 2)).long()
+        o_ref = model._decode_items(z * torch.from_numpy(y_mask), y_lengths, g=g).numpy()
+    error = float(np.abs(o - o_ref).max())
+    assert error <= ATOL, f"audio 최대 오차 {error:.2e}"
+
+
+def test_seeded_rerun(model, onnx_model):
+    _, model = model
+    inputs = make_inputs(model, [40], seed=0)
+    o_again = onnx_model.infer(*inputs, rng=np.random.default_rng(SEED), **PARAMS)[0]
+    o_seeded = onnx_model.infer(*inputs, rng=np.random.default_rng(SEED), **PARAMS)[0]
+    assert np.array_equal(o_again, o_seeded)
+
+
+def test_batched_matches_single(model, onnx_model):
+    """길이가 다른 문장의 배치 결과가 문장마다 한 문장씩 합성한 결과와 같은지 (noise 0)"""
+    _, model = model
+    params = dict(PARAMS, noise_scale=0., noise_scale_w=0.)
+    inputs = make_inputs(model, [64, 11, 30], seed=7)
+    batched, _, y_mask, _ = onnx_model.infer(*inputs, **params)
+    for i, length in enumerate(inputs[1]):
+        single_inputs = [a[i:i + 1] for a in inputs]
+        single_inputs[0] = single_inputs[0][:, :length]
+        single_inputs[3:5] = [a[:, :length] for a in single_inputs[3:5]]
+        single_inputs[5:7] = [a[:, :, :length] for a in single_inputs[5:7]]
+        single = onnx_model.infer(*single_inputs, **params)[0]
+        n = single.shape[2]
+        assert n == int(y_mask[i].sum()) * (batched.shape[2] // y_mask.shape[2])
+        error = float(np.abs(batched[i, :, :n] - single[0]).max())
+        assert error <= ATOL, f"문장 {i}: 최대 오차 {error:.2e}"
+
+
+def test_missing_onnxruntime(onnx_dir):
+    """onnxruntime 을 import 할 수 없는 별도 프로세스에서 TTS(backend='onnxruntime') 의 에러 메시지 확인"""
+    code = (
+        "import sys; sys.modules['onnxruntime'] = None\n"
+        "from melo.api import TTS\n"
+        "try:\n"
+        f"    TTS('KR', device='cpu', backend='onnxruntime', ckpt_path={onnx_dir!r})\n"
+        "except ImportError as e:\n"
+        "    print(e)\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True).stdout
+    assert 'pip install melotts[onnx]' in output, output
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SentenceBucketScheduler 테스트
+
+    1. schedule 이 모든 문장을 한 번씩 배치에 넣는지, 배치가 같은 길이 구간에 있고
+       batch_size / max_tokens / max_frames 예산을 지키는지
+    2. record 가 speed 와 관계없이 speed 1.0 기준 frames_per_phone 을 학습하는지
+       (speed 2.0 에서 나온 프레임 수로 학습해도 predict_frames 가 실제 프레임 수를 맞히는지)
+    3. padding 통계 (token / frame efficiency)
+
+사용법:
+    pytest test_scheduler.py
+"""
+import sys
+import random
+
+import pytest
+
+from melo.scheduler import SentenceBucketScheduler
+
+
+def true_frames(n_phones, speed, frames_per_phone=4.0):
+    # 합성기가 speed 에서 실제로 내는 프레임 수 (length_scale = 1 / speed)
+    return int(n_phones * frames_per_phone / speed)
+
+
+@pytest.mark.parametrize('speed', [0.5, 1.0, 2.0])
+def test_schedule(speed):
+    rng = random.Random(0)
+    lengths = [rng.randint(1, 700) for _ in range(500)]
+    scheduler = SentenceBucketScheduler(batch_size=8, max_tokens=1024, max_frames=4096)
+    batches = scheduler.schedule(lengths, speed=speed)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    assert all(len({scheduler._bucket(lengths[i]) for i in batch}) == 1 for batch in batches)
+    over = [batch for batch in batches if len(batch) > 1 and (
+        len(batch) > scheduler.batch_size
+        or len(batch) * max(lengths[i] for i in batch) > scheduler.max_tokens
+        or len(batch) * scheduler.predict_frames(max(lengths[i] for i in batch), speed) > scheduler.max_frames
+    )]
+    assert not over, over[:2]
+
+
+@pytest.mark.parametrize('speed', [0.5, 2.0])
+def test_record_speed(speed):
+    rng = random.Random(0)
+    scheduler = SentenceBucketScheduler()
+    for _ in range(100):
+        batch = [rng.randint(20, 200) for _ in range(4)]
+        scheduler.record(batch, [true_frames(n, speed) for n in batch], speed=speed)
+    # frames_per_phone 은 speed 1.0 기준
+    assert abs(scheduler.frames_per_phone - 4.0) < 0.05, scheduler.frames_per_phone
+    predicted = scheduler.predict_frames(150, speed)
+    assert abs(predicted - true_frames(150, speed)) <= 0.02 * predicted, (predicted, true_frames(150, speed))
+
+
+def test_report():
+    scheduler = SentenceBucketScheduler()
+    scheduler.record([10, 5], [30, 10])
+    scheduler.record([8], [24])
+    stats = scheduler.report()
+    assert stats['num_batches'] == 2
+    assert abs(stats['token_efficiency'] - 23 / 28) < 1e-9
+    assert abs(stats['frame_efficiency'] - 64 / 84) < 1e-9
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G2P 후 긴 문장 재분할 (TTS._split_item) 테스트
+
+    1. 모든 조각이 max_phones 이하이고, 조각 수가 최소 조각 수 (경계 blank 공유 포함) 보다
+       많아야 하나 많은지 (단어 중간을 자르지 않으려고 하나 더 쓰는 경우)
+    2. 조각이 원래 음소열을 순서대로 덮는지 (add_blank 의 경계 blank 는 양쪽 조각이 공유)
+    3. 구두점 뒤나 word2ph 단어 경계에서 자르는지
+    4. utils.get_text_for_tts_infer / get_texts_for_tts_infer 가 기본은 5-tuple,
+       return_word2ph=True 일 때만 word2ph 를 붙이는지
+
+모델 없이 실행됩니다 (TTS 는 _split_item 에 필요한 속성만 설정).
+
+사용법:
+    pytest test_split_item.py
+"""
+import sys
+import random
+import itertools
+
+import pytest
+import torch
+
+from melo import utils
+from melo.frontend_cache import FrontendCache
+from testing_utils import make_tts, random_hparams
+
+PUNCT = 1
+
+
+def make_item(rng, n_words):
+    """add_blank 형식 (blank, 음소, blank, ...) 의 준비된 문장과 word2ph"""
+    word2ph = []
+    ids = [0]
+    for k in range(n_words):
+        n = rng.randint(1, 4)
+        ids += [t for _ in range(n) for t in (rng.randint(2, 50), 0)]
+        if k % 7 == 6:
+            ids += [PUNCT, 0]
+            n += 1
+        word2ph.append(2 * n)
+    word2ph[0] += 1
+    n = len(ids)
+    return (torch.randn(4, n), torch.randn(3, n), torch.LongTensor(ids), torch.zeros(n, dtype=torch.long),
+            torch.zeros(n, dtype=torch.long), word2ph)
+
+
+@pytest.fixture
+def tts():
+    return make_tts(_punctuation_ids={PUNCT})
+
+
+def test_piece_count(tts):
+    # 241 음소, max_phones 50 -> 5 조각
+    ids = torch.LongTensor([0, 2] * 120 + [0])
+    item = (torch.randn(4, 241), torch.randn(3, 241), ids, torch.zeros(241, dtype=torch.long),
+            torch.zeros(241, dtype=torch.long))
+    lengths = [piece[2].size(0) for piece in tts._split_item(item, 50)]
+    assert len(lengths) == 5 and max(lengths) <= 50, lengths
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_sentences(tts, seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        item = make_item(rng, rng.randint(5, 150))
+        n = item[2].size(0)
+        max_phones = rng.choice([50, 120, 200])
+        pieces = tts._split_item(item, max_phones)
+        lengths = [piece[2].size(0) for piece in pieces]
+        expected = -(-(n - 1) // (max_phones - 1)) if n > max_phones else 1
+        assert max(lengths) <= max_phones and len(pieces) <= expected + 1, (n, max_phones, lengths)
+        # 경계 blank 를 한 번만 세면 원래 음소열, cuts 는 각 조각의 시작 위치
+        joined = pieces[0][2].tolist()
+        cuts = []
+        for piece in pieces[1:]:
+            tokens = piece[2].tolist()
+            shared = joined[-1] == 0 and tokens[0] == 0
+            cuts.append(len(joined) - 1 if shared else len(joined))
+            joined += tokens[1:] if shared else tokens
+        assert joined == item[2].tolist(), (n, max_phones, lengths)
+        assert len(pieces) == 1 or all(len(p) == 5 for p in pieces)
+        # 단어 경계: 다음 단어 첫 음소 앞의 blank
+        word_starts = set(itertools.accumulate(item[5]))
+        bad = [c for c in cuts if c + 1 not in word_starts and item[2][c - 1] != PUNCT]
+        assert not bad, (n, max_phones, lengths, bad)
+
+
+def test_word2ph_flag():
+    hps = random_hparams()
+    symbol_to_id = {f"s{i}": i for i in range(len(hps.symbols))}
+    cache = FrontendCache()
+    key = cache.make_key("문장.", 'KR', cache.namespace(hps, symbol_to_id))
+    cache.put(key, *make_item(random.Random(0), 5))
+    args = ('KR', hps, 'cpu', symbol_to_id)
+    assert len(utils.get_text_for_tts_infer("문장.", *args, cache=cache)) == 5
+    assert len(utils.get_text_for_tts_infer("문장.", *args, cache=cache, return_word2ph=True)) == 6
+    assert [len(r) for r in utils.get_texts_for_tts_infer(["문장.", "문장."], *args, cache=cache)] == [5, 5]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
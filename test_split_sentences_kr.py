@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KR / JP 문장 분할 (split_utils.split_sentences_budget) 테스트
+
+    1. 모든 조각이 음소 예산(max_phones) 이하인지 (예산보다 긴 한 문장은 쉼표/공백에서 나뉘는지)
+    2. 조각을 이어 붙이면 원문과 같은지 (공백 제외)
+    3. 조각 길이가 고르게 나뉘는지 (합쳐도 예산 안인 이웃 조각이 없는지)
+    4. pdf2mp3.split_text 와 같은 글자 수 기준 분할이 max_length 를 지키는지
+    5. 빈 줄이 문장 끝이 되는지 (마침표 없는 제목 줄), 조각 안의 줄바꿈은 공백으로 합쳐지는지
+
+사용법:
+    pytest test_split_sentences_kr.py
+"""
+import re
+import sys
+import random
+
+import pytest
+
+from melo.split_utils import split_sentence, split_sentences_budget, estimate_phones
+
+KR_SENTENCES = [
+    "최근 텍스트 음성 변환 분야가 급속도로 발전하고 있습니다.",
+    "짧다.",
+    "정말요?",
+    "이 문장은 조금 더 길어서, 여러 개의 절로 이루어져 있으며 쉼표도 포함하고 있습니다.",
+    "쉼표 없이 매우 긴 문장이 끝나지 않고 계속 이어지면 공백에서 나누어 예산을 지켜야 하는데 그 경우도 확인합니다.",
+]
+JP_TEXT = "テキスト読み上げの分野は最近急速な発展を遂げています。今日はいい天気ですね！本当に、そう思いますか？"
+
+
+def strip_spaces(text):
+    return re.sub(r'\s+', '', text)
+
+
+@pytest.mark.parametrize('max_phones', [30, 60, 120, 250])
+def test_kr_budget(max_phones):
+    rng = random.Random(0)
+    text = ' '.join(rng.choice(KR_SENTENCES) for _ in range(200))
+    pieces = split_sentence(text, language_str='KR', max_phones=max_phones)
+    lengths = [estimate_phones(p) for p in pieces]
+    assert max(lengths) <= max_phones
+    assert strip_spaces(''.join(pieces)) == strip_spaces(text)
+    # 이웃한 두 조각을 합쳐도 예산 안이라면 덜 고르게 나뉜 것
+    mergeable = [(a, b) for a, b in zip(lengths, lengths[1:]) if a + b <= max_phones]
+    assert not mergeable, mergeable[:3]
+
+
+def test_jp():
+    pieces = split_sentence(JP_TEXT * 3, language_str='JP', max_phones=60)
+    assert max(estimate_phones(p) for p in pieces) <= 60
+    # 단어 중간에서 자르지 않음
+    assert '最近急速な発展を遂げています.' in pieces, pieces
+
+
+def test_empty_text():
+    assert split_sentence("", language_str='KR') == []
+    assert split_sentence(" . ", language_str='KR') == []
+
+
+def test_newlines():
+    title = "첫 번째 문단의 제목은 마침표 없이 끝나는 꽤 긴 한 줄"
+    body = "둘째 문단입니다."
+    pieces = split_sentence(f"{title}\n\n{body}", language_str='KR', max_phones=estimate_phones(title) + 1)
+    assert pieces == [title, body]
+    assert split_sentence("한 줄\n다음 줄입니다.", language_str='KR') == ["한 줄 다음 줄입니다."]
+
+
+def test_pdf2mp3_chunks():
+    pattern = r'니다\.|습니다\.|었다\.|한다\.|였다\.'
+    text = "이것은 테스트 문장입니다. 그는 학교에 갔었다. " * 300 + "쉼표 없이 매우 긴 문장이 이어지는 경우 " * 200
+    chunks = split_sentences_budget(text, max_length=2000, min_length=0, length_fn=len, sentence_end=pattern)
+    assert max(len(c) for c in chunks) <= 2000, [len(c) for c in chunks]
+    assert strip_spaces(''.join(chunks)) == strip_spaces(text)
+    # 종결 어미에서 분리
+    assert all(re.search(pattern + '$', c) for c in chunks[:4])
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TTS.tts_iter 프런트엔드 묶음 크기 테스트
+
+    1. tts_iter 는 g2p / BERT 를 한 문장만 처리한 뒤 첫 오디오를 내보내는지 (stream_chunk_size 포함)
+    2. 이후 묶음이 1, 2, 4, ... bert_batch_size 로 커지는지
+    3. tts_to_file 은 처음부터 bert_batch_size 문장씩 묶는지
+
+문장 분할은 TEXT 의 12 문장을 그대로 쓰고, 프런트엔드 (TTS._prepare_texts) 는 호출마다 묶음 크기를
+기록하는 랜덤 입력으로 대신합니다. 합성은 랜덤 초기화 모델로 합니다.
+
+사용법:
+    pytest test_tts_iter.py
+"""
+import sys
+
+import pytest
+import torch
+
+from testing_utils import make_tts
+
+TEXT = ' '.join(f"{i}번째_문장입니다." for i in range(1, 13))
+
+
+@pytest.fixture
+def tts(random_model):
+    hps, model = random_model
+    tts = make_tts(hps, model)
+    tts.frontend_calls = []
+    tts.split_sentences_into_pieces = lambda text, language, quiet=False, max_phones=None: text.split(' ')
+
+    def prepare_texts(texts):
+        tts.frontend_calls.append(len(texts))
+        generator = torch.Generator().manual_seed(len(tts.frontend_calls))
+        items = []
+        for _ in texts:
+            phones = torch.LongTensor([0, 5, 0, 9, 0, 13, 0, 7, 0])
+            n = phones.size(0)
+            items.append((torch.randn(1024, n, generator=generator), torch.randn(768, n, generator=generator),
+                          phones, torch.zeros(n, dtype=torch.long), torch.zeros(n, dtype=torch.long), [n]))
+        return items
+
+    tts._prepare_texts = prepare_texts
+    return tts
+
+
+@pytest.mark.parametrize('stream_chunk_size', [None, 16])
+def test_first_chunk_after_one_sentence(tts, stream_chunk_size):
+    chunks = tts.tts_iter(TEXT, 0, quiet=True, bert_batch_size=4, stream_chunk_size=stream_chunk_size)
+    next(chunks)
+    assert tts.frontend_calls == [1]
+    for _ in chunks:
+        pass
+    assert tts.frontend_calls == [1, 2, 4, 4, 1]
+
+
+def test_tts_to_file_keeps_bert_batches(tts, tmp_path):
+    tts.tts_to_file(TEXT, 0, quiet=True, bert_batch_size=16)
+    assert tts.frontend_calls == [12]
+    tts.frontend_calls.clear()
+    tts.tts_to_file(TEXT, 0, output_path=str(tmp_path / 'out.wav'), quiet=True, bert_batch_size=5)
+    assert tts.frontend_calls == [5, 5, 2]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+split_utils.txtsplit 동등성 테스트
+
+인덱스 기반 txtsplit 이 이전 구현(문자를 하나씩 붙이는 legacy_txtsplit)과 같은 청크를 만드는지
+split_utils 의 __main__ 예제와 무작위로 만든 텍스트(따옴표, 연속 구두점, 긴 단어, 줄바꿈 포함)에서
+확인하고, return_offsets 로 받은 원문 위치가 청크와 같은 글자를 가리키는지 검사합니다.
+
+사용법:
+    pytest test_txtsplit.py
+"""
+import re
+import sys
+import random
+
+import pytest
+
+from melo.split_utils import txtsplit, split_sentences_latin, _txtsplit_normalize
+
+SAMPLES = [
+    "好的，我来给你讲一个故事吧。从前有一个小姑娘，她叫做小红。小红非常喜欢在森林里玩耍，她经常会和她的小伙伴们一起去探险。有一天，小红和她的小伙伴们走到了森林深处，突然遇到了一只凶猛的野兽。小红的小伙伴们都吓得不敢动弹，但是小红并没有被吓倒，她勇敢地走向野兽，用她的智慧和勇气成功地制服了野兽，保护了她的小伙伴们。从那以后，小红变得更加勇敢和自信，成为了她小伙伴们心中的英雄。",
+    "I didn’t know what to do. I said please kill her because it would be better than being kidnapped,” Ben, whose surname CNN is not using for security concerns, said on Wednesday. “It’s a nightmare. I said ‘please kill her, don’t take her there.’",
+    "¡Claro! ¿En qué tema te gustaría que te hable en español? Puedo proporcionarte información o conversar contigo sobre una amplia variedad de temas, desde cultura y comida hasta viajes y tecnología. ¿Tienes alguna preferencia en particular?",
+    "Bien sûr ! En quelle matière voudriez-vous que je vous parle en français ? Je peux vous fournir des informations ou discuter avec vous sur une grande variété de sujets, que ce soit la culture, la nourriture, les voyages ou la technologie. Avez-vous une préférence particulière ?",
+]
+SIZES = [(100, 200), (256, 512), (10, 20), (30, 35)]
+
+
+def legacy_txtsplit(text, desired_length=100, max_length=200):
+    """txtsplit before the index-based rewrite (reference implementation)."""
+    text = re.sub(r'\n\n+', '\n', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[""]', '"', text)
+    text = re.sub(r'([,.?!])', r'\1 ', text)
+    text = re.sub(r'\s+', ' ', text)
+
+    rv = []
+    in_quote = False
+    current = ""
+    split_pos = []
+    pos = -1
+    end_pos = len(text) - 1
+    def seek(delta):
+        nonlocal pos, in_quote, current
+        is_neg = delta < 0
+        for _ in range(abs(delta)):
+            if is_neg:
+                pos -= 1
+                current = current[:-1]
+            else:
+                pos += 1
+                current += text[pos]
+            if text[pos] == '"':
+                in_quote = not in_quote
+        return text[pos]
+    def peek(delta):
+        p = pos + delta
+        return text[p] if p < end_pos and p >= 0 else ""
+    def commit():
+        nonlocal rv, current, split_pos
+        rv.append(current)
+        current = ""
+        split_pos = []
+    while pos < end_pos:
+        c = seek(1)
+        if len(current) >= max_length:
+            if len(split_pos) > 0 and len(current) > (desired_length / 2):
+                d = pos - split_pos[-1]
+                seek(-d)
+            else:
+                while c not in '!?.\n ' and pos > 0 and len(current) > desired_length:
+                    c = seek(-1)
+            commit()
+        elif not in_quote and (c in '!?\n' or (c in '.,' and peek(1) in '\n ')):
+            while pos < len(text) - 1 and len(current) < max_length and peek(1) in '!?.':
+                c = seek(1)
+            split_pos.append(pos)
+            if len(current) >= desired_length:
+                commit()
+        elif in_quote and peek(1) == '"' and peek(2) in '\n ':
+            seek(2)
+            split_pos.append(pos)
+    rv.append(current)
+    rv = [s.strip() for s in rv]
+    rv = [s for s in rv if len(s) > 0 and not re.match(r'^[\s\.,;:!?]*$', s)]
+    return rv
+
+
+def random_text(rng, n_words):
+    pieces = []
+    for _ in range(n_words):
+        word = ''.join(rng.choice('abcdefghij') for _ in range(rng.choice([1, 3, 6, 40])))
+        r = rng.random()
+        if r < 0.1:
+            word = '"' + word
+        elif r < 0.2:
+            word += '"'
+        pieces.append(word)
+        pieces.append(rng.choice([' ', ' ', ' ', '. ', ', ', '! ', '?', '...', '.', ',', '\n', '\n\n', '  ', '\t', '"']))
+    return ''.join(pieces)
+
+
+def split_error(text, desired_length, max_length):
+    expected = legacy_txtsplit(text, desired_length, max_length)
+    chunks, offsets = txtsplit(text, desired_length, max_length, return_offsets=True)
+    if chunks != expected or txtsplit(text, desired_length, max_length) != expected:
+        return "청크 불일치"
+    for chunk, (start, end) in zip(chunks, offsets):
+        # 원문 조각을 같은 방식으로 정규화하면 청크와 같아야 함
+        if _txtsplit_normalize(text[start:end]).strip() != chunk:
+            return f"offset 불일치: {chunk!r} vs {text[start:end]!r}"
+    if offsets != sorted(offsets) or any(a[1] > b[0] for a, b in zip(offsets, offsets[1:])):
+        return "offset 순서 오류"
+    return None
+
+
+def make_texts():
+    texts = [text for text in SAMPLES]
+    texts += [re.sub('[。！？；]', '.', text) for text in SAMPLES]
+    rng = random.Random(0)
+    texts += [random_text(rng, rng.randint(0, 300)) for _ in range(500)]
+    texts += ['', ' ', '.', '"', '""', 'a"', '"a" "b"', '. . .', 'x' * 1000]
+    return texts
+
+
+@pytest.mark.parametrize('desired_length, max_length', SIZES)
+def test_txtsplit(desired_length, max_length):
+    failures = [(text[:120], error) for text in make_texts()
+                if (error := split_error(text, desired_length, max_length))]
+    assert not failures, failures[:5]
+
+
+@pytest.mark.parametrize('text', SAMPLES[1:])
+def test_split_sentences_latin(text):
+    # split_sentences_latin 은 txtsplit(text, 256, 512) 사용
+    normalized = re.sub(r"[\<\>\(\)\[\]\"\«\»]+", "", re.sub('[‘’]', "'", re.sub('[“”]', '"', text)))
+    expected = [s.strip() for s in legacy_txtsplit(normalized, 256, 512) if s.strip()]
+    assert split_sentences_latin(text) == expected
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
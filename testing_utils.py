@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+test_*.py / bench_*.py 가 함께 쓰는 모델 준비 함수
+
+체크포인트 없이 config.json 구조의 랜덤 초기화 SynthesizerTrn 을 만들거나 (make_model),
+모델을 읽지 않고 TTS 객체를 만듭니다 (make_tts). pytest fixture 는 conftest.py 에 있습니다.
+"""
+import os
+
+import torch
+from torch import nn
+
+from melo import utils
+from melo.export import build_model, load_inference_model
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "melo", "configs", "config.json")
+N_SYMBOLS = 112
+
+
+def random_hparams():
+    """config.json 에 체크포인트마다 다른 symbols / num_languages / num_tones 를 채운 hps"""
+    hps = utils.get_hparams_from_file(CONFIG_PATH)
+    hps.symbols = ['_'] * N_SYMBOLS
+    hps.num_languages = 10
+    hps.num_tones = 16
+    return hps
+
+
+def make_model(ckpt_path=None, seed=0):
+    """(hps, 추론용 SynthesizerTrn): ckpt_path (melo.export 파일) 가 없으면 랜덤 초기화, weight norm 제거됨"""
+    if ckpt_path:
+        return load_inference_model(ckpt_path, dtype=torch.float32)
+    hps = random_hparams()
+    torch.manual_seed(seed)
+    model = build_model(hps, inference_only=True).eval()
+    model.remove_weight_norm()
+    return hps, model
+
+
+def make_tts(hps=None, model=None, language='KR', **attrs):
+    """체크포인트 / 프런트엔드 로드 없이 TTS.__init__ 이 설정하는 속성만 채운 TTS"""
+    from melo.api import TTS
+    from melo.text.symbols import punctuation
+
+    hps = hps or random_hparams()
+    tts = TTS.__new__(TTS)
+    nn.Module.__init__(tts)
+    tts.backend = 'torch'
+    tts.model = model
+    tts.hps = hps
+    tts.device = 'cpu'
+    tts.language = language
+    tts.symbol_to_id = {s: i for i, s in enumerate(hps.symbols)}
+    tts.frontend_cache = None
+    tts.max_phones = None
+    tts.max_frames = None
+    tts.dec_chunk_size = None
+    tts._punctuation_ids = {tts.symbol_to_id[p] for p in punctuation if p in tts.symbol_to_id}
+    for name, value in attrs.items():
+        setattr(tts, name, value)
+    return tts